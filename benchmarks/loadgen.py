@@ -0,0 +1,193 @@
+#################################################
+# loadgen.py - drives thousands of simulated   #
+# clients against a game server                #
+#################################################
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.boat_management import SHIP_TYPES
+from modules.fleet_generator import fleet_generator
+from modules.protocol import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE, decode, encode, parse_ships
+
+# Seconds a spawned server gets to start listening
+SPAWN_TIMEOUT = 10
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list, 0 when empty."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def random_fleet(rows, cols, ships, rng):
+    """PLACE arguments for a random legal fleet."""
+    generator = fleet_generator(rows, cols, ships)
+    words = []
+    picks = generator.random_placements(rng)
+    for name, length, index in zip(generator.queue, generator.lengths, picks):
+        cells = generator.cells[length][index]
+        row, col = cells[0]
+        vertical = len(cells) > 1 and cells[1][1] == col
+        words += [SHIP_TYPES[name][1], row, col, "V" if vertical else "H"]
+    return words
+
+
+class Stats:
+    def __init__(self):
+        self.shots = 0
+        self.games = 0
+        self.errors = 0
+        self.latencies = []
+
+
+async def client(host, port, deadline, stats, rng):
+    """
+    One simulated player: joins the next open match, places a random fleet
+    and fires at random unfired cells whenever it has the turn, then joins
+    another match, until the deadline.
+    """
+    for attempt in range(50):
+        try:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+            break
+        except OSError:
+            await asyncio.sleep(0.05 * (attempt + 1))
+    else:
+        stats.errors += 1
+        return
+
+    async def read():
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        try:
+            line = await asyncio.wait_for(reader.readline(), remaining)
+        except (asyncio.TimeoutError, ConnectionError):
+            return None
+        return decode(line) if line else None
+
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(encode("JOIN"))
+            words = await read()
+            if not words or words[0] != "JOINED":
+                break
+            player, rows, cols, ships = int(words[2]), int(words[3]), int(words[4]), parse_ships(words[5])
+            writer.write(encode("PLACE", *random_fleet(rows, cols, ships, rng)))
+
+            targets = [(r, c) for r in range(rows) for c in range(cols)]
+            rng.shuffle(targets)
+            fired_at = None
+            while True:
+                words = await read()
+                if words is None:
+                    return
+                verb = words[0]
+                if verb == "TURN" and int(words[1]) == player and fired_at is None:
+                    row, col = targets.pop()
+                    fired_at = time.perf_counter()
+                    writer.write(encode("FIRE", row, col))
+                elif verb == "SHOT" and int(words[1]) == player:
+                    stats.latencies.append(time.perf_counter() - fired_at)
+                    stats.shots += 1
+                    fired_at = None
+                elif verb == "WIN":
+                    # both players see the WIN, count each match once
+                    stats.games += int(words[1]) == player
+                    break
+                elif verb == "ERR":
+                    stats.errors += 1
+                    fired_at = None
+    finally:
+        writer.close()
+
+
+async def run_clients(count, host, port, duration, seed):
+    stats = Stats()
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(host, port, deadline, stats, random.Random(rng.random())) for _ in range(count)))
+    return stats
+
+
+def _run_worker(task):
+    count, host, port, duration, seed = task
+    stats = asyncio.run(run_clients(count, host, port, duration, seed))
+    return stats.shots, stats.games, stats.errors, stats.latencies
+
+
+def spawn_server(port, settings, extra=()):
+    """Start server.py on localhost and wait until it accepts connections."""
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "server.py"), "--port", str(port),
+                                "--settings", settings, "--status", "0", *extra], cwd=ROOT)
+    deadline = time.perf_counter() + SPAWN_TIMEOUT
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection((DEFAULT_HOST, port), 1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the game server with simulated clients.")
+    parser.add_argument("--clients", type=int, default=2000, help="simulated clients, two per match")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run")
+    parser.add_argument("--workers", type=int, default=1, help="client processes sharing the clients")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spawn", action="store_true", help="start a server on localhost for the run")
+    parser.add_argument("--settings", default=os.path.join(ROOT, "settings.json"),
+                        help="settings for the spawned server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = spawn_server(args.port, args.settings) if args.spawn else None
+    try:
+        tasks = []
+        for worker in range(args.workers):
+            count = args.clients // args.workers + (worker < args.clients % args.workers)
+            tasks.append((count, args.host, args.port, args.duration, f"{args.seed}:{worker}"))
+        start = time.perf_counter()
+        if args.workers == 1:
+            results = list(map(_run_worker, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                results = list(executor.map(_run_worker, tasks))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    shots = sum(result[0] for result in results)
+    games = sum(result[1] for result in results)
+    errors = sum(result[2] for result in results)
+    latencies = sorted(latency for result in results for latency in result[3])
+
+    print(f"{args.clients} clients for {elapsed:.1f}s: {games} matches finished, {shots} moves")
+    print(f"moves/second: {shots / elapsed:.0f}")
+    print("move latency (ms): " + "  ".join(
+        f"p{pct} {percentile(latencies, pct) * 1000:.2f}" for pct in (50, 90, 99)) +
+        f"  max {latencies[-1] * 1000 if latencies else 0:.2f}")
+    if errors:
+        print(f"errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
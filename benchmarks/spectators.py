@@ -0,0 +1,229 @@
+#################################################
+# spectators.py - thousands of spectators on   #
+# a few live matches, at several board sizes   #
+#################################################
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.loadgen import spawn_server
+from modules.boat_management import SHIP_TYPES
+from modules.file_handling import load_settings
+from modules.protocol import DEFAULT_HOST, MAX_LINE, decode, encode, parse_ships
+
+# Seconds spectators get to connect and receive their first SNAPSHOT
+CONNECT_TIME = 30
+
+
+def simple_fleet(rows, cols, ships, rng):
+    """
+    PLACE arguments for a fleet laid out horizontally on distinct random
+    rows. Unlike fleet_generator this costs nothing on huge boards.
+    """
+    lengths = [(name, SHIP_TYPES[name][0]) for name, count in ships.items() for _ in range(count)]
+    words = []
+    for (name, length), row in zip(lengths, rng.sample(range(rows), len(lengths))):
+        words += [SHIP_TYPES[name][1], row, rng.randrange(cols - length + 1), "H"]
+    return words
+
+
+class Totals:
+    def __init__(self):
+        self.bytes = 0
+        self.frames = 0
+        self.gaps = 0
+        self.measuring = False
+        self.ready = 0
+
+
+async def player(host, port, name, rate, stop, rng):
+    """Plays named match after named match, firing rate shots a second."""
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    try:
+        while not stop.is_set():
+            writer.write(encode("JOIN", name))
+            words = decode(await reader.readline())
+            if not words or words[0] != "JOINED":
+                # the previous match is still being torn down
+                await asyncio.sleep(0.05)
+                continue
+            me, rows, cols, ships = int(words[2]), int(words[3]), int(words[4]), parse_ships(words[5])
+            writer.write(encode("PLACE", *simple_fleet(rows, cols, ships, rng)))
+            fired = set()
+            while not stop.is_set():
+                line = await reader.readline()
+                if not line:
+                    return
+                words = decode(line)
+                if words[0] == "TURN" and int(words[1]) == me:
+                    await asyncio.sleep(1 / rate)
+                    while True:
+                        target = rng.randrange(rows), rng.randrange(cols)
+                        if target not in fired:
+                            break
+                    fired.add(target)
+                    writer.write(encode("FIRE", *target))
+                elif words[0] == "WIN":
+                    break
+    finally:
+        writer.close()
+
+
+async def spectator(host, port, name, stop, totals, stall=0):
+    """
+    Watches a match and follows it to the next one of the same name,
+    checking that no DELTA is missed between snapshots. A stalled
+    spectator stops reading for stall seconds after its first frame.
+    """
+    sock = socket.socket()
+    if stall:
+        # a small receive window so the server notices the stall sooner
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect((host, port))
+    reader, writer = await asyncio.open_connection(sock=sock, limit=MAX_LINE)
+    seq = None
+    ready = False
+    try:
+        writer.write(encode("WATCH", name))
+        while not stop.is_set():
+            try:
+                line = await asyncio.wait_for(reader.readline(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            if not line:
+                return
+            words = decode(line)
+            verb = words[0]
+            if totals.measuring:
+                totals.bytes += len(line)
+                totals.frames += 1
+            if verb == "SNAPSHOT":
+                seq = int(words[2])
+                if not ready:
+                    ready = True
+                    totals.ready += 1
+                    if stall:
+                        # without this the stream keeps reading in the background
+                        writer.transport.pause_reading()
+                        await asyncio.sleep(stall)
+                        writer.transport.resume_reading()
+            elif verb == "DELTA":
+                if seq is not None and int(words[2]) != seq + 1:
+                    totals.gaps += 1
+                seq = int(words[2])
+            elif verb in ("OVER", "ERR"):
+                # wait for the next match of that name to open
+                seq = None
+                await asyncio.sleep(0.05)
+                writer.write(encode("WATCH", name))
+    finally:
+        writer.close()
+
+
+async def server_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode("STATS"))
+    words = decode(await reader.readline())
+    writer.close()
+    keys = ("clients", "matches", "spectators", "frames", "bytes", "resyncs", "drops")
+    stats = dict(zip(keys, map(int, words[1:8])))
+    stats["cpu"] = float(words[8])
+    return stats
+
+
+async def run_size(host, port, args):
+    rng = random.Random(args.seed)
+    stop = asyncio.Event()
+    totals = Totals()
+    names = [f"watch-{i}" for i in range(args.matches)]
+
+    tasks = []
+    for name in names:
+        for _ in range(2):
+            tasks.append(asyncio.create_task(player(host, port, name, args.rate, stop, random.Random(rng.random()))))
+    await asyncio.sleep(0.5)
+    for i in range(args.spectators + args.slow):
+        stall = args.stall if i >= args.spectators else 0
+        tasks.append(asyncio.create_task(spectator(host, port, names[i % len(names)], stop, totals, stall)))
+        if i % 500 == 499:
+            await asyncio.sleep(0)
+
+    deadline = time.perf_counter() + CONNECT_TIME
+    while totals.ready < args.spectators + args.slow and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+
+    before = await server_stats(host, port)
+    totals.measuring = True
+    start = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    totals.measuring = False
+    elapsed = time.perf_counter() - start
+    after = await server_stats(host, port)
+
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return totals, before, after, elapsed
+
+
+def write_settings(path, size, ships):
+    with open(path, "w") as f:
+        json.dump({"board": {"rows": size, "cols": size}, "ships": ships}, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure what each spectator costs the server at several board sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="board sizes to compare")
+    parser.add_argument("--spectators", type=int, default=2000)
+    parser.add_argument("--matches", type=int, default=4, help="live matches the spectators are spread over")
+    parser.add_argument("--rate", type=float, default=20, help="shots per second in each match")
+    parser.add_argument("--duration", type=float, default=10, help="seconds measured per size")
+    parser.add_argument("--slow", type=int, default=0, help="extra spectators that stop reading for a while")
+    parser.add_argument("--stall", type=float, default=5, help="seconds a slow spectator stops reading")
+    parser.add_argument("--buffer", type=int, default=4096,
+                        help="the spawned server's --spectator-buffer, small so stalls show up quickly")
+    parser.add_argument("--port", type=int, default=5758)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    _, _, ships = load_settings(os.path.join(ROOT, "settings.json"))
+    print(f"{args.spectators} spectators (+{args.slow} slow) on {args.matches} matches, "
+          f"{args.rate:g} shots/s per match, {args.duration:g}s per size")
+    print("bytes/s and lines/s are per spectator, us/frame is server CPU per frame sent")
+    print(f"{'board':>11} {'bytes/s':>9} {'lines/s':>9} {'server cpu':>11} {'us/frame':>9} "
+          f"{'gaps':>5} {'resyncs':>8} {'drops':>6}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            settings = os.path.join(tmp, f"{size}.json")
+            write_settings(settings, size, ships)
+            server = spawn_server(args.port, settings, ["--spectator-buffer", str(args.buffer)])
+            try:
+                totals, before, after, elapsed = asyncio.run(run_size(DEFAULT_HOST, args.port, args))
+            finally:
+                server.terminate()
+                server.wait()
+
+            watching = max(1, args.spectators + args.slow)
+            cpu = after["cpu"] - before["cpu"]
+            frames = after["frames"] - before["frames"]
+            print(f"{size:>5}x{size:<5} {totals.bytes / elapsed / watching:>9.0f} "
+                  f"{totals.frames / elapsed / watching:>9.1f} {cpu / elapsed:>10.0%} "
+                  f"{cpu / max(1, frames) * 1e6:>9.1f} {totals.gaps:>5} "
+                  f"{after['resyncs'] - before['resyncs']:>8} {after['drops'] - before['drops']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#################################################
+# startup.py - cold-start times of the GUI and #
+# headless paths, measured from outside        #
+#################################################
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    # window open, assets loaded and the first menu frame flipped
+    "gui (time to first frame)": [sys.executable, "main.py", "--startup-time"],
+    # settings loaded and one complete bot game played, no pygame
+    "headless (time to first game)": [sys.executable, "simulate.py", "--games", "1", "--workers", "1"],
+    # importing the rules modules alone
+    "rules import": [sys.executable, "-c", "import modules.boat_management, modules.bitboard, modules.file_handling"],
+}
+
+
+def time_command(command, runs):
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start times.")
+    parser.add_argument("--runs", type=int, default=5, help="runs per command")
+    args = parser.parse_args()
+
+    for name, command in COMMANDS.items():
+        samples = time_command(command, args.runs)
+        print(f"{name:32s} median {statistics.median(samples) * 1000:8.1f} ms"
+              f"   min {min(samples) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
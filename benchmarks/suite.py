@@ -0,0 +1,322 @@
+#################################################
+# suite.py - micro-benchmarks for the rules    #
+# engine, settings validator and rendering     #
+#################################################
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# render under the dummy driver so the suite runs on a box with no display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Board sizes for the rules engine benchmarks
+BOARD_SIZES = (10, 30, 100)
+
+# Fleets for the feasibility checker: (rows, cols, ship lengths)
+FLEETS = {
+    "easy 10x10": (10, 10, [5, 4, 3, 3, 2]),
+    "easy 100x100": (100, 100, [5, 4, 3, 3, 2] * 40),
+    "tight 6x6": (6, 6, [5, 5, 5, 4, 4, 3, 3, 3, 2, 2]),
+    "tight 5x8": (5, 8, [5, 5, 4, 4, 4, 4, 4, 3, 3, 3]),
+    "infeasible 6x6": (6, 6, [5, 4, 4, 4, 4, 4, 4, 4, 3]),
+    "infeasible 3x8": (3, 8, [5, 4, 3, 3, 3, 3, 3]),
+}
+
+# Seconds each repeat should roughly take, and repeats per benchmark
+TARGET_TIME = 0.05
+REPEATS = 7
+
+# Slowdown past which compare reports a regression
+DEFAULT_THRESHOLD = 0.25
+
+
+class Benchmark:
+    """
+    One measured operation. setup() runs outside the timer and returns
+    the state run(state) needs; run performs `calls` operations so results
+    are reported per operation. Benchmarks that change their state (fresh)
+    get a new one for every run, the rest share one per repeat.
+    """
+
+    def __init__(self, name, group, run, setup=None, calls=1, fresh=False):
+        self.name = name
+        self.group = group
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.calls = calls
+        self.fresh = fresh
+
+    def measure(self, repeats=REPEATS, target_time=TARGET_TIME):
+        # calibrate how many runs fit in one repeat
+        state = self.setup()
+        start = time.perf_counter()
+        self.run(state)
+        once = max(time.perf_counter() - start, 1e-7)
+        number = max(1, int(target_time / once))
+
+        samples = []
+        for _ in range(repeats):
+            if self.fresh:
+                states = [self.setup() for _ in range(number)]
+            else:
+                states = [self.setup()] * number
+            # like timeit, keep the garbage collector out of the timings
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for state in states:
+                    self.run(state)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            samples.append(elapsed / (number * self.calls))
+        return {
+            "group": self.group,
+            "median_us": statistics.median(samples) * 1e6,
+            "min_us": min(samples) * 1e6,
+            "ops": number * self.calls * repeats,
+        }
+
+
+# ------------------------------
+# Rules engine
+# ------------------------------
+def fleet_for(size):
+    """The standard fleet, one of each ship per 10 columns."""
+    count = max(1, size // 10)
+    return {"carrier": count, "battleship": count, "cruiser": count, "submarine": count, "destroyer": count}
+
+
+def rules_benchmarks():
+    from modules.boat_management import BoatManager
+    from modules.players import random_placement
+
+    benchmarks = []
+    for size in BOARD_SIZES:
+        ships = fleet_for(size)
+        rng = random.Random(size)
+        boards = [random_placement(size, size, ships, rng) for _ in range(2)]
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        shots = cells[:]
+        rng.shuffle(shots)
+
+        def placed(boards=boards, size=size, ships=ships):
+            manager = BoatManager(size, size, ships)
+            for player in (1, 2):
+                manager.set_player_ships(player, [row[:] for row in boards[player - 1]])
+            return manager
+
+        def copy_boards(boards=boards):
+            return [[row[:] for row in board] for board in boards]
+
+        def set_ships(boards, size=size, ships=ships):
+            manager = BoatManager(size, size, ships)
+            manager.set_player_ships(1, boards[0])
+            manager.set_player_ships(2, boards[1])
+
+        def fire_all(manager, shots=shots):
+            for row, col in shots:
+                manager.fire_at(1, 2, row, col)
+
+        ship_cells = [cell for coords in placed().player_ship_coords[2].values() for cell in coords]
+
+        def is_sunk(manager, ship_cells=ship_cells):
+            for row, col in ship_cells:
+                manager._is_ship_sunk(2, row, col)
+
+        def half_played(shots=shots):
+            manager = placed()
+            for row, col in shots[:len(shots) // 2]:
+                manager.fire_at(1, 2, row, col)
+            return manager
+
+        label = f"{size}x{size}"
+        benchmarks += [
+            Benchmark(f"set_player_ships {label}", "rules", set_ships, copy_boards, calls=2, fresh=True),
+            Benchmark(f"fire_at {label}", "rules", fire_all, placed, calls=len(shots), fresh=True),
+            Benchmark(f"_is_ship_sunk {label}", "rules", is_sunk, placed, calls=len(ship_cells)),
+            # no winner yet, so every call scans the boards
+            Benchmark(f"check_win {label}", "rules", lambda manager: manager.check_win(), half_played),
+        ]
+    return benchmarks
+
+
+# ------------------------------
+# Settings validator
+# ------------------------------
+def validator_benchmarks():
+    from modules.file_handling import can_place_all_ships
+
+    benchmarks = []
+    for name, (rows, cols, lengths) in FLEETS.items():
+        def check(_, rows=rows, cols=cols, lengths=lengths):
+            can_place_all_ships(rows, cols, lengths, time_budget=10)
+        benchmarks.append(Benchmark(f"can_place_all_ships {name}", "validator", check))
+    return benchmarks
+
+
+# ------------------------------
+# Rendering
+# ------------------------------
+def render_benchmarks():
+    import pygame
+    from modules import draw
+    from modules.assets import asset_manager
+    from modules.board_renderer import BoardRenderer
+    from modules.players import random_placement
+
+    pygame.init()
+    screen = pygame.display.set_mode((850, 700))
+    rows = cols = 10
+    ships = fleet_for(10)
+    board = random_placement(rows, cols, ships, random.Random(0))
+    hits = [["~"] * cols for _ in range(rows)]
+    for r, c in random.Random(1).sample([(r, c) for r in range(rows) for c in range(cols)], 40):
+        hits[r][c] = "X" if board[r][c] != "~" else "O"
+
+    text = "Player 1! Use Arrow Keys to lock your target, hit Space to fire!"
+    cell_size = draw.compute_cell_size(rows, cols, screen.get_width(), screen.get_height())
+    origin_x, origin_y = draw.compute_grid_origin(rows, cols, cell_size, screen.get_width(), screen.get_height())
+    preview = [(4, c) for c in range(3, 8)]
+    assets = draw.load_firing_assets()
+    asset_manager.set_cell_size(cell_size)
+
+    # one firing-phase frame: the crosshair moves over the static layer
+    # BoardRenderer composited once, and only the dirty rects are pushed
+    renderer = BoardRenderer(screen, rows, cols, cell_size, origin_x, origin_y)
+    renderer.rebuild(lambda surface: draw.draw_firing_background(
+        surface, rows, cols, cell_size, origin_x, origin_y, hits, text, assets))
+    crosshair_cells = itertools.cycle([(4, 3), (4, 4)])
+
+    def firing_frame():
+        renderer.begin_frame()
+        crosshair = assets.get("crosshair", (cell_size, cell_size), cell=True)
+        renderer.mark(screen.blit(crosshair, renderer.cell_rect(*next(crosshair_cells))))
+        renderer.end_frame()
+
+    screens = {
+        "draw_instructions": lambda: draw.draw_instructions(screen, text, screen.get_width()),
+        "draw_grid": lambda: draw.draw_grid(screen, rows, cols, cell_size, origin_x, origin_y),
+        "draw_placed_ships": lambda: draw.draw_placed_ships(screen, board, cell_size, origin_x, origin_y),
+        "draw_ship_preview": lambda: draw.draw_ship_preview(screen, preview, cell_size, origin_x, origin_y, True),
+        "draw_cursor": lambda: draw.draw_cursor(screen, 4, 3, cell_size, origin_x, origin_y),
+        "draw_firing_background": lambda: draw.draw_firing_background(
+            screen, rows, cols, cell_size, origin_x, origin_y, hits, text, assets),
+        "firing_frame": firing_frame,
+        # a zero duration draws the splash once and returns
+        "show_splash": lambda: draw.show_splash(screen, "Player 1 - Assemble your Navy!", duration=0),
+    }
+    return [Benchmark(name, "render", lambda _, func=func: func()) for name, func in screens.items()]
+
+
+GROUPS = {
+    "rules": rules_benchmarks,
+    "validator": validator_benchmarks,
+    "render": render_benchmarks,
+}
+
+
+def run_suite(groups, repeats=REPEATS, target_time=TARGET_TIME):
+    results = {}
+    for group in groups:
+        for benchmark in GROUPS[group]():
+            result = benchmark.measure(repeats, target_time)
+            results[benchmark.name] = result
+            print(f"{benchmark.name:45s} {result['median_us']:12.2f} us   (min {result['min_us']:.2f})")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Print each benchmark's change against the baseline. Best times are
+    compared, since they are the least affected by other load on the box.
+    Returns the names that got slower than threshold allows.
+    """
+    regressions = []
+    print(f"{'benchmark':45s} {'baseline':>12s} {'current':>12s} {'change':>8s}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:45s} {'-':>12s} {result['min_us']:12.2f}      new")
+            continue
+        change = result["min_us"] / base["min_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  SLOWER"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:45s} {base['min_us']:12.2f} {result['min_us']:12.2f} {change:+8.1%}{flag}")
+    groups = {result["group"] for result in current["results"].values()}
+    for name, base in baseline["results"].items():
+        if base["group"] in groups and name not in current["results"]:
+            print(f"{name:45s} {'':12s} {'-':>12s}  missing")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rules engine, validator and rendering.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="run the suite")
+    run_parser.add_argument("--groups", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    run_parser.add_argument("--repeats", type=int, default=REPEATS)
+    run_parser.add_argument("--save", metavar="PATH", help="write the results as JSON, e.g. a new baseline")
+
+    compare_parser = sub.add_parser("compare", help="diff results against a baseline")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--results", metavar="PATH",
+                                help="saved results to compare (default: run the suite now)")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_suite(args.groups, args.repeats)
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=1, sort_keys=True)
+            print(f"saved to {args.save}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        groups = [group for group in GROUPS if any(result["group"] == group for result in baseline["results"].values())]
+        current = run_suite(groups)
+        print()
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,204 @@
-import pygame
+import argparse
+import time
 
-# import modules
-from modules.file_handling import load_settings
-from modules.menu import show_main_menu
-from modules.placement import placement_phase
-from modules.firing import firing_phase
-from modules.boat_management import BoatManager
+# measured from here for --startup-time
+START_TIME = time.perf_counter()
 
-# load settings
-rows, cols, ships = load_settings()
+# import modules. The rules modules do not need pygame; pygame, the
+# display and the GUI modules are only loaded when the game window opens.
+from modules.file_handling import load_settings
+from modules.sparse_board import new_boat_manager
 
-# initialize pygame
-pygame.init()
 WIDTH, HEIGHT = 850, 700
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
 
-# load assets
-windowicon = pygame.image.load("assets/icon.png")
-bg = pygame.image.load("assets/battlemap.png")
-bg = pygame.transform.scale(bg, (WIDTH, HEIGHT))
 
-# Window icon and title
-pygame.display.set_icon(windowicon)
-pygame.display.set_caption("Battleship")
+def init_display():
+    """
+    Initialize pygame and open the game window.
+    Returns the screen surface.
+    """
+    import pygame
+    from modules.assets import asset_manager
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    # Window icon and title
+    windowicon = asset_manager.image("icon")
+    pygame.display.set_icon(windowicon)
+    pygame.display.set_caption("Battleship")
+    return screen
+
+
+def measure_startup():
+    """
+    Open the window, draw the first main menu frame and report how long it
+    took from process start. Used by benchmarks/startup.py.
+    """
+    load_settings()
+    screen = init_display()
+
+    import pygame
+    from modules.menu import draw_main_menu, load_logo
+
+    logo, logo_rect = load_logo(screen)
+    draw_main_menu(screen, logo, logo_rect)
+    pygame.display.flip()
+
+    print(f"time to first frame: {(time.perf_counter() - START_TIME) * 1000:.1f} ms")
+    pygame.quit()
+
+
+def enable_profiling(path):
+    """
+    Record frame and phase timings from the start, and write them to path
+    (JSON, or CSV for a .csv path) when the game exits.
+    """
+    import atexit
+    from modules.profiler import profiler
+
+    profiler.enabled = True
+
+    def dump():
+        profiler.dump(path)
+        print(f"profile written to {path}")
+
+    atexit.register(dump)
+
+
+def online_game(screen, address, match=None):
+    """
+    Play one match on the server at address ("host:port"), returning the
+    winner's label for the main menu.
+    """
+    from modules.draw import show_splash
+    from modules.online import connect, play_online
+    from modules.protocol import parse_address
+
+    try:
+        client = connect(*parse_address(address))
+    except OSError:
+        show_splash(screen, f"Could not reach {address}", duration=2000, font_size=48)
+        return None
+    try:
+        return play_online(screen, client, match)
+    finally:
+        client.close()
+
+
+def main(address=None, match=None, bots=None, budget=None, record=True):
+    """
+    The game loop. With an address every game is played against another
+    client of that server instead of on one keyboard. bots maps player
+    numbers to the player specs (see players.load_player) of the seats
+    bots play, each in its own process with budget ms per shot.
+    Local games are recorded unless record is False or the record
+    directory cannot be written.
+    """
+    # load settings
+    rows, cols, ships = load_settings()
+
+    screen = init_display()
+
+    import pygame
+    from modules.menu import show_main_menu
+    from modules.placement import placement_phase
+    from modules.firing import firing_phase
+    from modules.game_record import open_recorder
+
+    seats = {}
+    if bots:
+        from modules.bot_process import MOVE_BUDGET, ProcessPlayer
+        from modules.placement import bot_placement
+
+        seats = {player: ProcessPlayer(spec, budget or MOVE_BUDGET) for player, spec in bots.items()}
 
-def main():
     running = True
-    
-    while running:
-        # quit condition
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+    try:
+        while running:
+            # quit condition
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+            # Show main menu
+            show_main_menu(screen)
+
+            if address:
+                show_main_menu(screen, winner=online_game(screen, address, match))
+                continue
 
-        # Show main menu
-        show_main_menu(screen)
+            # initialize BoatManager, sparse on huge boards
+            boat_manager = new_boat_manager(rows, cols, ships)
 
-        # initialize BoatManager
-        boat_manager = BoatManager(rows, cols, ships)
+            # start placement phase for both players
+            for player in [1, 2]:
+                if player in seats:
+                    bot_placement(screen, rows, cols, ships, f"Player {player}", boat_manager, player, seats[player])
+                else:
+                    placement_phase(screen, rows, cols, ships, f"Player {player}", boat_manager, player)
 
-        # start placement phase for both players
-        for player in [1, 2]:
-            placement_phase(screen, rows, cols, ships, f"Player {player}", boat_manager, player)
+            # start firing phase, recording every shot when we can
+            recorder = None
+            if record:
+                recorder = open_recorder(rows, cols, ships,
+                                         boat_manager.player_boards[1], boat_manager.player_boards[2])
+            try:
+                winner = firing_phase(screen, boat_manager, recorder, seats)
+            finally:
+                if recorder:
+                    recorder.close()
 
-        # start firing phase
-        winner = firing_phase(screen, boat_manager)
+            # show winner and loop back to menu
+            show_main_menu(screen, winner=winner)
+    finally:
+        # stop the bots' worker processes
+        for seat in seats.values():
+            seat.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play Battleship in a window.")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="play online on the server at this address")
+    parser.add_argument("--match", metavar="NAME", help="with --connect, join the named match")
+    parser.add_argument("--p1", metavar="SPEC", help="seat a bot as Player 1, e.g. hunt or mybot.py:MyBot")
+    parser.add_argument("--p2", metavar="SPEC", help="seat a bot as Player 2")
+    parser.add_argument("--budget", type=int, metavar="MS", help="milliseconds a bot gets per shot")
+    parser.add_argument("--no-record", action="store_true", help="do not save a record of local games")
+    parser.add_argument("--profile", nargs="?", const="profile.json", metavar="PATH",
+                        help="write frame and phase timings to PATH (.json or .csv) on exit")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print the time to the first menu frame and exit")
+    args = parser.parse_args(argv)
+
+    if args.match is not None and args.connect is None:
+        parser.error("--match needs --connect")
+    if args.connect is not None:
+        from modules.protocol import parse_address
+        try:
+            parse_address(args.connect)
+        except ValueError:
+            parser.error(f"--connect expects HOST:PORT, got {args.connect!r}")
+    if args.budget is not None and args.budget <= 0:
+        parser.error("--budget must be a positive number of milliseconds")
+    for spec in (args.p1, args.p2):
+        if spec is not None:
+            from modules.players import split_spec
+            try:
+                split_spec(spec)
+            except ValueError as e:
+                parser.error(str(e))
+    return args
 
-        # show winner and loop back to menu
-        show_main_menu(screen, winner=winner)
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.profile:
+        enable_profiling(args.profile)
+
+    if args.startup_time:
+        measure_startup()
+    elif args.connect is not None:
+        main(args.connect, args.match)
+    else:
+        bots = {player: spec for player, spec in ((1, args.p1), (2, args.p2)) if spec}
+        main(bots=bots, budget=args.budget, record=not args.no_record)
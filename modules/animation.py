@@ -0,0 +1,192 @@
+#################################################
+# animation.py - time-based tweens and the     #
+# shot/turn effects played over the board      #
+#################################################
+
+import pygame
+
+from modules.text_cache import render_text
+
+# Milliseconds between frames while something is animating
+FRAME_TIME = 1000 // 60
+
+# Milliseconds for the plane to cross the whole window, whatever its width
+FLIGHT_TIME = 800
+
+# Milliseconds the hit/miss message stays up after the shot lands
+MESSAGE_TIME = 700
+
+# Milliseconds the "Player N's turn" banner is shown
+BANNER_TIME = 1000
+
+
+def linear(t):
+    return t
+
+
+def ease_out(t):
+    return 1 - (1 - t) * (1 - t)
+
+
+class Tween:
+    """A value moving from start to end over duration ms, after delay ms."""
+
+    def __init__(self, start, end, duration, delay=0, easing=linear):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.delay = delay
+        self.easing = easing
+
+    def value(self, elapsed):
+        if self.duration <= 0:
+            t = 1.0 if elapsed >= self.delay else 0.0
+        else:
+            t = min(1.0, max(0.0, (elapsed - self.delay) / self.duration))
+        return self.start + (self.end - self.start) * self.easing(t)
+
+
+class Animation:
+    """
+    Something drawn over the board for duration ms from start_time.
+    finish() jumps to the end state, running on_finish exactly once.
+    """
+
+    duration = 0
+
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self.finished = False
+
+    def elapsed(self, now):
+        return now - self.start_time
+
+    def update(self, now):
+        if self.elapsed(now) >= self.duration:
+            self.finish()
+
+    def draw(self, screen, now):
+        """Draw the current frame, returning the rects drawn."""
+        return []
+
+    def finish(self):
+        if not self.finished:
+            self.finished = True
+            self.on_finish()
+
+    def on_finish(self):
+        pass
+
+
+class ShotAnimation(Animation):
+    """
+    The plane flying over a cell that has already been fired at. When it
+    passes the target the smoke or explosion and the hit/miss message
+    appear; at the end the effect is stamped into the renderer's base.
+    """
+
+    def __init__(self, renderer, assets, row, col, result, start_time,
+                 flight_time=FLIGHT_TIME, message_time=MESSAGE_TIME):
+        super().__init__(start_time)
+        self.renderer = renderer
+        self.row = row
+        self.col = col
+        self.result = result
+
+        cell_size = renderer.cell_size
+        self.cell_rect = renderer.cell_rect(row, col)
+        hit = result == "hit" or result.startswith("sunk:")
+        self.effect = assets.get("explosion" if hit else "smoke", (cell_size, cell_size), cell=True)
+        self.plane = assets.get("plane", (cell_size * 2, cell_size * 2), cell=True)
+
+        if result.startswith("sunk:"):
+            message = f"Sunk their {result.split(':')[1].capitalize()}!"
+        else:
+            message = "Hit!" if hit else "Miss!"
+        self.message = render_text(message, 48, (255, 215, 0))
+
+        # the plane crosses the window in flight_time, and the shot lands
+        # when its center passes the center of the target cell
+        plane_width = self.plane.get_width()
+        self.plane_x = Tween(-plane_width, renderer.screen.get_width(), flight_time)
+        self.plane_y = self.cell_rect.centery - self.plane.get_height() // 2
+        travel = renderer.screen.get_width() + plane_width
+        self.land_time = flight_time * (self.cell_rect.centerx + plane_width / 2) / travel
+        self.flight_time = flight_time
+        self.message_time = message_time
+        self.duration = max(flight_time, self.land_time + message_time)
+
+    def draw(self, screen, now):
+        elapsed = self.elapsed(now)
+        rects = []
+        if elapsed >= self.land_time:
+            rects.append(screen.blit(self.effect, self.cell_rect))
+            if elapsed < self.land_time + self.message_time:
+                text_rect = self.message.get_rect(center=(self.cell_rect.centerx, self.cell_rect.top - 30))
+                rects.append(screen.blit(self.message, text_rect))
+        if elapsed < self.flight_time:
+            rects.append(screen.blit(self.plane, (int(self.plane_x.value(elapsed)), self.plane_y)))
+        return rects
+
+    def on_finish(self):
+        self.renderer.stamp(self.effect, self.row, self.col)
+
+
+class TurnBanner(Animation):
+    """A band across the middle of the screen announcing whose turn it is."""
+
+    def __init__(self, text, start_time, duration=BANNER_TIME):
+        super().__init__(start_time)
+        self.text = render_text(text, 72, (255, 255, 0))
+        self.duration = duration
+        self.band = None
+
+    def draw(self, screen, now):
+        screen_rect = screen.get_rect()
+        if self.band is None:
+            self.band = pygame.Surface((screen_rect.width, self.text.get_height() + 40), pygame.SRCALPHA)
+            self.band.fill((25, 40, 60, 220))
+            self.band.blit(self.text, self.text.get_rect(center=self.band.get_rect().center))
+            # slide in from the left over the first fifth of the banner's time
+            self.band_x = Tween(-screen_rect.width, 0, self.duration // 5, easing=ease_out)
+
+        rect = self.band.get_rect(centery=screen_rect.centery)
+        rect.x = int(self.band_x.value(self.elapsed(now)))
+        return [screen.blit(self.band, rect)]
+
+
+class Animator:
+    """
+    The animations currently playing. The owning loop calls update(now)
+    then draw(screen, now) every frame while active is True, and any
+    number of animations can play at once.
+    """
+
+    def __init__(self):
+        self.animations = []
+
+    @property
+    def active(self):
+        return bool(self.animations)
+
+    def add(self, animation):
+        self.animations.append(animation)
+        return animation
+
+    def update(self, now):
+        for animation in self.animations:
+            animation.update(now)
+        self.animations = [animation for animation in self.animations if not animation.finished]
+
+    def draw(self, screen, now):
+        rects = []
+        for animation in self.animations:
+            rects.extend(animation.draw(screen, now))
+        return rects
+
+    def finish_all(self, kind=None):
+        """Jump every animation, or every one of a class, to its end."""
+        for animation in self.animations:
+            if kind is None or isinstance(animation, kind):
+                animation.finish()
+        self.animations = [animation for animation in self.animations if not animation.finished]
@@ -0,0 +1,99 @@
+#################################################
+# assets.py - decodes every image once and     #
+# caches scaled/rotated/tinted variants        #
+#################################################
+
+from collections import OrderedDict
+
+import pygame
+
+ASSET_PATHS = {
+    "crosshair": "assets/crosshair.png",
+    "explosion": "assets/explosion.png",
+    "icon": "assets/icon.png",
+    "logo": "assets/logo.png",
+    "plane": "assets/plane.png",
+    "smoke": "assets/smoke.png",
+}
+
+
+class AssetManager:
+    """
+    Serves image surfaces for the draw code.
+
+    image(name) decodes a file once with convert_alpha(). get(name, size,
+    angle, tint) returns a derived surface from an LRU cache keyed on
+    (name, size, angle, tint, smooth), so hot loops never scale or rotate
+    the same image twice. set_cell_size drops the surfaces fetched with
+    cell=True when the grid cell size changes, since they were sized for
+    the old cells; the rest, like the menu logo, stay cached.
+    """
+
+    def __init__(self, max_derived=256):
+        self.max_derived = max_derived
+        self.cell_size = None
+        self._images = {}
+        self._derived = OrderedDict()
+        # keys of the derived surfaces sized from the grid cells
+        self._cell_keys = set()
+
+        # counters for profiling
+        self.decoded = 0
+        self.derived_created = 0
+
+    def image(self, name):
+        """The decoded, unscaled image."""
+        surf = self._images.get(name)
+        if surf is None:
+            surf = pygame.image.load(ASSET_PATHS[name])
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert_alpha()
+            self._images[name] = surf
+            self.decoded += 1
+        return surf
+
+    def get(self, name, size=None, angle=0, tint=None, smooth=False, cell=False):
+        """
+        The image scaled to size (width, height), then rotated by angle
+        degrees, then multiplied by the tint color. cell=True marks a size
+        derived from the grid cell size, to be dropped when it changes.
+        """
+        if size is None and not angle and tint is None:
+            return self.image(name)
+
+        key = (name, size, angle, tint, smooth)
+        if cell:
+            self._cell_keys.add(key)
+        surf = self._derived.get(key)
+        if surf is not None:
+            self._derived.move_to_end(key)
+            return surf
+
+        surf = self.image(name)
+        if size is not None:
+            scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+            surf = scale(surf, size)
+        if angle:
+            surf = pygame.transform.rotate(surf, angle)
+        if tint is not None:
+            surf = surf.copy()
+            surf.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
+
+        self._derived[key] = surf
+        self.derived_created += 1
+        if len(self._derived) > self.max_derived:
+            oldest, _ = self._derived.popitem(last=False)
+            self._cell_keys.discard(oldest)
+        return surf
+
+    def set_cell_size(self, cell_size):
+        """Forget the cell-sized surfaces when the grid cell size changes."""
+        if cell_size != self.cell_size:
+            self.cell_size = cell_size
+            for key in self._cell_keys:
+                self._derived.pop(key, None)
+            self._cell_keys.clear()
+
+
+# shared by every screen
+asset_manager = AssetManager()
@@ -0,0 +1,152 @@
+#################################################
+# batch_state.py - K games held as stacked     #
+# NumPy arrays, one vectorized shot per step   #
+#################################################
+
+import numpy as np
+
+from modules.boat_management import SHIP_TYPES
+from modules.bitboard import find_ships
+
+# Result codes returned by BatchGameState.step
+MISS = 0
+HIT = 1
+SUNK = 2
+REPEAT = 3
+FINISHED = 4  # game was already over, shot ignored
+
+SHIP_NAMES = list(SHIP_TYPES)
+
+
+class BatchGameState:
+    """
+    K independent two-player games following the BoatManager rules.
+
+    Arrays are indexed [game, player - 1, ...]:
+        ship_ids   (K, 2, rows, cols)  ship id on that player's board, -1 for water
+        shots      (K, 2, rows, cols)  cells that player has fired at
+        remaining  (K, 2, max_ships)   unhit cells left per ship
+        ship_types (K, 2, max_ships)   index into SHIP_NAMES, -1 for unused slots
+        afloat     (K, 2)              ships not yet sunk
+    turn holds the current attacker (0 or 1) and winner the winning
+    player (1 or 2), 0 while the game is running.
+    """
+
+    def __init__(self, rows, cols, ship_ids, ship_types, remaining):
+        self.rows = rows
+        self.cols = cols
+        self.ship_ids = ship_ids
+        self.ship_types = ship_types
+        self.remaining = remaining
+        self.n_games = ship_ids.shape[0]
+
+        self.shots = np.zeros(ship_ids.shape, dtype=bool)
+        self.afloat = (remaining > 0).sum(axis=2).astype(np.int16)
+        self.turn = np.zeros(self.n_games, dtype=np.int8)
+        self.winner = np.zeros(self.n_games, dtype=np.int8)
+        self.last_sunk = np.full(self.n_games, -1, dtype=np.int8)
+        self._games = np.arange(self.n_games)
+
+    @classmethod
+    def from_boards(cls, rows, cols, boards):
+        """
+        boards: list of (player 1 board, player 2 board) pairs, each a 2D list
+        as passed to BoatManager.set_player_ships.
+        """
+        fleets = [[find_ships(board, rows, cols) for board in pair] for pair in boards]
+        max_ships = max(len(fleet) for pair in fleets for fleet in pair)
+
+        k = len(boards)
+        ship_ids = np.full((k, 2, rows, cols), -1, dtype=np.int16)
+        ship_types = np.full((k, 2, max_ships), -1, dtype=np.int8)
+        remaining = np.zeros((k, 2, max_ships), dtype=np.int16)
+
+        for game, pair in enumerate(fleets):
+            for player, fleet in enumerate(pair):
+                for ship_id, (ship_name, cells) in enumerate(fleet):
+                    rr, cc = zip(*cells)
+                    ship_ids[game, player, list(rr), list(cc)] = ship_id
+                    ship_types[game, player, ship_id] = SHIP_NAMES.index(ship_name)
+                    remaining[game, player, ship_id] = len(cells)
+
+        return cls(rows, cols, ship_ids, ship_types, remaining)
+
+    # ------------------------------
+    # Fire one shot in every game
+    # ------------------------------
+    def step(self, target_rows, target_cols):
+        """
+        The current attacker of every game fires at (target_rows[k], target_cols[k]).
+        Returns an int8 array of result codes (MISS, HIT, SUNK, REPEAT, FINISHED).
+        A miss passes the turn, exactly like firing_phase. The name index of
+        each sunk ship is left in last_sunk.
+        """
+        games = self._games
+        r = np.asarray(target_rows)
+        c = np.asarray(target_cols)
+        attacker = self.turn.astype(np.intp)
+        defender = 1 - attacker
+
+        codes = np.full(self.n_games, MISS, dtype=np.int8)
+        running = self.winner == 0
+        repeat = self.shots[games, attacker, r, c] & running
+        live = running & ~repeat
+
+        self.shots[games[live], attacker[live], r[live], c[live]] = True
+
+        ids = self.ship_ids[games, defender, r, c]
+        hit = live & (ids >= 0)
+        safe_ids = np.where(hit, ids, 0)
+
+        # one shot per game, so the fancy-indexed decrement never collides
+        self.remaining[games[hit], defender[hit], safe_ids[hit]] -= 1
+        sunk = hit & (self.remaining[games, defender, safe_ids] == 0)
+        self.afloat[games[sunk], defender[sunk]] -= 1
+
+        won = sunk & (self.afloat[games, defender] == 0)
+        self.winner[won] = attacker[won] + 1
+
+        miss = live & ~hit
+        self.turn[miss] ^= 1
+
+        self.last_sunk[:] = -1
+        self.last_sunk[sunk] = self.ship_types[games[sunk], defender[sunk], safe_ids[sunk]]
+
+        codes[hit] = HIT
+        codes[sunk] = SUNK
+        codes[repeat] = REPEAT
+        codes[~running] = FINISHED
+        return codes
+
+    # ------------------------------
+    # Check which games are won
+    # ------------------------------
+    def check_win(self):
+        """
+        Returns an array with the winning player (1 or 2) of every game,
+        0 where the game is still running.
+        """
+        return self.winner
+
+    def random_targets(self, rng):
+        """
+        Pick a random cell the current attacker has not fired at yet, for
+        every game at once. rng is a numpy Generator.
+        """
+        shots = self.shots[self._games, self.turn.astype(np.intp)].reshape(self.n_games, -1)
+        scores = rng.random(shots.shape)
+        scores[shots] = -1.0
+        flat = scores.argmax(axis=1)
+        return flat // self.cols, flat % self.cols
+
+    def player_hits(self, game, player):
+        """
+        The "X"/"O" grid BoatManager.player_hits would hold for one game.
+        """
+        shots = self.shots[game, player - 1]
+        ships = self.ship_ids[game, 2 - player] >= 0
+        return [
+            ["X" if shots[r, c] and ships[r, c] else "O" if shots[r, c] else "~"
+             for c in range(self.cols)]
+            for r in range(self.rows)
+        ]
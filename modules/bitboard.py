@@ -0,0 +1,187 @@
+#################################################
+# bitboard.py - bitmask backed rules engine     #
+# with the same public API as BoatManager       #
+#################################################
+
+from modules.boat_management import SHIP_TYPES, mask_rows
+
+# reverse lookup: letter -> ship_name
+CHAR_TO_NAME = {v[1]: k for k, v in SHIP_TYPES.items()}
+
+
+def find_ships(board, rows, cols):
+    """
+    Group the ship cells of a board into ships.
+    Connected cells sharing a ship letter form one ship, matching
+    BoatManager._flood_fill_ship.
+    Returns a list of (ship_name, [(row, col), ...]).
+    """
+    visited = [[False] * cols for _ in range(rows)]
+    ships = []
+
+    for r in range(rows):
+        for c in range(cols):
+            cell = board[r][c]
+            if cell == "~" or visited[r][c]:
+                continue
+
+            stack = [(r, c)]
+            cells = []
+            while stack:
+                row, col = stack.pop()
+                if 0 <= row < rows and 0 <= col < cols:
+                    if board[row][col] == cell and not visited[row][col]:
+                        visited[row][col] = True
+                        cells.append((row, col))
+                        stack.extend([
+                            (row+1, col),
+                            (row-1, col),
+                            (row, col+1),
+                            (row, col-1)
+                        ])
+            ships.append((CHAR_TO_NAME[cell], cells))
+
+    return ships
+
+
+class BitboardBoatManager:
+    """
+    Drop-in alternative to BoatManager for bot matches and simulations.
+
+    Each board is an integer bitmask with bit (row * cols + col) per cell.
+    Every player keeps a mask of their ship cells, every ship keeps its own
+    mask plus a remaining-cell counter, and a cell -> ship index maps a hit
+    straight to the ship it belongs to. Firing, sunk detection and win
+    detection are therefore constant time regardless of board size.
+
+    player_hits keeps the "X"/"O" grids the draw code reads, and sunk_ships
+    mirrors BoatManager.
+    """
+
+    def __init__(self, rows, cols, ships):
+        self.rows = rows
+        self.cols = cols
+        self.ships = ships
+
+        # Attacker view of the opponent board, read by the draw code
+        self.player_hits = {1: self._empty_board(), 2: self._empty_board()}
+
+        # Bitmasks: ship cells per defender, shots fired per attacker
+        self.ship_masks = {1: 0, 2: 0}
+        self.shot_masks = {1: 0, 2: 0}
+
+        # Per-ship data, indexed by ship id
+        self.ship_names = {1: [], 2: []}
+        self.ship_cell_masks = {1: [], 2: []}
+        self.ships_remaining_cells = {1: [], 2: []}
+
+        # cell index -> ship id
+        self.cell_to_ship = {1: {}, 2: {}}
+
+        # Ships still afloat per player
+        self.ships_afloat = {1: 0, 2: 0}
+
+        # Sunk ships per player
+        self.sunk_ships = {1: [], 2: []}
+
+    def _empty_board(self):
+        return [["~" for _ in range(self.cols)] for _ in range(self.rows)]
+
+    # ------------------------------
+    # Place ships for a player
+    # ------------------------------
+    def set_player_ships(self, player, board):
+        """
+        board: 2D list with "~" for empty and ship letters for ship cells
+        """
+        cols = self.cols
+        ship_mask = 0
+        names = []
+        cell_masks = []
+        remaining = []
+        cell_to_ship = {}
+
+        for ship_id, (ship_name, cells) in enumerate(find_ships(board, self.rows, cols)):
+            mask = 0
+            for r, c in cells:
+                index = r * cols + c
+                mask |= 1 << index
+                cell_to_ship[index] = ship_id
+            names.append(ship_name)
+            cell_masks.append(mask)
+            remaining.append(len(cells))
+            ship_mask |= mask
+
+        self.ship_masks[player] = ship_mask
+        self.ship_names[player] = names
+        self.ship_cell_masks[player] = cell_masks
+        self.ships_remaining_cells[player] = remaining
+        self.cell_to_ship[player] = cell_to_ship
+        self.ships_afloat[player] = len(names)
+        self.sunk_ships[player] = []
+
+    # ------------------------------
+    # Fire at a cell
+    # ------------------------------
+    def fire_at(self, attacker, defender, row, col):
+        """
+        Returns:
+            "hit" if hit a ship
+            "miss" if missed
+            "repeat" if already shot
+            "sunk:ship_name" if ship sunk
+        """
+        index = row * self.cols + col
+        bit = 1 << index
+
+        # Already shot here
+        if self.shot_masks[attacker] & bit:
+            return "repeat"
+        self.shot_masks[attacker] |= bit
+
+        ship_id = self.cell_to_ship[defender].get(index)
+        if ship_id is None:
+            self.player_hits[attacker][row][col] = "O"
+            return "miss"
+
+        self.player_hits[attacker][row][col] = "X"
+        remaining = self.ships_remaining_cells[defender]
+        remaining[ship_id] -= 1
+        if remaining[ship_id] == 0:
+            ship_name = self.ship_names[defender][ship_id]
+            self.sunk_ships[defender].append(ship_name)
+            self.ships_afloat[defender] -= 1
+            return f"sunk:{ship_name}"
+        return "hit"
+
+    def restore_shots(self, attacker, fired, sunk):
+        """Same as BoatManager.restore_shots."""
+        defender = 3 - attacker
+        cols = self.cols
+        shots = int.from_bytes(fired, "little")
+        self.shot_masks[attacker] = shots
+
+        ships = format(self.ship_masks[defender], "b").zfill(self.rows * cols)[::-1]
+        hits = self.player_hits[attacker]
+        for r, flags in mask_rows(fired, self.rows, cols):
+            hits[r][:] = [("X" if ship == "1" else "O") if flag == "1" else "~"
+                          for flag, ship in zip(flags, ships[r * cols:(r + 1) * cols])]
+
+        remaining = self.ships_remaining_cells[defender]
+        for ship_id, mask in enumerate(self.ship_cell_masks[defender]):
+            remaining[ship_id] = bin(mask & ~shots).count("1")
+        self.sunk_ships[defender] = list(sunk)
+        self.ships_afloat[defender] = sum(1 for cells in remaining if cells)
+
+    # ------------------------------
+    # Check if a player has won
+    # ------------------------------
+    def check_win(self):
+        """
+        Returns the winning player (1 or 2) if all ships of a player are sunk.
+        Else returns None.
+        """
+        for player in [1, 2]:
+            if self.ships_afloat[player] == 0:
+                return 2 if player == 1 else 1
+        return None
@@ -0,0 +1,110 @@
+#################################################
+# board_renderer.py - layered board drawing    #
+# with dirty-rect display updates              #
+#################################################
+
+import pygame
+
+
+class BoardRenderer:
+    """
+    Keeps the static parts of a screen (background, grid, labels, text and
+    stamped hits/misses or placed ships) composited on an offscreen base
+    surface. Each frame only the moving parts (crosshair, ship preview,
+    cursor) are drawn on top, and only the rects they touched this frame
+    and last frame are restored and pushed to the display.
+
+    When only part of the board is in view, rows and cols are the visible
+    cells and (first_row, first_col) is the board cell at the origin.
+
+    Typical frame:
+        renderer.begin_frame()
+        ...draw sprites on renderer.screen, renderer.mark(rect) each one...
+        renderer.end_frame()
+    """
+
+    def __init__(self, screen, rows, cols, cell_size, origin_x, origin_y, first_row=0, first_col=0):
+        self.screen = screen
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.first_row = first_row
+        self.first_col = first_col
+        self.base = pygame.Surface(screen.get_size()).convert()
+        self._last_rects = []     # sprites drawn last frame
+        self._sprite_rects = []   # sprites drawn this frame
+        self._base_rects = []     # base changes not on screen yet
+        self._full_update = True
+
+    def cell_rect(self, row, col):
+        return pygame.Rect(self.origin_x + (col - self.first_col) * self.cell_size,
+                           self.origin_y + (row - self.first_row) * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def in_view(self, row, col):
+        return (self.first_row <= row < self.first_row + self.rows
+                and self.first_col <= col < self.first_col + self.cols)
+
+    # ------------------------------
+    # Static layer
+    # ------------------------------
+    def rebuild(self, draw_static):
+        """
+        Redraw the base surface with draw_static(surface) and push the whole
+        screen on the next end_frame.
+        """
+        draw_static(self.base)
+        self._full_update = True
+
+    def stamp(self, image, row, col):
+        """Permanently draw an image into one cell of the base surface."""
+        if not self.in_view(row, col):
+            return
+        rect = self.cell_rect(row, col)
+        self.base.blit(image, rect)
+        self.mark_base(rect)
+
+    def mark_base(self, rect):
+        """The base changed inside rect; show it on the next frame."""
+        self._base_rects.append(pygame.Rect(rect))
+
+    # ------------------------------
+    # Per-frame sprites
+    # ------------------------------
+    def begin_frame(self):
+        """
+        Restore what last frame's sprites covered, and any stamped cells,
+        from the base surface.
+        """
+        if self._full_update:
+            self.screen.blit(self.base, (0, 0))
+        else:
+            for rect in self._last_rects + self._base_rects:
+                self.screen.blit(self.base, rect, rect)
+
+    def mark(self, rect):
+        """Something was drawn inside rect this frame."""
+        self._sprite_rects.append(pygame.Rect(rect))
+
+    def mark_cells(self, cells):
+        for row, col in cells:
+            self.mark(self.cell_rect(row, col))
+
+    def end_frame(self):
+        """Push the changed parts of the screen to the display."""
+        screen_rect = self.screen.get_rect()
+        if self._full_update:
+            pygame.display.flip()
+            self._full_update = False
+        else:
+            dirty = [rect.clip(screen_rect) for rect in self._last_rects + self._base_rects + self._sprite_rects]
+            pygame.display.update([rect for rect in dirty if rect.width and rect.height])
+        self._last_rects = self._sprite_rects
+        self._sprite_rects = []
+        self._base_rects = []
+
+    def force_full_update(self):
+        """Redraw the whole screen next frame, e.g. after a splash screen."""
+        self._full_update = True
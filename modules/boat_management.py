@@ -12,6 +12,32 @@ SHIP_TYPES = {
 }
 
 
+# the set bits of every byte value, lowest first
+BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def mask_cells(mask, cols):
+    """
+    (row, col) of every set bit in a cell mask, bit row * cols + col of
+    the little endian bytes, in cell order.
+    """
+    return [divmod(index * 8 + bit, cols)
+            for index, byte in enumerate(mask) if byte
+            for bit in BYTE_BITS[byte]]
+
+
+def mask_rows(mask, rows, cols):
+    """
+    (row, flags) for every row of a cell mask with a bit set, flags a
+    "0"/"1" string with one character per column. Unlike mask_cells the
+    work does not grow with the number of bits set.
+    """
+    bits = format(int.from_bytes(mask, "little"), "b").zfill(len(mask) * 8)[::-1]
+    for r in range(rows):
+        flags = bits[r * cols:(r + 1) * cols]
+        if "1" in flags:
+            yield r, flags
+
 
 class BoatManager:
     def __init__(self, rows, cols, ships):
@@ -123,6 +149,21 @@ class BoatManager:
                     return ship_name
         return None
 
+    def restore_shots(self, attacker, fired, sunk):
+        """
+        Put the game in the state after attacker fired at every cell of
+        the `fired` mask (see mask_cells), with the ships in `sunk` sunk
+        in that order. Nothing is re-fired: cells are marked directly.
+        """
+        defender = 3 - attacker
+        board = self.player_boards[defender]
+        hits = self.player_hits[attacker]
+        for r, flags in mask_rows(fired, self.rows, self.cols):
+            marks = [("O" if cell == "~" else "X") if flag == "1" else "~" for flag, cell in zip(flags, board[r])]
+            hits[r][:] = marks
+            board[r][:] = [mark if mark != "~" else cell for mark, cell in zip(marks, board[r])]
+        self.sunk_ships[defender] = list(sunk)
+
     # ------------------------------
     # Check if a player has won
     # ------------------------------
@@ -0,0 +1,389 @@
+#################################################
+# bot_process.py - runs untrusted players in   #
+# worker processes with a time budget per move #
+#################################################
+
+import json
+import multiprocessing
+import operator
+import random
+import time
+
+from modules.boat_management import SHIP_TYPES
+from modules.players import Player, load_player, random_placement
+
+# Milliseconds a bot gets to choose a shot, and to set up a game and
+# place its fleet, before the default move is played for it
+MOVE_BUDGET = 1000
+PLACEMENT_BUDGET = 5000
+
+# A bot that runs out of time this many moves in a row is stopped, the
+# rest of its game is played with default moves and it is restarted for
+# the next game
+MAX_TIMEOUTS = 3
+
+# Seconds a worker gets to start and load its player
+START_TIMEOUT = 30
+
+# Largest message read from a worker, in bytes; a longer one fails the move
+MAX_MESSAGE = 64 * 1024 * 1024
+
+# Answers a worker may send, besides the "ready" handshake
+ANSWERS = ("place_ships", "choose_shot", "error")
+
+
+def _plain(value):
+    """JSON fallback for the NumPy integers and arrays bots tend to return."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    try:
+        return operator.index(value)
+    except TypeError:
+        raise TypeError(f"{type(value).__name__} is not a plain value") from None
+
+
+def send_message(conn, message):
+    """Send a message as JSON; pickles never cross the pipe either way."""
+    conn.send_bytes(json.dumps(message, default=_plain).encode("utf-8"))
+
+
+def recv_message(conn):
+    """
+    The next message as plain data (lists, dicts, strings, numbers), or
+    None if it is not JSON. EOFError/OSError mean the other end went away
+    or sent more than MAX_MESSAGE bytes, after which the pipe is unusable.
+    """
+    data = conn.recv_bytes(MAX_MESSAGE)
+    try:
+        return json.loads(data.decode("utf-8"))
+    except (ValueError, RecursionError):
+        return None
+
+
+def _worker(spec, conn):
+    """
+    Worker process entry point: loads the player and answers requests
+    (id, method, args) until the pipe closes. observe is one-way.
+    """
+    player = load_player(spec)
+    send_message(conn, [0, "ready", None])
+    while True:
+        try:
+            request_id, method, args = recv_message(conn)
+        except (EOFError, OSError, TypeError, ValueError):
+            # the game went away
+            return
+        try:
+            if method == "new_game":
+                rows, cols, ships, seed = args
+                player.new_game(rows, cols, ships, random.Random(seed))
+                continue
+            result = getattr(player, method)(*args)
+        except Exception as e:
+            result = repr(e)
+            method = "error"
+        if not request_id:
+            continue
+        try:
+            send_message(conn, [request_id, method, result])
+        except (TypeError, ValueError) as e:
+            # an answer that is not plain data
+            send_message(conn, [request_id, "error", repr(e)])
+
+
+def load_bot(spec, budget=None):
+    """
+    load_player(spec), or with a budget in milliseconds a ProcessPlayer
+    that gets that long for each shot.
+    """
+    if budget is None:
+        return load_player(spec)
+    return ProcessPlayer(spec, move_budget=budget)
+
+
+def valid_board(board, rows, cols, ships):
+    """
+    A rows x cols grid holding exactly the settings' fleet, every ship a
+    straight run of its own letter and length. BoatManager finds ships
+    by flood fill, so ships with the same letter may not touch either.
+    """
+    lengths = {SHIP_TYPES[name][1]: SHIP_TYPES[name][0] for name in ships}
+    expected = {SHIP_TYPES[name][1]: count for name, count in ships.items() if count}
+    try:
+        if not isinstance(board, list) or len(board) != rows:
+            return False
+        if any(not isinstance(row, list) or len(row) != cols or not all(isinstance(cell, str) for cell in row)
+               for row in board):
+            return False
+        cells = {(r, c): board[r][c] for r in range(rows) for c in range(cols) if board[r][c] != "~"}
+
+        found = {}
+        seen = set()
+        for start, char in cells.items():
+            if start in seen:
+                continue
+            if char not in expected:
+                return False
+            # the cells BoatManager would take for this ship
+            piece = []
+            stack = [start]
+            seen.add(start)
+            while stack:
+                r, c = stack.pop()
+                piece.append((r, c))
+                for cell in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                    if cell not in seen and cells.get(cell) == char:
+                        seen.add(cell)
+                        stack.append(cell)
+            # connected and on one row or column means one straight run
+            straight = len({r for r, _ in piece}) == 1 or len({c for _, c in piece}) == 1
+            if len(piece) != lengths[char] or not straight:
+                return False
+            found[char] = found.get(char, 0) + 1
+    except TypeError:
+        return False
+    return found == expected
+
+
+def _well_formed(message):
+    """[id, method, answer] with an integer id and a known method."""
+    return (isinstance(message, list) and len(message) == 3
+            and type(message[0]) is int and message[1] in ANSWERS)
+
+
+class ProcessPlayer(Player):
+    """
+    A player loaded in its own worker process. Each move must come back
+    within its budget; otherwise, or if the bot fails or returns an
+    illegal move, a default move is played instead: a random fleet, or
+    a random cell this player has not fired at. The worker is stopped
+    after MAX_TIMEOUTS timeouts in a row or when it dies.
+
+    ask_placement()/poll_placement() and ask_shot()/poll_shot() let a GUI
+    wait for the bot without blocking, including while the worker is
+    still starting (see `starting`); place_ships() and choose_shot()
+    block like any other Player's. Messages are JSON, so a hostile bot
+    can send bad answers but cannot run code in this process.
+    """
+
+    def __init__(self, spec, move_budget=MOVE_BUDGET, placement_budget=PLACEMENT_BUDGET):
+        self.spec = spec
+        self.move_budget = move_budget
+        self.placement_budget = placement_budget
+        self.process = None
+        self.conn = None
+        # handshake deadline while the worker is starting, else None
+        self.start_deadline = None
+        # the request waiting for an answer: (id, deadline, budget)
+        self.waiting = None
+        self.next_id = 1
+        # earlier requests given up on whose answers may still come in
+        self.late = set()
+        self.timeouts = 0
+
+        # totals over every game, for reports
+        self.moves = 0
+        self.defaults = 0
+
+        self._start()
+
+    def _start(self):
+        # spawn: a fresh interpreter, nothing shared with pygame or the parent
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker, args=(self.spec, child), daemon=True)
+        self.process.start()
+        child.close()
+        # the handshake is checked by _started, without blocking the caller
+        self.start_deadline = time.perf_counter() + START_TIMEOUT
+
+    def _started(self, block=False):
+        """
+        True once the worker has loaded its player. False while it is
+        still starting, or after it failed to start and was stopped.
+        """
+        if self.start_deadline is None:
+            return self.alive
+        remaining = self.start_deadline - time.perf_counter()
+        try:
+            if not self.conn.poll(max(0, remaining) if block else 0):
+                if remaining <= 0 or block:
+                    self.stop()
+                return False
+            message = recv_message(self.conn)
+        except (EOFError, OSError):
+            self.stop()
+            return False
+        if message != [0, "ready", None]:
+            self.stop()
+            return False
+        self.start_deadline = None
+        return True
+
+    @property
+    def alive(self):
+        return self.process is not None
+
+    @property
+    def starting(self):
+        """True while the worker is still loading the bot."""
+        return self.alive and self.start_deadline is not None
+
+    def stop(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+            self.process = None
+            self.conn = None
+        self.start_deadline = None
+        self.waiting = None
+        self.late.clear()
+
+    def close(self):
+        self.stop()
+
+    # ------------------------------
+    # Requests
+    # ------------------------------
+    def _send(self, request_id, method, *args):
+        try:
+            send_message(self.conn, [request_id, method, list(args)])
+        except (OSError, ValueError):
+            self.stop()
+
+    def _ask(self, method, *args, budget):
+        if not self.alive:
+            return
+        request_id = self.next_id
+        self.next_id += 1
+        self.waiting = (request_id, time.perf_counter() + budget / 1000, budget)
+        self._send(request_id, method, *args)
+
+    def _poll(self, block=False):
+        """
+        (True, answer) once the waiting request is answered, or with None
+        if it failed or ran out of time; (False, None) while it may still
+        be answered. While the worker is starting the budget has not
+        started yet; it runs from the handshake.
+        Answers are parsed as JSON and checked for shape before use.
+        """
+        if self.start_deadline is not None and self.waiting:
+            if not self._started(block):
+                # still starting, or it never will
+                return (False, None) if self.alive else (True, None)
+            request_id, _, budget = self.waiting
+            self.waiting = (request_id, time.perf_counter() + budget / 1000, budget)
+
+        while self.waiting:
+            request_id, deadline, budget = self.waiting
+            remaining = deadline - time.perf_counter()
+            try:
+                ready = self.conn.poll(max(0, remaining) if block else 0)
+                if not ready:
+                    if remaining > 0 and not block:
+                        return False, None
+                    self._fail(request_id)
+                    self.timeouts += 1
+                    if self.timeouts >= MAX_TIMEOUTS:
+                        self.stop()
+                    return True, None
+                message = recv_message(self.conn)
+            except (EOFError, OSError):
+                self.stop()
+                return True, None
+            if not _well_formed(message):
+                # not an answer the worker would send
+                self._fail(request_id)
+                return True, None
+            answer_id, method, answer = message
+            late = answer_id in self.late
+            if answer_id == request_id:
+                self.waiting = None
+                self.timeouts = 0
+                return True, None if method == "error" else answer
+            if not late:
+                self._fail(request_id)
+                return True, None
+            # the answer to a request that already timed out: the bot only
+            # starts on this one now, so its budget starts now too
+            self.late.discard(answer_id)
+            self.waiting = (request_id, time.perf_counter() + budget / 1000, budget)
+        return True, None
+
+    def _fail(self, request_id):
+        """Give up on a request; its answer may still arrive, late."""
+        self.waiting = None
+        self.late.add(request_id)
+
+    # ------------------------------
+    # Player
+    # ------------------------------
+    def new_game(self, rows, cols, ships, rng):
+        super().new_game(rows, cols, ships, rng)
+        if not self.alive:
+            self._start()
+        self.fired = set()
+        self.timeouts = 0
+        # the bot gets its own seed, drawn here so games stay reproducible
+        self.seed = rng.random()
+
+    def ask_placement(self):
+        """Start the bot's game and fleet; poll_placement() returns the board."""
+        if self.alive:
+            self._send(0, "new_game", self.rows, self.cols, self.ships, self.seed)
+        self._ask("place_ships", budget=self.placement_budget)
+
+    def poll_placement(self, block=False):
+        """The board once it is ready (or a random fleet), otherwise None."""
+        ready, board = self._poll(block)
+        if not ready:
+            return None
+        self.moves += 1
+        if board is None or not valid_board(board, self.rows, self.cols, self.ships):
+            self.defaults += 1
+            return random_placement(self.rows, self.cols, self.ships, self.rng)
+        return board
+
+    def place_ships(self):
+        self.ask_placement()
+        return self.poll_placement(block=True)
+
+    def ask_shot(self):
+        """Start choosing a shot; poll_shot() returns it once it is ready."""
+        self._ask("choose_shot", budget=self.move_budget)
+
+    def poll_shot(self, block=False):
+        """The shot once it is ready (or the default move), otherwise None."""
+        ready, shot = self._poll(block)
+        if not ready:
+            return None
+        self.moves += 1
+        try:
+            row, col = map(operator.index, shot)
+            legal = 0 <= row < self.rows and 0 <= col < self.cols and (row, col) not in self.fired
+        except (TypeError, ValueError):
+            legal = False
+        if not legal:
+            self.defaults += 1
+            row, col = self.default_shot()
+        return row, col
+
+    def choose_shot(self):
+        self.ask_shot()
+        return self.poll_shot(block=True)
+
+    def default_shot(self):
+        """A random cell this player has not fired at."""
+        if len(self.fired) < self.rows * self.cols // 2:
+            while True:
+                shot = self.rng.randrange(self.rows), self.rng.randrange(self.cols)
+                if shot not in self.fired:
+                    return shot
+        unfired = [(r, c) for r in range(self.rows) for c in range(self.cols) if (r, c) not in self.fired]
+        return self.rng.choice(unfired)
+
+    def observe(self, row, col, result):
+        self.fired.add((row, col))
+        if self.alive:
+            self._send(0, "observe", row, col, result)
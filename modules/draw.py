@@ -1,5 +1,9 @@
 import pygame
 from string import ascii_uppercase
+from modules.assets import asset_manager
+from modules.text_cache import render_text, text_cache
+from modules.event_loop import wait_until
+from modules.profiler import profiler
 
 WHITE = (255, 255, 255)
 LABEL_GAP = 25
@@ -32,37 +36,52 @@ def draw_instructions(screen, text, width, top_padding = 15):
     Draws multi-line instructions centered horizontally.
     Returns the bottom y-coordinate after drawing the text.
     """
-    font = pygame.font.SysFont(None, 32)
     y = top_padding
     for line in text.split("\n"):
-        surf = font.render(line, True, WHITE)
+        surf = render_text(line, 32, WHITE)
         x = (width - surf.get_width()) // 2
         screen.blit(surf, (x, y))
         y += surf.get_height() + 2
     return y + 15
 
-# draw battleship grid
-def draw_grid(screen, rows, cols, cell_size, origin_x, origin_y):
+def measure_instructions(text, top_padding = 15):
     """
-    Draws labeled grid and grid lines.
+    Returns the bottom y-coordinate draw_instructions would return,
+    without drawing anything.
     """
-    font = pygame.font.SysFont(None, 22)
+    y = top_padding
+    for line in text.split("\n"):
+        y += render_text(line, 32, WHITE).get_height() + 2
+    return y + 15
 
-    # Column labels
-    for c in range(cols):
-        label = ascii_uppercase[c % 26]
-        surf = font.render(label, True, WHITE)
-        cx = origin_x + c * cell_size + cell_size // 2 - surf.get_width() // 2
-        cy = origin_y - LABEL_GAP
-        screen.blit(surf, (cx, cy))
+# spreadsheet style column names: A..Z, AA..AZ, BA..
+def column_label(col):
+    label = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        label = ascii_uppercase[rem] + label
+    return label
 
-    # Row labels
-    for r in range(rows):
-        label = str(r + 1)
-        surf = font.render(label, True, WHITE)
-        cx = origin_x - LABEL_GAP
-        cy = origin_y + r * cell_size + cell_size // 2 - surf.get_height() // 2
-        screen.blit(surf, (cx, cy))
+# draw battleship grid
+def draw_grid(screen, rows, cols, cell_size, origin_x, origin_y, first_row=0, first_col=0):
+    """
+    Draws labeled grid and grid lines.
+    rows x cols cells are drawn, labeled from board cell (first_row, first_col)
+    when only part of the board is in view.
+    """
+    # Column labels, only every few columns when they are wider than a cell
+    widest = render_text(column_label(first_col + cols - 1), 22, WHITE).get_width()
+    step = -(-(widest + 4) // cell_size)
+    labels = [column_label(first_col + c) if (first_col + c) % step == 0 else "" for c in range(cols)]
+    strip = text_cache.label_strip(labels, cell_size, 22, WHITE)
+    screen.blit(strip, (origin_x, origin_y - LABEL_GAP))
+
+    # Row labels, moved left when long numbers would touch the grid
+    step = -(-(render_text("0", 22, WHITE).get_height()) // cell_size)
+    labels = [str(first_row + r + 1) if (first_row + r) % step == 0 else "" for r in range(rows)]
+    strip = text_cache.label_strip(labels, cell_size, 22, WHITE, vertical=True)
+    screen.blit(strip, (min(origin_x - LABEL_GAP, origin_x - strip.get_width() - 4), origin_y))
 
     # Grid lines
     for r in range(rows):
@@ -83,19 +102,25 @@ SHIP_COLORS = {
     "D": (160, 82, 45)     # Destroyer - Brown
 }
 
-def draw_placed_ships(screen, board, cell_size, origin_x, origin_y):
+def draw_placed_ships(screen, board, cell_size, origin_x, origin_y, first_row=0, first_col=0, rows=None, cols=None):
     """
     Draw all ships already placed on the board with unique warship designs.
+    When rows/cols are given only that window of the board, starting at
+    (first_row, first_col), is drawn.
     """
-    plane_img = pygame.image.load("assets/plane.png").convert_alpha()
-
-    for r, row in enumerate(board):
-        for c, cell in enumerate(row):
+    asset_manager.set_cell_size(cell_size)
+    rows = len(board) - first_row if rows is None else rows
+    cols = len(board[0]) - first_col if cols is None else cols
+
+    for r in range(first_row, first_row + rows):
+        row = board[r]
+        for c in range(first_col, first_col + cols):
+            cell = row[c]
             if cell == "~":
                 continue
 
-            rect = pygame.Rect(origin_x + c * cell_size,
-                               origin_y + r * cell_size,
+            rect = pygame.Rect(origin_x + (c - first_col) * cell_size,
+                               origin_y + (r - first_row) * cell_size,
                                cell_size, cell_size)
 
             if cell == "C":  # Carrier
@@ -103,7 +128,7 @@ def draw_placed_ships(screen, board, cell_size, origin_x, origin_y):
                 if (r > 0 and board[r-1][c] == "C") or \
                    (r < len(board)-1 and board[r+1][c] == "C"):
                     orientation = "V"
-                draw_carrier_cell(screen, rect, plane_img, orientation)
+                draw_carrier_cell(screen, rect, orientation)
 
             elif cell == "B":  # Battleship
                 draw_battleship_cell(screen, rect)
@@ -158,23 +183,20 @@ def draw_destroyer_cell(screen, rect):
     pygame.draw.line(screen, stripe, (cx, rect.top), (cx, rect.bottom), 3)
 
 
-def draw_carrier_cell(screen, rect, plane_img, orientation):
+def draw_carrier_cell(screen, rect, orientation):
     """Carrier: grey flight deck with runway and plane"""
     deck_color = (115, 115, 115)
     pygame.draw.rect(screen, deck_color, rect)
-    draw_carrier_plane(screen, rect, plane_img, orientation)
+    draw_carrier_plane(screen, rect, orientation)
 
 
-def draw_carrier_plane(screen, rect, plane_img, orientation):
+def draw_carrier_plane(screen, rect, orientation):
     """
     Draw planes onto the carrier boat
     """
-    # Scale plane ~70% of tile
+    # Scale plane ~70% of tile, rotated 45°
     plane_size = int(rect.width * 0.7)
-    plane_scaled = pygame.transform.scale(plane_img, (plane_size, plane_size))
-
-    # Rotate plane 45°
-    plane_rotated = pygame.transform.rotate(plane_scaled, 45)
+    plane_rotated = asset_manager.get("plane", (plane_size, plane_size), angle=45, cell=True)
 
     # Get rotated rect for centering
     plane_rect = plane_rotated.get_rect()
@@ -230,6 +252,17 @@ def draw_ship_preview(screen, preview_cells, cell_size, origin_x, origin_y, vali
                            cell_size, cell_size)
         pygame.draw.rect(screen, color, rect)
 
+# mark every cell the current ship could be anchored on
+def draw_anchor_overlay(screen, anchors, cell_size, origin_x, origin_y):
+    """
+    Draw a small dot in each legal anchor cell, given in view coordinates.
+    """
+    radius = max(2, cell_size // 8)
+    for r, c in anchors:
+        center = (origin_x + c * cell_size + cell_size // 2,
+                  origin_y + r * cell_size + cell_size // 2)
+        pygame.draw.circle(screen, (90, 200, 120), center, radius)
+
 # highlight selected square
 def draw_cursor(screen, row, col, cell_size, origin_x, origin_y):
     """
@@ -241,6 +274,7 @@ def draw_cursor(screen, row, col, cell_size, origin_x, origin_y):
     pygame.draw.rect(screen, (255, 255, 0), rect, 3)
 
 # show a splash message on screen
+@profiler.profiled()
 def show_splash(screen, text, duration=1000, font_size=72, bg_color=(25, 40, 60), text_color=(255, 255, 0)):
     """
     Display a full-screen message (splash) for a brief duration.
@@ -253,225 +287,53 @@ def show_splash(screen, text, duration=1000, font_size=72, bg_color=(25, 40, 60)
         bg_color: background color
         text_color: color of the text
     """
-    font = pygame.font.SysFont(None, font_size)
-    clock = pygame.time.Clock()
     start_time = pygame.time.get_ticks()
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(text, font_size, text_color)
     rect = text_surface.get_rect(center=screen.get_rect().center)
 
-    while pygame.time.get_ticks() - start_time < duration:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+    # the message is static: draw it once and sleep until it times out
+    def redraw():
         screen.fill(bg_color)
         screen.blit(text_surface, rect)
         pygame.display.flip()
-        clock.tick(60)
 
-# plane bombs the battleship
-def animate_shot(screen, boat_manager, attacker, defender, target_row, target_col,
-                 cell_size, origin_x, origin_y, speed=20):
+    redraw()
+    wait_until(start_time + duration, redraw)
+
+def load_firing_assets():
     """
-    Animate a plane flying across the target and spawn hit/miss effect.
-    Only calls boat_manager.fire_at when the plane reaches the target.
+    Returns the shared AssetManager with the firing phase images decoded.
     """
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 48)
-
-    # Load assets
-    plane_img = pygame.image.load("assets/plane.png").convert_alpha()
-    explosion_img = pygame.image.load("assets/explosion.png").convert_alpha()
-    smoke_img = pygame.image.load("assets/smoke.png").convert_alpha()
-
-    # Scale plane to double size
-    plane_width, plane_height = cell_size * 2, cell_size * 2
-    plane_scaled = pygame.transform.scale(plane_img, (plane_width, plane_height))
-
-    # Target position
-    target_x = origin_x + target_col * cell_size
-    target_y = origin_y + target_row * cell_size
-
-    # Plane vertical centering
-    plane_x = -plane_width
-    plane_y = target_y - (plane_height - cell_size) // 2
-
-    # Plane center target
-    plane_center_target = target_x + cell_size // 2
-    effect_spawned = False
-    message_start_time = None
-    message_duration = 1000
-
-    # Keep track of displayed effects
-    hits = boat_manager.player_hits[attacker]
-
-    result = None
-
-    while plane_x < screen.get_width():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-        screen.fill((25, 40, 60))
-        from modules.draw import draw_grid
-        draw_grid(screen, boat_manager.rows, boat_manager.cols, cell_size, origin_x, origin_y)
-
-        # Draw existing hits/misses
-        for r in range(boat_manager.rows):
-            for c in range(boat_manager.cols):
-                x = origin_x + c * cell_size
-                y = origin_y + r * cell_size
-                if hits[r][c] == "X":
-                    screen.blit(pygame.transform.scale(explosion_img, (cell_size, cell_size)), (x, y))
-                elif hits[r][c] == "O":
-                    screen.blit(pygame.transform.scale(smoke_img, (cell_size, cell_size)), (x, y))
-
-        # Check if plane center reaches target center and fire
-        plane_center_x = plane_x + plane_width // 2
-        if not effect_spawned and plane_center_x >= plane_center_target:
-            # Call boat_manager.fire_at to determine hit/miss/sunk
-            result = boat_manager.fire_at(attacker, defender, target_row, target_col)
-            effect_spawned = True
-            message_start_time = pygame.time.get_ticks()
-
-        # Draw floating message
-        if message_start_time and result:
-            elapsed = pygame.time.get_ticks() - message_start_time
-            if elapsed < message_duration:
-                if result.startswith("sunk:"):
-                    ship_name = result.split(":")[1]
-                    msg = f"Sunk their {ship_name.capitalize()}!"
-                else:
-                    msg = "Hit!" if result == "hit" else "Miss!"
-                text_surf = font.render(msg, True, (255, 215, 0))
-                text_rect = text_surf.get_rect(center=(target_x + cell_size // 2, target_y - 30))
-                screen.blit(text_surf, text_rect)
-
-        # Draw the bomb/effect only after plane reaches center
-        if effect_spawned:
-            effect_img = explosion_img if result == "hit" or (result and result.startswith("sunk:")) else smoke_img
-            effect_scaled = pygame.transform.scale(effect_img, (cell_size, cell_size))
-            screen.blit(effect_scaled, (target_x, target_y))
-            
-        # Draw plane
-        screen.blit(plane_scaled, (plane_x, plane_y))
+    for name in ("crosshair", "smoke", "explosion", "plane"):
+        asset_manager.image(name)
+    return asset_manager
 
-        pygame.display.flip()
-        plane_x += speed
-        clock.tick(60)
-
-    pygame.time.wait(300)
-    return result
-
-def load_firing_assets():
-    CROSSHAIR_PATH = "assets/crosshair.png"
-    SMOKE_PATH = "assets/smoke.png"
-    EXPLOSION_PATH = "assets/explosion.png"
-    PLANE_PATH = "assets/plane.png"
-    return {
-        "crosshair": pygame.image.load(CROSSHAIR_PATH).convert_alpha(),
-        "smoke": pygame.image.load(SMOKE_PATH).convert_alpha(),
-        "explosion": pygame.image.load(EXPLOSION_PATH).convert_alpha(),
-        "plane": pygame.image.load(PLANE_PATH).convert_alpha(),
-    }
-
-def draw_firing_screen(screen, rows, cols, cell_size, origin_x, origin_y, hits, crosshair_row, crosshair_col, instruction_text, assets):
+def draw_firing_background(screen, rows, cols, cell_size, origin_x, origin_y, hits, instruction_text, assets,
+                           first_row=0, first_col=0):
+    """
+    Everything on the firing screen except the crosshair: the static layer
+    BoardRenderer composites once per turn. rows x cols cells are drawn,
+    starting at board cell (first_row, first_col).
+    """
+    assets.set_cell_size(cell_size)
+    explosion_img = assets.get("explosion", (cell_size, cell_size), cell=True)
+    smoke_img = assets.get("smoke", (cell_size, cell_size), cell=True)
     screen.fill((25, 40, 60))
-    draw_grid(screen, rows, cols, cell_size, origin_x, origin_y)
+    draw_grid(screen, rows, cols, cell_size, origin_x, origin_y, first_row, first_col)
     # Draw hits/misses
     for r in range(rows):
+        row = hits[first_row + r]
         for c in range(cols):
             x = origin_x + c * cell_size
             y = origin_y + r * cell_size
-            if hits[r][c] == "X":
-                img = pygame.transform.scale(assets["explosion"], (cell_size, cell_size))
-                screen.blit(img, (x, y))
-            elif hits[r][c] == "O":
-                img = pygame.transform.scale(assets["smoke"], (cell_size, cell_size))
-                screen.blit(img, (x, y))
-    # Draw crosshair
-    crosshair_scaled = pygame.transform.scale(assets["crosshair"], (cell_size, cell_size))
-    screen.blit(crosshair_scaled, (origin_x + crosshair_col * cell_size, origin_y + crosshair_row * cell_size))
+            if row[first_col + c] == "X":
+                screen.blit(explosion_img, (x, y))
+            elif row[first_col + c] == "O":
+                screen.blit(smoke_img, (x, y))
     # Draw instructions
-    font = pygame.font.SysFont(None, 32)
-    instr_text = font.render(instruction_text, True, (255,255,255))
+    instr_text = render_text(instruction_text, 32, (255,255,255))
     screen.blit(instr_text, (20, 20))
-    pygame.display.flip()
 
 def show_firing_splash(screen, text, duration=1000):
-    font = pygame.font.SysFont(None, 72)
-    clock = pygame.time.Clock()
-    start_time = pygame.time.get_ticks()
-    text_surface = font.render(text, True, (255, 255, 0))
-    rect = text_surface.get_rect(center=screen.get_rect().center)
-    while pygame.time.get_ticks() - start_time < duration:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-        screen.fill((25, 40, 60))
-        screen.blit(text_surface, rect)
-        pygame.display.flip()
-        clock.tick(60)
-
-def animate_firing_shot(screen, boat_manager, attacker, defender, target_row, target_col,
-                        cell_size, origin_x, origin_y, assets, speed=20):
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 48)
-    plane_width, plane_height = cell_size * 2, cell_size * 2
-    plane_scaled = pygame.transform.scale(assets["plane"], (plane_width, plane_height))
-    target_x = origin_x + target_col * cell_size
-    target_y = origin_y + target_row * cell_size
-    plane_x = -plane_width
-    plane_y = target_y - (plane_height - cell_size) // 2
-    plane_center_target = target_x + cell_size // 2
-    effect_spawned = False
-    message_start_time = None
-    message_duration = 1000
-    hits = boat_manager.player_hits[attacker]
-    result = None
-    while plane_x < screen.get_width():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-        screen.fill((25, 40, 60))
-        draw_grid(screen, boat_manager.rows, boat_manager.cols, cell_size, origin_x, origin_y)
-        # Draw hits/misses
-        for r in range(boat_manager.rows):
-            for c in range(boat_manager.cols):
-                x = origin_x + c * cell_size
-                y = origin_y + r * cell_size
-                if hits[r][c] == "X":
-                    img = pygame.transform.scale(assets["explosion"], (cell_size, cell_size))
-                    screen.blit(img, (x, y))
-                elif hits[r][c] == "O":
-                    img = pygame.transform.scale(assets["smoke"], (cell_size, cell_size))
-                    screen.blit(img, (x, y))
-        plane_center_x = plane_x + plane_width // 2
-        if not effect_spawned and plane_center_x >= plane_center_target:
-            result = boat_manager.fire_at(attacker, defender, target_row, target_col)
-            effect_spawned = True
-            message_start_time = pygame.time.get_ticks()
-        if message_start_time and result:
-            elapsed = pygame.time.get_ticks() - message_start_time
-            if elapsed < message_duration:
-                if result.startswith("sunk:"):
-                    ship_name = result.split(":")[1]
-                    msg = f"Sunk their {ship_name.capitalize()}!"
-                else:
-                    msg = "Hit!" if result == "hit" else "Miss!"
-                text_surf = font.render(msg, True, (255, 215, 0))
-                text_rect = text_surf.get_rect(center=(target_x + cell_size // 2, target_y - 30))
-                screen.blit(text_surf, text_rect)
-        if effect_spawned:
-            effect_img = assets["explosion"] if result == "hit" or (result and result.startswith("sunk:")) else assets["smoke"]
-            effect_scaled = pygame.transform.scale(effect_img, (cell_size, cell_size))
-            screen.blit(effect_scaled, (target_x, target_y))
-        screen.blit(plane_scaled, (plane_x, plane_y))
-        pygame.display.flip()
-        plane_x += speed
-        clock.tick(60)
-    pygame.time.wait(300)
-    return result
+    show_splash(screen, text, duration=duration, font_size=72,
+                bg_color=(25, 40, 60), text_color=(255, 255, 0))
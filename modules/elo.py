@@ -0,0 +1,97 @@
+#################################################
+# elo.py - ratings for automated players from  #
+# the results of the games between them        #
+#################################################
+
+import math
+
+# Rating of a player of average strength
+BASE_RATING = 1500
+
+# Every pairing that has played starts as if it had also drawn this many
+# games, so a bot that never wins still gets a finite rating
+PRIOR_GAMES = 1
+
+# Elo points per unit of natural-log strength
+SCALE = 400 / math.log(10)
+
+
+class Ratings:
+    """
+    Head-to-head results between bots, and Bradley-Terry ratings fitted
+    to them on the Elo scale. add() only updates the counts; fit() refines
+    the previous ratings, so refitting as results stream in is cheap.
+    """
+
+    def __init__(self, bots):
+        self.bots = list(bots)
+        self.index = {bot: i for i, bot in enumerate(self.bots)}
+        n = len(self.bots)
+        # games[i][j] played between i and j, points[i][j] that i scored
+        # against j (an unfinished game is half a point each)
+        self.games = [[0] * n for _ in range(n)]
+        self.points = [[0.0] * n for _ in range(n)]
+        self.strength = [1.0] * n
+
+    def add(self, bot1, bot2, winner):
+        """winner is bot1, bot2 or None for a game nobody won."""
+        i, j = self.index[bot1], self.index[bot2]
+        self.games[i][j] += 1
+        self.games[j][i] += 1
+        if winner == bot1:
+            self.points[i][j] += 1
+        elif winner == bot2:
+            self.points[j][i] += 1
+        else:
+            self.points[i][j] += 0.5
+            self.points[j][i] += 0.5
+
+    def fit(self, iterations=200, tolerance=1e-9):
+        """Minorization-maximization updates until the strengths settle."""
+        n = len(self.bots)
+        strength = self.strength
+        for _ in range(iterations):
+            change = 0.0
+            for i in range(n):
+                won = 0.0
+                expected = 0.0
+                for j in range(n):
+                    if i == j or not self.games[i][j]:
+                        continue
+                    won += self.points[i][j] + PRIOR_GAMES / 2
+                    expected += (self.games[i][j] + PRIOR_GAMES) / (strength[i] + strength[j])
+                if expected:
+                    new = won / expected
+                    change = max(change, abs(math.log(new / strength[i])))
+                    strength[i] = new
+            # only differences matter, keep the geometric mean at 1
+            mean = math.exp(sum(math.log(s) for s in strength) / n)
+            for i in range(n):
+                strength[i] /= mean
+            if change < tolerance:
+                break
+
+    def table(self, z=1.96):
+        """
+        (bot, rating, margin, games, score) rows, best first. The rating
+        is within +-margin with the confidence z stands for (1.96: 95%),
+        from the Fisher information of each bot's own results.
+        """
+        self.fit()
+        rows = []
+        for i, bot in enumerate(self.bots):
+            information = 0.0
+            games = 0
+            points = 0.0
+            for j in range(len(self.bots)):
+                if i == j or not self.games[i][j]:
+                    continue
+                p = self.strength[i] / (self.strength[i] + self.strength[j])
+                information += self.games[i][j] * p * (1 - p)
+                games += self.games[i][j]
+                points += self.points[i][j]
+            rating = BASE_RATING + SCALE * math.log(self.strength[i])
+            margin = z * SCALE / math.sqrt(information) if information else math.inf
+            rows.append((bot, rating, margin, games, points / games if games else 0.0))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
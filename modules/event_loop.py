@@ -0,0 +1,69 @@
+#################################################
+# event_loop.py - blocking event waits so idle #
+# screens sleep instead of spinning at 60 FPS   #
+#################################################
+
+import time
+
+import pygame
+
+from modules.profiler import profiler
+
+# Longest a screen sleeps without any event, in milliseconds
+IDLE_TIMEOUT = 1000
+
+# Milliseconds between checks while waiting on something outside pygame,
+# like a bot's worker process
+POLL_INTERVAL = 20
+
+# Events that mean the window contents were lost and need a full redraw
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+
+def wait_events(timeout=IDLE_TIMEOUT):
+    """
+    Sleep until an event arrives or timeout milliseconds pass, then
+    return every pending event (an empty list on timeout).
+    """
+    start = time.perf_counter()
+    event = pygame.event.wait(max(1, int(timeout)))
+    profiler.idle(time.perf_counter() - start)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    return events
+
+
+def wait_until(deadline, redraw=None):
+    """
+    Sleep until pygame.time.get_ticks() reaches deadline, handling quit
+    events on the way and calling redraw() if the window gets exposed.
+    Used by fixed-duration splash screens.
+    """
+    while True:
+        remaining = deadline - pygame.time.get_ticks()
+        if remaining <= 0:
+            return
+        for event in wait_events(remaining):
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            if event.type in EXPOSE_EVENTS and redraw:
+                redraw()
+
+
+def wait_for(poll, redraw=None):
+    """
+    Call poll() every POLL_INTERVAL milliseconds until it returns
+    something other than None and return that, handling quit and expose
+    events like wait_until.
+    """
+    while True:
+        result = poll()
+        if result is not None:
+            return result
+        for event in wait_events(POLL_INTERVAL):
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                exit()
+            if event.type in EXPOSE_EVENTS and redraw:
+                redraw()
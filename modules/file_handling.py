@@ -5,6 +5,10 @@
 
 import json
 import os
+import time
+import warnings
+
+from modules.settings_cache import ValidationCache
 
 SHIP_LENGTHS = {  # length
     "carrier": 5,
@@ -48,7 +52,7 @@ def load_settings(path="settings.json"):
 
 
 # make sure that you can place ships with the chosen board size and shipcounts
-def validate_settings(rows, cols, ship_counts):
+def validate_settings(rows, cols, ship_counts, use_cache=True):
     # makesure ships in settings.json exist
     for name in ship_counts:
         if name not in SHIP_LENGTHS:
@@ -73,64 +77,161 @@ def validate_settings(rows, cols, ship_counts):
                 f"{rows}x{cols} board in any orientation."
             )
 
-    # brute force orientation checker, to check whether a set of ships can be placed on a given grid without overlap
+    # make sure the ships can actually be arranged without overlap
     lengths = []
     for name, count in ship_counts.items():
         lengths.extend([SHIP_LENGTHS[name]] * count)
 
-    if not can_place_all_ships(rows, cols, lengths):
+    # the search is skipped when this configuration was validated before
+    cache = ValidationCache() if use_cache else None
+    result = cache.get(rows, cols, lengths) if cache else None
+    if result is None:
+        result = check_feasibility(rows, cols, lengths)
+        if cache and result != UNKNOWN:
+            cache.put(rows, cols, lengths, result)
+
+    if result == INFEASIBLE:
         raise ValueError("Impossible board: Ships cannot be arranged without overlap.")
+    if result == UNKNOWN:
+        warnings.warn(
+            f"Could not prove within {FEASIBILITY_TIME_BUDGET}s that the ships fit on a "
+            f"{rows}x{cols} board; continuing anyway."
+        )
 
     return True
 
 
-# Backtracking algorithm to bruteforce ship placement
-def can_place_all_ships(rows, cols, ship_lengths):
-    # Start with an empty grid
-    grid = [[0] * cols for _ in range(rows)]
+# Feasibility checker results
+FEASIBLE = "feasible"
+INFEASIBLE = "infeasible"
+UNKNOWN = "unknown"
 
-    # Place largest ships first (helps pruning)
-    ship_lengths = sorted(ship_lengths, reverse=True)
+# Seconds the feasibility search may run before giving up with UNKNOWN
+FEASIBILITY_TIME_BUDGET = 0.5
 
-    return place_ship(grid, ship_lengths, 0)
 
+class _OutOfTime(Exception):
+    pass
 
-def place_ship(grid, ships, index):
-    if index == len(ships):
-        return True  # all ships placed successfully
 
-    ship_len = ships[index]
-    rows = len(grid)
-    cols = len(grid[0])
+def can_place_all_ships(rows, cols, ship_lengths, time_budget=FEASIBILITY_TIME_BUDGET):
+    """
+    True if the ships can be placed without overlap. A search that runs
+    out of time counts as not placeable.
+    """
+    return check_feasibility(rows, cols, ship_lengths, time_budget) == FEASIBLE
 
-    for r in range(rows):
-        for c in range(cols):
 
-            # Choose placement orientation
-            if c + ship_len <= cols and all(grid[r][cc] == 0 for cc in range(c, c + ship_len)):
-                # Horizontal placement
-                for cc in range(c, c + ship_len):
-                    grid[r][cc] = 1
+def check_feasibility(rows, cols, ship_lengths, time_budget=FEASIBILITY_TIME_BUDGET):
+    """
+    Decide whether ships of the given lengths fit on a rows x cols board.
+    Returns FEASIBLE, INFEASIBLE or UNKNOWN if time_budget seconds ran out.
+    """
+    if not ship_lengths:
+        return FEASIBLE
 
-                if place_ship(grid, ships, index + 1):
-                    return True
+    # the board can be transposed freely, keep rows <= cols
+    if rows > cols:
+        rows, cols = cols, rows
 
-                for cc in range(c, c + ship_len):
-                    grid[r][cc] = 0
+    # cheap bounds first
+    if sum(ship_lengths) > rows * cols or max(ship_lengths) > cols:
+        return INFEASIBLE
 
-            elif r + ship_len <= rows and all(grid[rr][c] == 0 for rr in range(r, r + ship_len)):
-                # Vertical placement
-                for rr in range(r, r + ship_len):
-                    grid[rr][c] = 1
+    # ships longer than the short side can only lie along the rows; a row
+    # holds at most cols // t ships of length t or more
+    for t in range(rows + 1, cols + 1):
+        if sum(1 for length in ship_lengths if length >= t) > rows * (cols // t):
+            return INFEASIBLE
 
-                if place_ship(grid, ships, index + 1):
-                    return True
+    # identical ships are interchangeable, so search over counts per length
+    distinct = sorted(set(ship_lengths), reverse=True)
+    counts = tuple(ship_lengths.count(length) for length in distinct)
 
-                for rr in range(r, r + ship_len):
-                    grid[rr][c] = 0
+    # placement masks per length anchored at cell 0: (horizontal, vertical)
+    masks = {}
+    for length in distinct:
+        horizontal = (1 << length) - 1
+        vertical = sum(1 << (i * cols) for i in range(length)) if length > 1 else None
+        masks[length] = (horizontal, vertical)
 
-            else:
-                # Cannot place ship here in either orientation
+    solver = _FeasibilitySolver(rows, cols, distinct, masks, time_budget)
+    slack = rows * cols - sum(ship_lengths)
+    try:
+        found = solver.search(0, 0, counts, slack)
+    except _OutOfTime:
+        return UNKNOWN
+    return FEASIBLE if found else INFEASIBLE
+
+
+class _FeasibilitySolver:
+    """
+    Depth-first search over the board in reading order. At the first free
+    cell either a ship starts there or the cell stays empty, so every
+    arrangement is reached exactly once. Failed states are memoized on the
+    occupied bitmask from the current cell onwards plus the ships left.
+    """
+
+    def __init__(self, rows, cols, lengths, masks, time_budget):
+        self.rows = rows
+        self.cols = cols
+        self.lengths = lengths
+        self.masks = masks
+        self.failed = set()
+        self.nodes = 0
+        self.deadline = time.perf_counter() + time_budget
+
+    def search(self, pos, occupied, counts, slack):
+        if not any(counts):
+            return True
+
+        cells = self.rows * self.cols
+        visited = []
+        while pos < cells:
+            if occupied >> pos & 1:
+                pos += 1
                 continue
 
-    return False
+            key = (pos, occupied >> pos, counts)
+            if key in self.failed:
+                break
+            visited.append(key)
+
+            self.nodes += 1
+            if self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+                raise _OutOfTime()
+
+            # ships too long to stand upright in the rows left must lie flat;
+            # a row holds at most cols // length of them
+            row, col = divmod(pos, self.cols)
+            rows_left = self.rows - row
+            longer = 0
+            for i, length in enumerate(self.lengths):
+                longer += counts[i]
+                if length <= rows_left:
+                    break
+                if longer > (self.cols - col) // length + (rows_left - 1) * (self.cols // length):
+                    self.failed.update(visited)
+                    return False
+
+            # a ship starts here
+            for i, length in enumerate(self.lengths):
+                if not counts[i]:
+                    continue
+                remaining = counts[:i] + (counts[i] - 1,) + counts[i + 1:]
+                horizontal, vertical = self.masks[length]
+                if col + length <= self.cols and not occupied & (horizontal << pos):
+                    if self.search(pos + 1, occupied | (horizontal << pos), remaining, slack):
+                        return True
+                if vertical is not None and row + length <= self.rows and not occupied & (vertical << pos):
+                    if self.search(pos + 1, occupied | (vertical << pos), remaining, slack):
+                        return True
+
+            # or the cell stays empty
+            if slack == 0:
+                break
+            slack -= 1
+            pos += 1
+
+        self.failed.update(visited)
+        return False
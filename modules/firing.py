@@ -1,76 +1,211 @@
 import pygame
 from modules import draw
+from modules.animation import FRAME_TIME, Animator, ShotAnimation, TurnBanner
+from modules.event_loop import EXPOSE_EVENTS, POLL_INTERVAL, wait_events
+from modules.profiler import profiler
+from modules.viewport import Minimap, Viewport
 
-def firing_phase(screen, boat_manager):
+# keys that skip every running animation to its end state
+SKIP_KEYS = (pygame.K_ESCAPE, pygame.K_RETURN)
+
+# minimap colors for each player's shots
+MINIMAP_HIT = (230, 70, 40)
+MINIMAP_MISS = (170, 170, 170)
+
+@profiler.profiled()
+def firing_phase(screen, boat_manager, recorder=None, bots=None):
+    """
+    Play the firing phase until someone wins. Every shot is passed to
+    recorder.shot() when a GameWriter is given. bots maps the player
+    numbers played by a bot_process.ProcessPlayer to it; those seats
+    fire on their own once the board is still.
+    """
     pygame.font.init()
-    clock = pygame.time.Clock()
     rows, cols = boat_manager.rows, boat_manager.cols
 
     # load all image assets needed for firing phase
     assets = draw.load_firing_assets()
     current_player = 1
     other_player = 2
-    
-    # show splash screen for current player at start of turn
-    draw.show_firing_splash(screen, f"Player {current_player}'s turn!")
+
+    # shots resolve immediately; their animations and the turn banners play
+    # over the board while input stays live
+    animator = Animator()
+
+    # show banner for current player at start of turn
+    animator.add(TurnBanner(f"Player {current_player}'s turn!", pygame.time.get_ticks()))
 
     # initialize crosshair position and game state
     cursor_row, cursor_col = 0, 0
     aiming = True
     winner = None
+    bots = bots or {}
+    # a bot seat is choosing its shot
+    thinking = False
+
+    # "turn" or "win" once a shot has ended the turn or the game; it takes
+    # effect when that shot's animation has finished or been skipped
+    pending = None
+
+    # big boards only show the cells around the crosshair, with a minimap
+    # of each player's shots
+    viewport = Viewport(rows, cols, screen.get_width(), screen.get_height())
+    minimaps = {1: Minimap(rows, cols), 2: Minimap(rows, cols)}
+
+    # grid, labels, hits and instructions are composited once per turn and
+    # whenever the view moves; each frame only draws the crosshair and the
+    # animations
+    renderer = None
+    view_drawn = None
+    needs_redraw = True
+
+    def fire(row, col):
+        nonlocal pending
+        result = boat_manager.fire_at(current_player, other_player, row, col)
+        if recorder:
+            recorder.shot(current_player, row, col, result)
+        if current_player in bots:
+            bots[current_player].observe(row, col, result)
+        animator.add(ShotAnimation(renderer, assets, row, col, result, pygame.time.get_ticks()))
+        minimap.set_cell(row, col, MINIMAP_MISS if result == "miss" else MINIMAP_HIT, weak=result == "miss")
+        if viewport.partial:
+            renderer.mark_base(minimap.draw(renderer.base, viewport))
+        # check if player hit missed or sunk a ship and update turn or end game
+        if result == "hit" or result.startswith("sunk:"):
+            if boat_manager.check_win():
+                pending = "win"
+        elif result == "miss":
+            pending = "turn"
 
     while aiming:
-        # calculate grid cell size and origin for current screen size
-        cell_size = draw.compute_cell_size(rows, cols, screen.get_width(), screen.get_height())
-        origin_x, origin_y = draw.compute_grid_origin(rows, cols, cell_size, screen.get_width(), screen.get_height())
-        # get current player's hit and miss data
-        hits = boat_manager.player_hits[current_player]
-        # prepare instruction text for display
-        instruction_text = f"Player {current_player}! Use Arrow Keys to lock your target, hit Space to fire!"
-
-        # draw the entire firing phase screen including grid hits crosshair and instructions
-        draw.draw_firing_screen(
-            screen, rows, cols, cell_size, origin_x, origin_y,
-            hits, cursor_row, cursor_col, instruction_text, assets
-        )
-        clock.tick(60)
-
-        # handle user input events for quitting or moving and firing
-        for event in pygame.event.get():
+        now = pygame.time.get_ticks()
+        animator.update(now)
+
+        # hand the turn over, or end the game, once the last shot has played
+        if pending and not animator.active:
+            if pending == "win":
+                break
+            current_player, other_player = other_player, current_player
+            animator.add(TurnBanner(f"Player {current_player}'s Turn", now))
+            pending = None
+
+        # a bot seat takes its shot once the last one has played out
+        bot_shot = None
+        if current_player in bots and not pending and not animator.active:
+            if not thinking:
+                bots[current_player].ask_shot()
+                thinking = True
+            bot_shot = bots[current_player].poll_shot()
+            if bot_shot:
+                thinking = False
+                cursor_row, cursor_col = bot_shot
+                viewport.center_on(cursor_row, cursor_col)
+
+        starting = current_player in bots and bots[current_player].starting
+        view = (current_player, viewport.key(), starting)
+        if view_drawn != view:
+            # shots still playing were laid out for the old view
+            animator.finish_all(ShotAnimation)
+            renderer = viewport.renderer(screen)
+            cell_size = viewport.cell_size
+            # get current player's hit and miss data
+            hits = boat_manager.player_hits[current_player]
+            minimap = minimaps[current_player]
+            # prepare instruction text for display
+            if starting:
+                instruction_text = f"Player {current_player} ({bots[current_player].spec}) is starting..."
+            elif current_player in bots:
+                instruction_text = f"Player {current_player} ({bots[current_player].spec}) is choosing a target..."
+            else:
+                instruction_text = f"Player {current_player}! Use Arrow Keys to lock your target, hit Space to fire!"
+
+            def draw_static(surface):
+                draw.draw_firing_background(
+                    surface, viewport.visible_rows, viewport.visible_cols, cell_size,
+                    viewport.origin_x, viewport.origin_y, hits, instruction_text, assets,
+                    viewport.first_row, viewport.first_col
+                )
+                if viewport.partial:
+                    minimap.draw(surface, viewport)
+
+            with profiler.section("draw"):
+                renderer.rebuild(draw_static)
+            view_drawn = view
+            needs_redraw = True
+
+        if bot_shot:
+            fire(cursor_row, cursor_col)
+            needs_redraw = True
+
+        # draw the crosshair and animations over the static layer, only when
+        # something changed
+        drew = needs_redraw or animator.active
+        if drew:
+            with profiler.section("draw"):
+                renderer.begin_frame()
+                if renderer.in_view(cursor_row, cursor_col):
+                    crosshair = assets.get("crosshair", (cell_size, cell_size), cell=True)
+                    renderer.mark(screen.blit(crosshair, renderer.cell_rect(cursor_row, cursor_col)))
+                for rect in animator.draw(screen, now):
+                    renderer.mark(rect)
+                overlay_rect = profiler.draw_overlay(screen)
+                if overlay_rect:
+                    renderer.mark(overlay_rect)
+            with profiler.section("flip"):
+                renderer.end_frame()
+            needs_redraw = False
+        profiler.end_frame(drew)
+
+        # sleep until the user does something, the next animation frame is
+        # due or it is time to check on a thinking bot
+        if animator.active:
+            events = wait_events(FRAME_TIME)
+        else:
+            events = wait_events(POLL_INTERVAL) if thinking else wait_events()
+        profiler.begin_frame()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            elif event.type in EXPOSE_EVENTS:
+                renderer.force_full_update()
+                needs_redraw = True
+            elif profiler.handle_event(event):
+                needs_redraw = True
+            elif viewport.handle_event(event, cursor_row, cursor_col):
+                needs_redraw = True
             elif event.type == pygame.KEYDOWN:
+                needs_redraw = True
+                # any key cuts the turn banner short
+                animator.finish_all(TurnBanner)
+                if event.key in SKIP_KEYS:
+                    animator.finish_all()
                 # move crosshair up down left or right
-                if event.key == pygame.K_UP:
+                elif event.key == pygame.K_UP:
                     cursor_row = max(0, cursor_row - 1)
+                    viewport.center_on(cursor_row, cursor_col)
                 elif event.key == pygame.K_DOWN:
                     cursor_row = min(rows - 1, cursor_row + 1)
+                    viewport.center_on(cursor_row, cursor_col)
                 elif event.key == pygame.K_LEFT:
                     cursor_col = max(0, cursor_col - 1)
+                    viewport.center_on(cursor_row, cursor_col)
                 elif event.key == pygame.K_RIGHT:
                     cursor_col = min(cols - 1, cursor_col + 1)
-                # fire at selected cell when space is pressed
-                elif event.key == pygame.K_SPACE:
+                    viewport.center_on(cursor_row, cursor_col)
+                # space skips the shot that ended the turn
+                elif event.key == pygame.K_SPACE and pending:
+                    animator.finish_all()
+                # fire at selected cell when space is pressed, bots fire on their own
+                elif event.key == pygame.K_SPACE and current_player not in bots:
                     # Check if spot was already targeted (hit or miss)
                     hits = boat_manager.player_hits[current_player]
                     if hits[cursor_row][cursor_col] in ["X", "O"]:
                         # Already fired here - optionally show feedback
                         continue
-                    
-                    result = draw.animate_firing_shot(
-                        screen, boat_manager, current_player, other_player,
-                        cursor_row, cursor_col, cell_size, origin_x, origin_y, assets
-                    )
-                    # check if player hit missed or sunk a ship and update turn or end game
-                    if result == "hit" or (result and result.startswith("sunk:")):
-                        winner = boat_manager.check_win()
-                        if winner:
-                            aiming = False
-                    elif result == "miss":
-                        current_player, other_player = other_player, current_player
-                        pygame.time.wait(1000)
-                        draw.show_firing_splash(screen, f"Player {current_player}'s Turn")
+                    fire(cursor_row, cursor_col)
+    profiler.end_frame()
+
     # return winner if there is one otherwise return none
     winner = boat_manager.check_win()
     return f"Player {winner}" if winner else None
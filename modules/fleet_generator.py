@@ -0,0 +1,146 @@
+#################################################
+# fleet_generator.py - draws random legal      #
+# fleets from precomputed placement masks      #
+#################################################
+
+from modules.boat_management import SHIP_TYPES
+
+# Fleets drawn before giving up on a fleet that may not fit the board.
+# A uniform draw is rejected far more often than a greedy one restarts.
+GREEDY_ATTEMPTS = 1000
+UNIFORM_ATTEMPTS = 200000
+
+
+class FleetGenerator:
+    """
+    Random fleet placement for bots and simulations.
+
+    Every legal placement of every ship length is precomputed once as a
+    bitmask (bit row * cols + col per cell) together with its cells, so
+    drawing a fleet is a handful of random picks and integer ANDs.
+    """
+
+    def __init__(self, rows, cols, ships):
+        self.rows = rows
+        self.cols = cols
+        self.ships = ships
+
+        # Longest ships first so the greedy placement rarely gets stuck
+        self.queue = [name for name, count in ships.items() for _ in range(count)]
+        self.queue.sort(key=lambda name: SHIP_TYPES[name][0], reverse=True)
+
+        self.masks = {}
+        self.cells = {}
+        for name in self.queue:
+            length = SHIP_TYPES[name][0]
+            if length not in self.masks:
+                self.masks[length], self.cells[length] = self._placements(length)
+        self.lengths = [SHIP_TYPES[name][0] for name in self.queue]
+
+    def _placements(self, length):
+        masks = []
+        cells = []
+        rows, cols = self.rows, self.cols
+        for r in range(rows):
+            for c in range(cols):
+                # Horizontal placement
+                if c + length <= cols:
+                    ship = [(r, cc) for cc in range(c, c + length)]
+                    cells.append(ship)
+                    masks.append(sum(1 << (rr * cols + cc) for rr, cc in ship))
+                # Vertical placement
+                if length > 1 and r + length <= rows:
+                    ship = [(rr, c) for rr in range(r, r + length)]
+                    cells.append(ship)
+                    masks.append(sum(1 << (rr * cols + cc) for rr, cc in ship))
+        return masks, cells
+
+    # ------------------------------
+    # Draw fleets
+    # ------------------------------
+    def random_placements(self, rng, uniform=False):
+        """
+        Returns one placement index per ship in self.queue order.
+
+        The default greedy draw places ships one at a time, which slightly
+        favours some layouts. uniform=True draws every ship independently
+        and rejects the whole fleet on any overlap, which samples exactly
+        uniformly over all legal fleets at the cost of more draws.
+
+        Raises ValueError when no fleet turns up within GREEDY_ATTEMPTS
+        (or UNIFORM_ATTEMPTS) tries, as happens when it does not fit.
+        """
+        if not all(self.masks[length] for length in self.lengths):
+            raise ValueError(f"{self._describe()}: a ship is longer than the board")
+        if uniform:
+            return self._uniform(rng)
+        return self._greedy(rng)
+
+    def _describe(self):
+        return f"cannot place {self.ships} on a {self.rows}x{self.cols} board"
+
+    def _uniform(self, rng):
+        masks = self.masks
+        randrange = rng.randrange
+        for _ in range(UNIFORM_ATTEMPTS):
+            occupied = 0
+            picks = []
+            for length in self.lengths:
+                options = masks[length]
+                index = randrange(len(options))
+                mask = options[index]
+                if occupied & mask:
+                    break
+                occupied |= mask
+                picks.append(index)
+            else:
+                return picks
+        raise ValueError(f"{self._describe()}: no fleet without overlaps in {UNIFORM_ATTEMPTS} draws")
+
+    def _greedy(self, rng):
+        masks = self.masks
+        randrange = rng.randrange
+        for _ in range(GREEDY_ATTEMPTS):
+            occupied = 0
+            picks = []
+            for length in self.lengths:
+                options = masks[length]
+                # a few blind draws almost always succeed on sparse boards
+                for _ in range(8):
+                    index = randrange(len(options))
+                    if not occupied & options[index]:
+                        break
+                else:
+                    free = [i for i, mask in enumerate(options) if not occupied & mask]
+                    if not free:
+                        break  # dead end, start over
+                    index = free[randrange(len(free))]
+                occupied |= options[index]
+                picks.append(index)
+            else:
+                return picks
+        raise ValueError(f"{self._describe()}: every one of {GREEDY_ATTEMPTS} attempts got stuck")
+
+    def random_board(self, rng, uniform=False):
+        """
+        Returns a 2D list with "~" for empty and ship letters for ship cells,
+        ready for BoatManager.set_player_ships.
+        """
+        board = [["~"] * self.cols for _ in range(self.rows)]
+        picks = self.random_placements(rng, uniform)
+        for name, length, index in zip(self.queue, self.lengths, picks):
+            ship_char = SHIP_TYPES[name][1]
+            for r, c in self.cells[length][index]:
+                board[r][c] = ship_char
+        return board
+
+
+_GENERATORS = {}
+
+
+def fleet_generator(rows, cols, ships):
+    """Shared FleetGenerator for a board size and fleet."""
+    key = (rows, cols, tuple(sorted(ships.items())))
+    if key not in _GENERATORS:
+        _GENERATORS[key] = FleetGenerator(rows, cols, ships)
+    return _GENERATORS[key]
@@ -0,0 +1,392 @@
+#################################################
+# game_record.py - compact append-only game    #
+# logs with snapshot-indexed replay            #
+#################################################
+
+import os
+import struct
+import time
+
+from modules.boat_management import SHIP_TYPES, mask_cells
+from modules.sparse_board import SparseGrid, new_board, new_boat_manager
+
+# File layout, all little endian:
+#
+#   header    magic, version, rows, cols, snapshot interval N,
+#             the count of each ship type in SHIP_TYPES order
+#   fleets    per player a segment count, then ship segments
+#             (letter, row, col, length, vertical)
+#   blocks    a snapshot followed by up to N shot records
+#
+# A snapshot holds the game as it stands before the block's first shot:
+# whose turn it is, one bit per cell for every cell each player has fired
+# at, and per player the ships sunk so far in the order they sank (one
+# byte per ship of the fleet, SHIP_NAMES index + 1, 0 after the last).
+# Which shots hit and what is left of each ship follow from the fleets
+# and the fired cells, so a seek restores a snapshot without re-firing
+# any shot before it. Snapshots and
+# shot records have a fixed size for a given board, so turn t is always
+# at the same offset: block t // N, record t % N. A game that was cut off
+# leaves at most a partial record at the end, which readers ignore.
+
+MAGIC = b"BSRC"
+VERSION = 2
+
+HEADER = struct.Struct("<4sBHHI")
+SHIP_COUNTS = struct.Struct("<" + "H" * len(SHIP_TYPES))
+SEGMENT_COUNT = struct.Struct("<I")
+SEGMENT = struct.Struct("<cHHHB")
+SHOT = struct.Struct("<HHB")
+
+SHIP_NAMES = list(SHIP_TYPES)
+CHAR_TO_NAME = {v[1]: k for k, v in SHIP_TYPES.items()}
+
+# Shot outcome codes; sunk ships are SUNK + their index in SHIP_NAMES.
+# The top bit of the code byte is set when player 2 fired.
+MISS, HIT, REPEAT, SUNK = 0, 1, 2, 3
+PLAYER_2_BIT = 0x80
+
+# Fewest shots between snapshots. Big boards space them further apart so
+# snapshots never take more room than the shots they index.
+SNAPSHOT_INTERVAL = 64
+
+
+def default_record_dir():
+    """
+    $BATTLESHIP_RECORD_DIR, or ~/.local/share/battleship/records.
+    """
+    record_dir = os.environ.get("BATTLESHIP_RECORD_DIR")
+    if not record_dir:
+        record_dir = os.path.join(os.path.expanduser("~"), ".local", "share", "battleship", "records")
+    return record_dir
+
+
+def new_record_path(record_dir=None):
+    """A fresh timestamped .bsr path in record_dir, which is created."""
+    record_dir = record_dir or default_record_dir()
+    os.makedirs(record_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(record_dir, f"{stamp}.bsr")
+    suffix = 1
+    while os.path.exists(path):
+        path = os.path.join(record_dir, f"{stamp}-{suffix}.bsr")
+        suffix += 1
+    return path
+
+
+def encode_result(attacker, result):
+    if result == "miss":
+        code = MISS
+    elif result == "hit":
+        code = HIT
+    elif result == "repeat":
+        code = REPEAT
+    else:
+        code = SUNK + SHIP_NAMES.index(result.split(":")[1])
+    return code | (PLAYER_2_BIT if attacker == 2 else 0)
+
+
+def decode_result(code):
+    """Returns (attacker, result) for a shot record's code byte."""
+    attacker = 2 if code & PLAYER_2_BIT else 1
+    code &= ~PLAYER_2_BIT
+    if code == MISS:
+        return attacker, "miss"
+    if code == HIT:
+        return attacker, "hit"
+    if code == REPEAT:
+        return attacker, "repeat"
+    return attacker, f"sunk:{SHIP_NAMES[code - SUNK]}"
+
+
+def _ship_cells(board):
+    """(row, col) -> ship letter for every ship cell of a board."""
+    if isinstance(board, SparseGrid):
+        return {cell: char for cell, char in board.items() if char in CHAR_TO_NAME}
+    return {(r, c): char for r, row in enumerate(board) for c, char in enumerate(row) if char in CHAR_TO_NAME}
+
+
+def fleet_segments(board):
+    """
+    Cover the ship cells of a board with straight runs of one letter:
+    horizontal runs first, then the cells left over as vertical runs.
+    Returns [(letter, row, col, length, vertical), ...]; laying the runs
+    back down gives exactly the same board.
+    """
+    cells = _ship_cells(board)
+    segments = []
+    left = set(cells)
+    for r, c in sorted(cells):
+        if (r, c) not in left:
+            continue
+        char = cells[(r, c)]
+        length = 1
+        while (r, c + length) in left and cells[(r, c + length)] == char:
+            length += 1
+        if length > 1:
+            segments.append((char, r, c, length, 0))
+            for i in range(length):
+                left.discard((r, c + i))
+    for r, c in sorted(left, key=lambda cell: (cell[1], cell[0])):
+        if (r, c) not in left:
+            continue
+        char = cells[(r, c)]
+        length = 1
+        while (r + length, c) in left and cells[(r + length, c)] == char:
+            length += 1
+        segments.append((char, r, c, length, 1))
+        for i in range(length):
+            left.discard((r + i, c))
+    return segments
+
+
+def open_recorder(rows, cols, ships, board1, board2, record_dir=None):
+    """
+    A best-effort GameWriter for a game in the window, or None when the
+    record directory cannot be used: like the settings cache, a
+    read-only home must not stop anyone from playing.
+    """
+    try:
+        return GameWriter(new_record_path(record_dir), rows, cols, ships, board1, board2, best_effort=True)
+    except OSError:
+        return None
+
+
+class GameWriter:
+    """
+    Appends one game to a record file. Create it once both fleets are
+    placed, call shot() after every fire_at and close() at the end; it is
+    also a context manager.
+    With best_effort a failed write stops the recording instead of
+    raising, leaving a record cut off at the last complete shot.
+    """
+
+    def __init__(self, path, rows, cols, ships, board1, board2, snapshot_interval=None, best_effort=False):
+        self.rows = rows
+        self.cols = cols
+        mask_size = (rows * cols + 7) // 8
+        self.fleet_size = sum(ships.values())
+        snapshot_size = 1 + 2 * mask_size + 2 * self.fleet_size
+        self.snapshot_interval = snapshot_interval or max(SNAPSHOT_INTERVAL, snapshot_size // SHOT.size)
+        self.turns = 0
+        self.best_effort = best_effort
+
+        # cells fired at so far, one bit per cell, per attacker
+        self.fired = {1: bytearray(mask_size), 2: bytearray(mask_size)}
+        # SHIP_NAMES index + 1 of each ship sunk so far, per defender
+        self.sunk = {1: bytearray(), 2: bytearray()}
+
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, rows, cols, self.snapshot_interval))
+        self.file.write(SHIP_COUNTS.pack(*(ships.get(name, 0) for name in SHIP_NAMES)))
+        for board in (board1, board2):
+            segments = fleet_segments(board)
+            self.file.write(SEGMENT_COUNT.pack(len(segments)))
+            for char, r, c, length, vertical in segments:
+                self.file.write(SEGMENT.pack(char.encode(), r, c, length, vertical))
+
+    def shot(self, attacker, row, col, result):
+        """Record one fire_at call and the string it returned."""
+        if self.file is None:
+            return
+        try:
+            self._write_shot(attacker, row, col, result)
+        except OSError:
+            if not self.best_effort:
+                raise
+            self.close()
+
+    def _write_shot(self, attacker, row, col, result):
+        if self.turns % self.snapshot_interval == 0:
+            self.file.write(bytes([attacker]))
+            self.file.write(self.fired[1])
+            self.file.write(self.fired[2])
+            for player in (1, 2):
+                self.file.write(self.sunk[player].ljust(self.fleet_size, b"\0"))
+        self.file.write(SHOT.pack(row, col, encode_result(attacker, result)))
+        index = row * self.cols + col
+        self.fired[attacker][index >> 3] |= 1 << (index & 7)
+        if result.startswith("sunk:") and len(self.sunk[3 - attacker]) < self.fleet_size:
+            self.sunk[3 - attacker].append(SHIP_NAMES.index(result.split(":")[1]) + 1)
+        self.turns += 1
+
+    def close(self):
+        if self.file is None:
+            return
+        file, self.file = self.file, None
+        try:
+            file.close()
+        except OSError:
+            if not self.best_effort:
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Shot:
+    """One recorded fire_at call."""
+
+    __slots__ = ("turn", "attacker", "row", "col", "result")
+
+    def __init__(self, turn, attacker, row, col, result):
+        self.turn = turn
+        self.attacker = attacker
+        self.row = row
+        self.col = col
+        self.result = result
+
+    def __repr__(self):
+        return f"Shot({self.turn}, player {self.attacker}, {self.row}, {self.col}, {self.result!r})"
+
+
+class GameRecord:
+    """
+    Reads a record file. Shots are read lazily with O(1) seeks, and
+    state_at() restores any turn from the nearest snapshot, replaying at
+    most snapshot_interval shots.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+
+        magic, version, self.rows, self.cols, self.snapshot_interval = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a game record")
+        if version != VERSION:
+            raise ValueError(f"{path} is record version {version}, expected {VERSION}")
+        counts = SHIP_COUNTS.unpack(self.file.read(SHIP_COUNTS.size))
+        self.ships = {name: count for name, count in zip(SHIP_NAMES, counts) if count}
+
+        self.segments = {}
+        for player in (1, 2):
+            (count,) = SEGMENT_COUNT.unpack(self.file.read(SEGMENT_COUNT.size))
+            data = self.file.read(count * SEGMENT.size)
+            self.segments[player] = [
+                (char.decode(), r, c, length, vertical) for char, r, c, length, vertical in SEGMENT.iter_unpack(data)
+            ]
+
+        self.body_start = self.file.tell()
+        self.mask_size = (self.rows * self.cols + 7) // 8
+        self.fleet_size = sum(self.ships.values())
+        self.snapshot_size = 1 + 2 * self.mask_size + 2 * self.fleet_size
+        self.block_size = self.snapshot_size + self.snapshot_interval * SHOT.size
+
+        # complete shot records on disk
+        body = os.path.getsize(path) - self.body_start
+        blocks, rest = divmod(body, self.block_size)
+        self.turns = blocks * self.snapshot_interval + max(0, rest - self.snapshot_size) // SHOT.size
+
+    def __len__(self):
+        return self.turns
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------
+    # Fleets
+    # ------------------------------
+    def fleet(self, player):
+        """A fresh board with player's ships, as placement_phase builds it."""
+        board = new_board(self.rows, self.cols)
+        for char, r, c, length, vertical in self.segments[player]:
+            for i in range(length):
+                board[r + i * vertical][c + i * (1 - vertical)] = char
+        return board
+
+    # ------------------------------
+    # Shots
+    # ------------------------------
+    def _offset(self, turn):
+        block, index = divmod(turn, self.snapshot_interval)
+        return self.body_start + block * self.block_size + self.snapshot_size + index * SHOT.size
+
+    def shot(self, turn):
+        """The shot fired on turn (0 based)."""
+        if not 0 <= turn < self.turns:
+            raise IndexError(turn)
+        self.file.seek(self._offset(turn))
+        row, col, code = SHOT.unpack(self.file.read(SHOT.size))
+        attacker, result = decode_result(code)
+        return Shot(turn, attacker, row, col, result)
+
+    def moves(self, start=0, stop=None):
+        """Yield the shots from turn start up to stop, a block at a time."""
+        stop = self.turns if stop is None else min(stop, self.turns)
+        turn = start
+        while turn < stop:
+            count = min(stop - turn, self.snapshot_interval - turn % self.snapshot_interval)
+            self.file.seek(self._offset(turn))
+            data = self.file.read(count * SHOT.size)
+            for row, col, code in SHOT.iter_unpack(data):
+                attacker, result = decode_result(code)
+                yield Shot(turn, attacker, row, col, result)
+                turn += 1
+
+    def __iter__(self):
+        return self.moves()
+
+    # ------------------------------
+    # Seeking
+    # ------------------------------
+    def _snapshot(self, block):
+        """
+        Returns (next attacker, {attacker: fired cell bytes}, {defender:
+        names of the ships sunk in order}) for a block.
+        """
+        self.file.seek(self.body_start + block * self.block_size)
+        data = self.file.read(self.snapshot_size)
+        masks_end = 1 + 2 * self.mask_size
+        fired = {1: data[1:1 + self.mask_size], 2: data[1 + self.mask_size:masks_end]}
+        sunk = {}
+        for player in (1, 2):
+            slots = data[masks_end + (player - 1) * self.fleet_size:masks_end + player * self.fleet_size]
+            sunk[player] = [SHIP_NAMES[code - 1] for code in slots if code]
+        return data[0], fired, sunk
+
+    def state_at(self, turn, engine=None):
+        """
+        The game after `turn` shots, as (boat_manager, next_player): the
+        nearest snapshot is restored and at most snapshot_interval shots
+        are replayed on top of it.
+        engine is a BoatManager class; by default the one new_boat_manager
+        would pick for this board.
+        """
+        turn = max(0, min(turn, self.turns))
+        if engine is None:
+            manager = new_boat_manager(self.rows, self.cols, self.ships)
+        else:
+            manager = engine(self.rows, self.cols, self.ships)
+        for player in (1, 2):
+            manager.set_player_ships(player, self.fleet(player))
+
+        next_player = 1
+        start = 0
+        if self.turns:
+            # the last snapshot written is the one before the last shot
+            block = min(turn, self.turns - 1) // self.snapshot_interval
+            next_player, fired, sunk = self._snapshot(block)
+            for attacker in (1, 2):
+                manager.restore_shots(attacker, fired[attacker], sunk[3 - attacker])
+            start = block * self.snapshot_interval
+
+        for shot in self.moves(start, turn):
+            manager.fire_at(shot.attacker, 3 - shot.attacker, shot.row, shot.col)
+            # firing_phase keeps the turn on a hit and passes it on a miss
+            next_player = 3 - shot.attacker if shot.result == "miss" else shot.attacker
+        return manager, next_player
+
+    def winner(self):
+        """The player who won by the last recorded shot, or None."""
+        manager, _ = self.state_at(self.turns)
+        return manager.check_win()
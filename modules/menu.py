@@ -1,5 +1,9 @@
 import pygame
 import math
+from modules.assets import asset_manager
+from modules.event_loop import EXPOSE_EVENTS, wait_events
+from modules.profiler import profiler
+from modules.text_cache import render_text
 
 # Colors and sizes
 WHITE = (255, 255, 255)
@@ -11,10 +15,25 @@ BUTTON_HEIGHT = 70
 FONT_SIZE = 40
 INSTRUCTION_FONT_SIZE = 28
 
-def show_how_to_play(screen):
+# Redraws per second for the pulsing button glow while the menu is idle,
+# 0 keeps the glow still so the menu only redraws on input
+GLOW_FPS = 15
+
+
+def glow_pulse(glow_fps):
+    """Current glow size offset, frozen when the glow is disabled."""
+    if not glow_fps:
+        return 10
+    return 10 + int(math.sin(pygame.time.get_ticks() * 0.005) * 5)
+
+
+def menu_events(glow_fps):
+    """Block for input, waking up glow_fps times a second to animate."""
+    return wait_events(1000 / glow_fps) if glow_fps else wait_events()
+
+@profiler.profiled()
+def show_how_to_play(screen, glow_fps=GLOW_FPS):
     """Display the instructions screen."""
-    font = pygame.font.SysFont(None, INSTRUCTION_FONT_SIZE)
-    clock = pygame.time.Clock()
     running = True
 
     instructions = [
@@ -36,112 +55,168 @@ def show_how_to_play(screen):
         (BUTTON_WIDTH, BUTTON_HEIGHT)
     )
 
+    last_frame = None
     while running:
         mouse_pos = pygame.mouse.get_pos()
-        screen.fill(BG_COLOR)
-
-        # Draw instructions
-        for i, line in enumerate(instructions):
-            text_surface = font.render(line, True, WHITE)
-            screen.blit(text_surface, (50, 50 + i * 35))
-
-        # Glow effect for Back button
-        pulse = 10 + int(math.sin(pygame.time.get_ticks() * 0.005) * 5)
-        glow_surf = pygame.Surface((BUTTON_WIDTH + pulse, BUTTON_HEIGHT + pulse), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surf, (80, 180, 255, 80), glow_surf.get_rect(), border_radius=12)
-        screen.blit(glow_surf, (back_rect.x - pulse//2, back_rect.y - pulse//2))
-
-        # Draw back button
         hovering = back_rect.collidepoint(mouse_pos)
-        button_color = BUTTON_HOVER_COLOR if hovering else BUTTON_COLOR
-        pygame.draw.rect(screen, button_color, back_rect, border_radius=8)
-        pygame.draw.rect(screen, WHITE, back_rect, 3, border_radius=8)
-
-        # Draw Back text
-        text_surface = font.render("Back", True, WHITE)
-        text_rect = text_surface.get_rect(center=back_rect.center)
-        screen.blit(text_surface, text_rect)
+        pulse = glow_pulse(glow_fps)
+
+        # only redraw when the hover state or the glow changed
+        frame = (hovering, pulse)
+        drew = frame != last_frame
+        if drew:
+            with profiler.section("draw"):
+                draw_how_to_play(screen, instructions, back_rect, hovering, pulse)
+                profiler.draw_overlay(screen)
+            with profiler.section("flip"):
+                pygame.display.flip()
+            last_frame = frame
+        profiler.end_frame(drew)
 
         # Event handling
-        for event in pygame.event.get():
+        events = menu_events(glow_fps)
+        profiler.begin_frame()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and hovering:
+            if event.type in EXPOSE_EVENTS or profiler.handle_event(event):
+                last_frame = None
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and back_rect.collidepoint(event.pos):
                 running = False  # Return to main menu
-
-        pygame.display.flip()
-        clock.tick(60)
-
-def show_main_menu(screen, winner=None):
-    """Main menu with Play and How to Play buttons, with glow effect."""
-    font = pygame.font.SysFont(None, FONT_SIZE)
-    clock = pygame.time.Clock()
-
-    # Load logo
-    logo = pygame.image.load("assets/logo.png").convert_alpha()
+    profiler.end_frame()
+
+def draw_how_to_play(screen, instructions, back_rect, hovering, pulse):
+    """Draw the instructions screen without flipping."""
+    screen.fill(BG_COLOR)
+
+    # Draw instructions
+    for i, line in enumerate(instructions):
+        text_surface = render_text(line, INSTRUCTION_FONT_SIZE, WHITE)
+        screen.blit(text_surface, (50, 50 + i * 35))
+
+    # Glow effect for Back button
+    glow_surf = pygame.Surface((BUTTON_WIDTH + pulse, BUTTON_HEIGHT + pulse), pygame.SRCALPHA)
+    pygame.draw.rect(glow_surf, (80, 180, 255, 80), glow_surf.get_rect(), border_radius=12)
+    screen.blit(glow_surf, (back_rect.x - pulse//2, back_rect.y - pulse//2))
+
+    # Draw back button
+    button_color = BUTTON_HOVER_COLOR if hovering else BUTTON_COLOR
+    pygame.draw.rect(screen, button_color, back_rect, border_radius=8)
+    pygame.draw.rect(screen, WHITE, back_rect, 3, border_radius=8)
+
+    # Draw Back text
+    text_surface = render_text("Back", INSTRUCTION_FONT_SIZE, WHITE)
+    text_rect = text_surface.get_rect(center=back_rect.center)
+    screen.blit(text_surface, text_rect)
+
+def load_logo(screen):
+    """Load the logo scaled to the screen width, with its centered rect."""
     desired_width = min(600, screen.get_width() - 80)
     desired_height = int(desired_width * 66 / 398)
-    logo = pygame.transform.smoothscale(logo, (desired_width, desired_height))
+    logo = asset_manager.get("logo", (desired_width, desired_height), smooth=True)
     logo_rect = logo.get_rect()
     logo_rect.centerx = screen.get_rect().centerx
     logo_rect.top = 100
+    return logo, logo_rect
 
-    # Button positions
+def main_menu_buttons(screen):
+    """Rects of the Play and How to Play buttons."""
     screen_rect = screen.get_rect()
     play_rect = pygame.Rect(screen_rect.centerx - BUTTON_WIDTH//2, 330, BUTTON_WIDTH, BUTTON_HEIGHT)
     how_to_play_rect = pygame.Rect(screen_rect.centerx - BUTTON_WIDTH//2, 430, BUTTON_WIDTH, BUTTON_HEIGHT)
+    return play_rect, how_to_play_rect
+
+def draw_main_menu(screen, logo, logo_rect, winner=None, mouse_pos=(-1, -1), pulse=None):
+    """
+    Draw one frame of the main menu, with the glow at pulse (the current
+    animated size when None).
+    Returns (hovering_play, hovering_htp).
+    """
+    screen_rect = screen.get_rect()
+    play_rect, how_to_play_rect = main_menu_buttons(screen)
+    screen.fill(BG_COLOR)
+
+    # Draw logo
+    screen.blit(logo, logo_rect)
+
+    # Winner text
+    if winner:
+        winner_text = render_text(f"{winner} Wins!", FONT_SIZE, (255, 215, 0))
+        screen.blit(winner_text, (screen_rect.centerx - winner_text.get_width() // 2, 400))
+
+    # Pulsing glow
+    if pulse is None:
+        pulse = glow_pulse(GLOW_FPS)
+
+    # Glow for Play button
+    glow_play = pygame.Surface((BUTTON_WIDTH + pulse, BUTTON_HEIGHT + pulse), pygame.SRCALPHA)
+    pygame.draw.rect(glow_play, (80, 180, 255, 80), glow_play.get_rect(), border_radius=12)
+    screen.blit(glow_play, (play_rect.x - pulse//2, play_rect.y - pulse//2))
+
+    # Glow for How to Play button
+    glow_htp = pygame.Surface((BUTTON_WIDTH + pulse, BUTTON_HEIGHT + pulse), pygame.SRCALPHA)
+    pygame.draw.rect(glow_htp, (80, 180, 255, 80), glow_htp.get_rect(), border_radius=12)
+    screen.blit(glow_htp, (how_to_play_rect.x - pulse//2, how_to_play_rect.y - pulse//2))
+
+    # Draw buttons
+    hovering_play = play_rect.collidepoint(mouse_pos)
+    hovering_htp = how_to_play_rect.collidepoint(mouse_pos)
+    pygame.draw.rect(screen, BUTTON_HOVER_COLOR if hovering_play else BUTTON_COLOR, play_rect, border_radius=8)
+    pygame.draw.rect(screen, WHITE, play_rect, 3, border_radius=8)
+    pygame.draw.rect(screen, BUTTON_HOVER_COLOR if hovering_htp else BUTTON_COLOR, how_to_play_rect, border_radius=8)
+    pygame.draw.rect(screen, WHITE, how_to_play_rect, 3, border_radius=8)
+
+    # Draw button text
+    text_surface_play = render_text("Play", FONT_SIZE, WHITE)
+    screen.blit(text_surface_play, text_surface_play.get_rect(center=play_rect.center))
+    text_surface_htp = render_text("How to Play", FONT_SIZE, WHITE)
+    screen.blit(text_surface_htp, text_surface_htp.get_rect(center=how_to_play_rect.center))
+
+    return hovering_play, hovering_htp
+
+@profiler.profiled()
+def show_main_menu(screen, winner=None, glow_fps=GLOW_FPS):
+    """Main menu with Play and How to Play buttons, with glow effect."""
+    # Load logo
+    logo, logo_rect = load_logo(screen)
 
     running = True
+    last_frame = None
     while running:
         mouse_pos = pygame.mouse.get_pos()
-        screen.fill(BG_COLOR)
-
-        # Draw logo
-        screen.blit(logo, logo_rect)
-
-        # Winner text
-        if winner:
-            winner_text = font.render(f"{winner} Wins!", True, (255, 215, 0))
-            screen.blit(winner_text, (screen_rect.centerx - winner_text.get_width() // 2, 400))
-
-        # Pulsing glow
-        pulse = 10 + int(math.sin(pygame.time.get_ticks() * 0.005) * 5)
-
-        # Glow for Play button
-        glow_play = pygame.Surface((BUTTON_WIDTH + pulse, BUTTON_HEIGHT + pulse), pygame.SRCALPHA)
-        pygame.draw.rect(glow_play, (80, 180, 255, 80), glow_play.get_rect(), border_radius=12)
-        screen.blit(glow_play, (play_rect.x - pulse//2, play_rect.y - pulse//2))
-
-        # Glow for How to Play button
-        glow_htp = pygame.Surface((BUTTON_WIDTH + pulse, BUTTON_HEIGHT + pulse), pygame.SRCALPHA)
-        pygame.draw.rect(glow_htp, (80, 180, 255, 80), glow_htp.get_rect(), border_radius=12)
-        screen.blit(glow_htp, (how_to_play_rect.x - pulse//2, how_to_play_rect.y - pulse//2))
-
-        # Draw buttons
-        hovering_play = play_rect.collidepoint(mouse_pos)
-        hovering_htp = how_to_play_rect.collidepoint(mouse_pos)
-        pygame.draw.rect(screen, BUTTON_HOVER_COLOR if hovering_play else BUTTON_COLOR, play_rect, border_radius=8)
-        pygame.draw.rect(screen, WHITE, play_rect, 3, border_radius=8)
-        pygame.draw.rect(screen, BUTTON_HOVER_COLOR if hovering_htp else BUTTON_COLOR, how_to_play_rect, border_radius=8)
-        pygame.draw.rect(screen, WHITE, how_to_play_rect, 3, border_radius=8)
-
-        # Draw button text
-        text_surface_play = font.render("Play", True, WHITE)
-        screen.blit(text_surface_play, text_surface_play.get_rect(center=play_rect.center))
-        text_surface_htp = font.render("How to Play", True, WHITE)
-        screen.blit(text_surface_htp, text_surface_htp.get_rect(center=how_to_play_rect.center))
+        play_rect, how_to_play_rect = main_menu_buttons(screen)
+        pulse = glow_pulse(glow_fps)
+
+        # only redraw when the hover state or the glow changed
+        frame = (play_rect.collidepoint(mouse_pos), how_to_play_rect.collidepoint(mouse_pos), pulse)
+        drew = frame != last_frame
+        if drew:
+            with profiler.section("draw"):
+                draw_main_menu(screen, logo, logo_rect, winner, mouse_pos, pulse)
+                profiler.draw_overlay(screen)
+            with profiler.section("flip"):
+                pygame.display.flip()
+            last_frame = frame
+        profiler.end_frame(drew)
 
         # Event handling
-        for event in pygame.event.get():
+        events = menu_events(glow_fps)
+        profiler.begin_frame()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            if event.type in EXPOSE_EVENTS or profiler.handle_event(event):
+                last_frame = None
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if hovering_play:
+                if play_rect.collidepoint(event.pos):
                     running = False  # Start game
-                elif hovering_htp:
-                    show_how_to_play(screen)
-
-        pygame.display.flip()
-        clock.tick(60)
+                elif how_to_play_rect.collidepoint(event.pos):
+                    # the instructions screen records its own frames, so
+                    # close this one before it starts and reopen it after
+                    profiler.end_frame()
+                    show_how_to_play(screen, glow_fps)
+                    profiler.begin_frame()
+                    last_frame = None
+    profiler.end_frame()
@@ -0,0 +1,80 @@
+#################################################
+# net_client.py - blocking socket client for   #
+# the game server, read on a worker thread     #
+#################################################
+
+import queue
+import socket
+import threading
+
+from modules.protocol import decode, encode
+
+# Seconds to wait for the server to accept the connection
+CONNECT_TIMEOUT = 5
+
+
+class GameClient:
+    """
+    A connection to the game server. Lines from the server are queued by
+    a reader thread, which calls notify() after each one so a GUI can wake
+    its blocking event wait; poll() hands the queued messages over. When
+    the connection drops a final ["CLOSED"] message is queued.
+    """
+
+    def __init__(self, host, port, notify=None):
+        self.sock = socket.create_connection((host, port), CONNECT_TIMEOUT)
+        self.sock.settimeout(None)
+        self.messages = queue.Queue()
+        self.notify = notify or (lambda: None)
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self):
+        try:
+            for line in self.sock.makefile("rb"):
+                words = decode(line)
+                if words:
+                    self.messages.put(words)
+                    self.notify()
+        except OSError:
+            pass
+        self.messages.put(["CLOSED"])
+        self.notify()
+
+    def send(self, *words):
+        try:
+            self.sock.sendall(encode(*words))
+        except OSError:
+            # the reader thread reports the dropped connection
+            pass
+
+    def poll(self):
+        """Every message received since the last poll, oldest first."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def wait_for(self, verb, timeout=CONNECT_TIMEOUT):
+        """
+        Block until a message starting with verb (or ERR/CLOSED) arrives
+        and return it; messages before it are dropped. Only for replies
+        the server sends straight away, like JOINED.
+        """
+        while True:
+            try:
+                words = self.messages.get(timeout=timeout)
+            except queue.Empty:
+                return ["CLOSED"]
+            if words[0] in (verb, "ERR", "CLOSED"):
+                return words
+
+    def close(self):
+        self.send("QUIT")
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
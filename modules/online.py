@@ -0,0 +1,221 @@
+#################################################
+# online.py - playing a match hosted by the    #
+# game server instead of sharing one keyboard  #
+#################################################
+
+import pygame
+from modules import draw
+from modules.animation import FRAME_TIME, Animator, ShotAnimation, TurnBanner
+from modules.event_loop import EXPOSE_EVENTS, wait_events
+from modules.firing import MINIMAP_HIT, MINIMAP_MISS, SKIP_KEYS
+from modules.net_client import GameClient
+from modules.placement import placement_phase
+from modules.profiler import profiler
+from modules.protocol import fleet_words, parse_ships
+from modules.sparse_board import new_board, new_boat_manager
+from modules.viewport import Minimap, Viewport
+
+# posted by the client's reader thread to wake the blocking event wait
+NET_EVENT = pygame.event.custom_type()
+
+
+def connect(host, port):
+    """A GameClient that wakes wait_events() whenever a message arrives."""
+    return GameClient(host, port, notify=lambda: pygame.event.post(pygame.event.Event(NET_EVENT)))
+
+
+def play_online(screen, client, match=None):
+    """
+    Join a match on the server, place this player's fleet and play it out.
+    Returns the winner's label for the main menu, or None.
+    """
+    client.send("JOIN", *([match] if match else []))
+    reply = client.wait_for("JOINED")
+    if reply[0] != "JOINED":
+        draw.show_splash(screen, "Could not join a match", duration=2000, font_size=48)
+        return None
+    _, match_id, player, rows, cols, ships = reply
+    player, rows, cols, ships = int(player), int(rows), int(cols), parse_ships(ships)
+
+    # placement is local; the server checks the fleet when it arrives
+    scratch = new_boat_manager(rows, cols, ships)
+    placements = placement_phase(screen, rows, cols, ships, f"Player {player}", scratch, player)
+    client.send("PLACE", *fleet_words(placements))
+
+    winner = online_firing_phase(screen, client, rows, cols, player)
+    if winner is None:
+        return None
+    return "You" if winner == player else f"Player {winner}"
+
+
+@profiler.profiled()
+def online_firing_phase(screen, client, rows, cols, player):
+    """
+    firing_phase for one seat of a server match. Space sends FIRE on this
+    player's turn; every SHOT from the server, ours or the opponent's,
+    plays its animation on the shooter's grid, like the local game.
+    Returns the winning player number, or None if the connection dropped.
+    """
+    pygame.font.init()
+    assets = draw.load_firing_assets()
+
+    # what each player's shots have found, filled in from SHOT messages
+    hits = {1: new_board(rows, cols), 2: new_board(rows, cols)}
+    minimaps = {1: Minimap(rows, cols), 2: Minimap(rows, cols)}
+
+    # no one fires until both fleets are in and the server sends TURN
+    current_player = None
+    animator = Animator()
+    cursor_row, cursor_col = 0, 0
+    # a FIRE is in flight until its SHOT comes back
+    firing = False
+    winner = None
+
+    # ("turn", player) or ("win", player) once the server has decided; it
+    # takes effect when the shot that caused it has finished playing
+    pending = None
+    # the connection dropped
+    closed = False
+
+    viewport = Viewport(rows, cols, screen.get_width(), screen.get_height())
+    renderer = None
+    view_drawn = None
+    needs_redraw = True
+
+    while True:
+        now = pygame.time.get_ticks()
+        animator.update(now)
+
+        if pending and not animator.active:
+            kind, who = pending
+            pending = None
+            if kind == "win":
+                winner = who
+                break
+            if who != current_player:
+                current_player = who
+                animator.add(TurnBanner("Your turn!" if who == player else f"Player {who}'s Turn", now))
+        if closed and not pending and not animator.active:
+            break
+
+        # before the first TURN the board shows our own (empty) grid
+        shown = current_player or player
+        view = (shown, viewport.key())
+        if view_drawn != view:
+            animator.finish_all(ShotAnimation)
+            renderer = viewport.renderer(screen)
+            cell_size = viewport.cell_size
+            shown_hits = hits[shown]
+            minimap = minimaps[shown]
+            if current_player is None:
+                instruction_text = "Waiting for your opponent to place their ships..."
+            elif current_player == player:
+                instruction_text = "Your turn! Use Arrow Keys to lock your target, hit Space to fire!"
+            else:
+                instruction_text = f"Player {current_player} is firing at your fleet..."
+
+            def draw_static(surface):
+                draw.draw_firing_background(
+                    surface, viewport.visible_rows, viewport.visible_cols, cell_size,
+                    viewport.origin_x, viewport.origin_y, shown_hits, instruction_text, assets,
+                    viewport.first_row, viewport.first_col
+                )
+                if viewport.partial:
+                    minimap.draw(surface, viewport)
+
+            with profiler.section("draw"):
+                renderer.rebuild(draw_static)
+            view_drawn = view
+            needs_redraw = True
+
+        drew = needs_redraw or animator.active
+        if drew:
+            with profiler.section("draw"):
+                renderer.begin_frame()
+                if current_player == player and renderer.in_view(cursor_row, cursor_col):
+                    crosshair = assets.get("crosshair", (cell_size, cell_size), cell=True)
+                    renderer.mark(screen.blit(crosshair, renderer.cell_rect(cursor_row, cursor_col)))
+                for rect in animator.draw(screen, now):
+                    renderer.mark(rect)
+                overlay_rect = profiler.draw_overlay(screen)
+                if overlay_rect:
+                    renderer.mark(overlay_rect)
+            with profiler.section("flip"):
+                renderer.end_frame()
+            needs_redraw = False
+        profiler.end_frame(drew)
+
+        # sleep until the user or the server does something
+        events = wait_events(FRAME_TIME) if animator.active else wait_events()
+        profiler.begin_frame()
+
+        for words in client.poll():
+            verb = words[0]
+            if verb == "SHOT":
+                shooter, row, col, result = int(words[1]), int(words[2]), int(words[3]), words[4]
+                if shooter == player:
+                    firing = False
+                if result == "repeat":
+                    continue
+                hits[shooter][row][col] = "O" if result == "miss" else "X"
+                minimaps[shooter].set_cell(row, col, MINIMAP_MISS if result == "miss" else MINIMAP_HIT,
+                                            weak=result == "miss")
+                if shooter == shown:
+                    animator.add(ShotAnimation(renderer, assets, row, col, result, pygame.time.get_ticks()))
+                    if viewport.partial:
+                        renderer.mark_base(minimap.draw(renderer.base, viewport))
+                needs_redraw = True
+            elif verb == "TURN":
+                # a hit keeps the turn and, like the local game, does not
+                # hold up the next shot
+                who = int(words[1])
+                if who != current_player or pending:
+                    pending = ("turn", who)
+            elif verb == "WIN":
+                pending = ("win", int(words[1]))
+            elif verb == "LEFT":
+                animator.add(TurnBanner("Your opponent left", pygame.time.get_ticks()))
+            elif verb == "ERR":
+                firing = False
+                animator.add(TurnBanner(" ".join(words[1:]).capitalize(), pygame.time.get_ticks()))
+            elif verb == "CLOSED":
+                closed = True
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                client.close()
+                pygame.quit()
+                exit()
+            elif event.type in EXPOSE_EVENTS:
+                renderer.force_full_update()
+                needs_redraw = True
+            elif profiler.handle_event(event):
+                needs_redraw = True
+            elif viewport.handle_event(event, cursor_row, cursor_col):
+                needs_redraw = True
+            elif event.type == pygame.KEYDOWN:
+                needs_redraw = True
+                animator.finish_all(TurnBanner)
+                if event.key in SKIP_KEYS:
+                    animator.finish_all()
+                elif event.key == pygame.K_UP:
+                    cursor_row = max(0, cursor_row - 1)
+                    viewport.center_on(cursor_row, cursor_col)
+                elif event.key == pygame.K_DOWN:
+                    cursor_row = min(rows - 1, cursor_row + 1)
+                    viewport.center_on(cursor_row, cursor_col)
+                elif event.key == pygame.K_LEFT:
+                    cursor_col = max(0, cursor_col - 1)
+                    viewport.center_on(cursor_row, cursor_col)
+                elif event.key == pygame.K_RIGHT:
+                    cursor_col = min(cols - 1, cursor_col + 1)
+                    viewport.center_on(cursor_row, cursor_col)
+                elif event.key == pygame.K_SPACE and pending:
+                    animator.finish_all()
+                elif event.key == pygame.K_SPACE and current_player == player and not firing:
+                    if hits[player][cursor_row][cursor_col] in ["X", "O"]:
+                        continue
+                    client.send("FIRE", cursor_row, cursor_col)
+                    firing = True
+    profiler.end_frame()
+    return winner
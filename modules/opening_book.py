@@ -0,0 +1,245 @@
+#################################################
+# opening_book.py - opening shots and prior    #
+# heatmap per board and fleet, cached on disk  #
+#################################################
+
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+from modules.boat_management import SHIP_TYPES
+
+# Bump when the book contents or file layout change so old books are rebuilt
+BOOK_VERSION = 2
+
+# Random fleets the prior is estimated from
+SAMPLES = 20000
+
+# Upper bound on samples * ship cells, keeps fleets of hundreds of ships in memory
+MAX_SAMPLE_CELLS = 4_000_000
+
+# Longest opening stored, and the fewest fleets still consistent with
+# it below which the estimate is too noisy to extend it
+MAX_OPENING = 64
+MIN_CONSISTENT = 500
+
+# Rejection rounds before settling for the fleets drawn so far
+MAX_ROUNDS = 200
+
+# magic, version, rows, cols, samples, opening length
+HEADER = struct.Struct("<4sHIIII")
+MAGIC = b"BSOB"
+
+
+def default_book_dir():
+    """$BATTLESHIP_CACHE_DIR/opening_book, or the same under ~/.cache/battleship."""
+    cache_dir = os.environ.get("BATTLESHIP_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "battleship")
+    return os.path.join(cache_dir, "opening_book")
+
+
+def ship_lengths(ships):
+    return sorted(SHIP_TYPES[name][0] for name, count in ships.items() for _ in range(count))
+
+
+def book_path(rows, cols, ships, directory=None):
+    """
+    File for a configuration. Unlike settings_cache.cache_key transposed
+    boards get their own book, the shots are on different cells.
+    """
+    text = json.dumps({"board": [rows, cols], "ships": ship_lengths(ships)}, separators=(",", ":"))
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directory or default_book_dir(), f"v{BOOK_VERSION}-{rows}x{cols}-{digest}.book")
+
+
+class OpeningBook:
+    """
+    What a configuration says before the first shot.
+        prior[i]    chance that flat cell i holds a ship, shape (rows * cols,)
+        heat[i]     legal placements of the fleet's ships covering flat cell
+                    i, the empty-board heatmap HeatmapPlayer starts from
+        opening[k]  flat cell of the k-th shot while every shot has missed
+
+    Loaded books are read-only views of a memory-mapped file, so every
+    process using the same book shares one copy in the page cache.
+    """
+
+    def __init__(self, rows, cols, samples, prior, heat, opening):
+        self.rows = rows
+        self.cols = cols
+        self.samples = samples
+        self.prior = prior
+        self.heat = heat
+        self.opening = opening
+
+    def write(self, path):
+        """Write atomically; failures are ignored like the settings cache's."""
+        # tempfile is only needed on writes, keep it off the load path
+        import tempfile
+
+        try:
+            directory = os.path.dirname(path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, BOOK_VERSION, self.rows, self.cols, self.samples, len(self.opening)))
+                f.write(np.ascontiguousarray(self.prior, dtype="<f4").tobytes())
+                f.write(np.ascontiguousarray(self.heat, dtype="<i4").tobytes())
+                f.write(np.ascontiguousarray(self.opening, dtype="<i4").tobytes())
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    @classmethod
+    def load(cls, path, rows, cols):
+        """The book at path, or None if it is missing, truncated or outdated."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+            magic, version, book_rows, book_cols, samples, length = HEADER.unpack(header)
+        except (OSError, struct.error):
+            return None
+        cells = rows * cols
+        if (magic, version, book_rows, book_cols) != (MAGIC, BOOK_VERSION, rows, cols):
+            return None
+        if size != HEADER.size + 4 * (2 * cells + length):
+            return None
+        prior = np.memmap(path, dtype="<f4", mode="r", offset=HEADER.size, shape=(cells,))
+        heat = np.memmap(path, dtype="<i4", mode="r", offset=HEADER.size + 4 * cells, shape=(cells,))
+        opening = np.zeros(0, dtype="<i4")
+        if length:
+            opening = np.memmap(path, dtype="<i4", mode="r", offset=HEADER.size + 8 * cells, shape=(length,))
+        return cls(rows, cols, samples, prior, heat, opening)
+
+
+# ------------------------------
+# Building
+# ------------------------------
+def sample_fleets(rows, cols, lengths, n, rng):
+    """
+    Up to n fleets drawn uniformly from every legal layout, as an array of
+    flat cells with one row per fleet. Ships are drawn independently and
+    fleets with any overlap are rejected, a batch at a time.
+    """
+    # horizontal then vertical placements of each length, indexed like PlacementTable's
+    options = {}
+    for length in set(lengths):
+        horizontal = rows * max(0, cols - length + 1)
+        vertical = max(0, rows - length + 1) * cols if length > 1 else 0
+        options[length] = (horizontal, vertical)
+    if any(sum(options[length]) == 0 for length in lengths):
+        raise ValueError("a ship does not fit on the board")
+
+    fleets = []
+    found = 0
+    batch = n
+    for _ in range(MAX_ROUNDS):
+        blocks = []
+        for length in lengths:
+            horizontal, vertical = options[length]
+            picks = rng.integers(horizontal + vertical, size=batch)
+            across = picks < horizontal
+            # horizontal: start anywhere in a row short of the last length-1 columns
+            span = cols - length + 1
+            h_start = (picks // max(span, 1)) * cols + picks % max(span, 1)
+            v_start = picks - horizontal
+            start = np.where(across, h_start, v_start)
+            step = np.where(across, 1, cols)
+            blocks.append(start[:, None] + np.arange(length)[None, :] * step[:, None])
+        cells = np.concatenate(blocks, axis=1).astype(np.int32)
+        ordered = np.sort(cells, axis=1)
+        legal = ~(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        fleets.append(cells[legal])
+        found += int(legal.sum())
+        if found >= n:
+            break
+        # draw enough for the rest at the acceptance rate seen so far
+        rate = max(found, 1) / (len(fleets) * batch)
+        batch = min(n * 10, int((n - found) / rate) + 1)
+    return np.concatenate(fleets)[:n]
+
+
+def placement_heat(rows, cols, lengths):
+    """
+    How many legal placements of the given ships cover each flat cell, in
+    closed form: a horizontal ship of length n covers column c from every
+    start in [c - n + 1, c] that keeps it on the board, and likewise down
+    the rows. Counts placements the way targeting.PlacementTable does.
+    """
+    def starts(size, length):
+        line = np.arange(size)
+        return np.clip(np.minimum(line, size - length) - np.maximum(0, line - length + 1) + 1, 0, None)
+
+    heat = np.zeros((rows, cols), dtype=np.int64)
+    for length in lengths:
+        if length <= cols:
+            heat += starts(cols, length)[None, :]
+        if 1 < length <= rows:
+            heat += starts(rows, length)[:, None]
+    return heat.ravel()
+
+
+def build_book(rows, cols, ships, samples=SAMPLES, max_opening=MAX_OPENING, seed=0):
+    """
+    Estimate the prior from uniformly drawn fleets, then build the greedy
+    opening: each shot is the cell most of the fleets consistent with the
+    misses so far put a ship on, and the fleets it hits are dropped.
+    """
+    lengths = ship_lengths(ships)
+    samples = max(1, min(samples, MAX_SAMPLE_CELLS // max(1, sum(lengths))))
+    fleets = sample_fleets(rows, cols, lengths, samples, np.random.default_rng(seed))
+    cells = rows * cols
+
+    # a fleet too crowded to draw at random gets an empty book
+    prior = np.bincount(fleets.ravel(), minlength=cells) / max(1, len(fleets))
+
+    opening = []
+    consistent = fleets
+    limit = max(1, min(MIN_CONSISTENT, len(fleets)))
+    while len(opening) < max_opening and len(consistent) >= limit:
+        counts = np.bincount(consistent.ravel(), minlength=cells)
+        shot = int(counts.argmax())
+        if not counts[shot]:
+            break
+        opening.append(shot)
+        consistent = consistent[~(consistent == shot).any(axis=1)]
+    heat = placement_heat(rows, cols, lengths).astype(np.int32)
+    return OpeningBook(rows, cols, len(fleets), prior.astype(np.float32), heat, np.array(opening, dtype=np.int32))
+
+
+# ------------------------------
+# Lookup
+# ------------------------------
+_BOOKS = {}
+
+
+def opening_book(rows, cols, ships, directory=None):
+    """
+    The cached book for a configuration, or None if it has not been
+    precomputed. Each file is mapped once per process.
+    """
+    path = book_path(rows, cols, ships, directory)
+    if path not in _BOOKS:
+        _BOOKS[path] = OpeningBook.load(path, rows, cols)
+    return _BOOKS[path]
+
+
+def ensure_book(rows, cols, ships, directory=None, rebuild=False, **options):
+    """
+    The book for a configuration, built and written to the cache first if
+    there is none yet. Worker processes started afterwards map the file.
+    """
+    path = book_path(rows, cols, ships, directory)
+    book = None if rebuild else OpeningBook.load(path, rows, cols)
+    if book is None:
+        book = build_book(rows, cols, ships, **options)
+        book.write(path)
+        # map what was written so this process shares the page cache copy too
+        book = OpeningBook.load(path, rows, cols) or book
+    _BOOKS[path] = book
+    return book
@@ -1,10 +1,17 @@
 import pygame
+import random
 import sys
 from modules import boat_management
+from modules.event_loop import EXPOSE_EVENTS, wait_events, wait_for
+from modules.placement_anchors import PlacementAnchors
+from modules.profiler import profiler
+from modules.sparse_board import new_board
+from modules.viewport import Minimap, Viewport
 from modules.draw import (
+    SHIP_COLORS,
+    draw_anchor_overlay,
     draw_instructions,
-    compute_cell_size,
-    compute_grid_origin,
+    measure_instructions,
     draw_grid,
     draw_placed_ships,
     draw_ship_preview,
@@ -22,21 +29,60 @@ SHIP_LENGTHS = {
 }
 
 
+@profiler.profiled()
+def bot_placement(screen, rows, cols, ships, player_label, boat_manager, player_num, bot):
+    """
+    placement_phase for a seat played by a bot_process.ProcessPlayer. The
+    bot starts and places its fleet while the splash shows; if it takes
+    longer the window says what it is waiting for and stays live.
+    """
+    bot.new_game(rows, cols, ships, random.Random())
+    bot.ask_placement()
+    show_splash(screen, f"{player_label} - Assemble your Navy!", duration=2000)
+
+    message = None
+
+    def draw_waiting():
+        screen.fill((15, 30, 50))
+        draw_instructions(screen, message, screen.get_width())
+        pygame.display.flip()
+
+    def poll():
+        nonlocal message
+        board = bot.poll_placement()
+        if board is None:
+            text = (f"Starting {bot.spec}..." if bot.starting
+                    else f"{player_label} ({bot.spec}) is placing its fleet...")
+            if text != message:
+                message = text
+                draw_waiting()
+        return board
+
+    boat_manager.set_player_ships(player_num, wait_for(poll, draw_waiting))
+
+
+@profiler.profiled()
 def placement_phase(screen, rows, cols, ships, player_label, boat_manager, player_num):
     """
     Handles ship placement for a single player.
-    Updates boat_manager with the final board.
+    Tab moves the cursor to the next spot the ship fits, O toggles dots
+    on every such spot.
+    Updates boat_manager with the final board and returns the ships placed
+    as [(ship_name, row, col, "H" or "V"), ...].
     """
     show_splash(screen, f"{player_label} - Assemble your Navy!", duration=2000)
     
     pygame.font.init()
-    clock = pygame.time.Clock()
 
     # Build ship queue
     ship_queue = [name for name, count in ships.items() for _ in range(count)]
 
-    # Temporary player board
-    board = [["~"] * cols for _ in range(rows)]
+    # Temporary player board, sparse on huge boards
+    board = new_board(rows, cols)
+
+    # where each ship still to come fits, updated as ships are placed
+    anchors = PlacementAnchors(rows, cols, [SHIP_LENGTHS[name] for name in ship_queue])
+    show_anchors = False
 
     # Cursor & orientation
     cursor_row, cursor_col = 0, 0
@@ -44,63 +90,136 @@ def placement_phase(screen, rows, cols, ships, player_label, boat_manager, playe
 
     current_ship_index = 0
     total_ships = len(ship_queue)
+    placements = []
+
+    # big boards only show the cells around the cursor, with a minimap of
+    # the ships placed so far
+    viewport = None
+    minimap = Minimap(rows, cols)
+
+    # instructions, grid and placed ships are composited once per ship and
+    # whenever the view moves; each frame only draws the preview and the cursor
+    renderer = None
+    static_for = None
+    needs_redraw = True
 
     running = True
     while running:
-        screen.fill((15, 30, 50))
-
         # Current ship info
         ship_name = ship_queue[current_ship_index]
         ship_len = SHIP_LENGTHS[ship_name]
 
-        # Draw instructions
         instructions = (
             f"{player_label}, position your {ship_name.capitalize()}!\n"
-            "Use Arrow Keys to navigate, \"R\" to turn, and Space to anchor in place!"
+            "Use Arrow Keys to navigate, \"R\" to turn, and Space to anchor in place!\n"
+            "Tab jumps to the next free spot, \"O\" shows them all."
         )
-        instructions_bottom = draw_instructions(screen, instructions, screen.get_width())
-
-        # Grid geometry
-        cell_size = compute_cell_size(rows, cols, screen.get_width(), screen.get_height(), instructions_bottom)
-        origin_x, origin_y = compute_grid_origin(rows, cols, cell_size, screen.get_width(), screen.get_height(), instructions_bottom)
-
-        # DRAWING
-        draw_grid(screen, rows, cols, cell_size, origin_x, origin_y)
-        draw_placed_ships(screen, board, cell_size, origin_x, origin_y)
-
-        # Compute ship preview
-        preview_cells = []
-        valid = True
-        for i in range(ship_len):
-            r = cursor_row + (i if orientation == "V" else 0)
-            c = cursor_col + (i if orientation == "H" else 0)
-            if r >= rows or c >= cols or board[r][c] != "~":
-                valid = False
-            preview_cells.append((r, c))
 
-        draw_ship_preview(screen, preview_cells, cell_size, origin_x, origin_y, valid)
-        draw_cursor(screen, cursor_row, cursor_col, cell_size, origin_x, origin_y)
-
-        pygame.display.flip()
-        clock.tick(60)
-
-        # EVENT HANDLING
-        for event in pygame.event.get():
+        # Grid geometry, the instructions are the same height for every ship
+        if viewport is None:
+            viewport = Viewport(rows, cols, screen.get_width(), screen.get_height(), measure_instructions(instructions))
+
+        overlay = (orientation,) if show_anchors else None
+        if static_for != (current_ship_index, viewport.key(), overlay):
+            renderer = viewport.renderer(screen)
+            cell_size = viewport.cell_size
+            origin_x, origin_y = viewport.origin_x, viewport.origin_y
+
+            def draw_static(surface):
+                surface.fill((15, 30, 50))
+                draw_instructions(surface, instructions, surface.get_width())
+                draw_grid(surface, renderer.rows, renderer.cols, cell_size, origin_x, origin_y,
+                          renderer.first_row, renderer.first_col)
+                draw_placed_ships(surface, board, cell_size, origin_x, origin_y,
+                                  renderer.first_row, renderer.first_col, renderer.rows, renderer.cols)
+                if show_anchors:
+                    shown = anchors.legal_in(ship_len, orientation, renderer.first_row, renderer.first_col,
+                                             renderer.rows, renderer.cols)
+                    draw_anchor_overlay(surface, [(r - renderer.first_row, c - renderer.first_col) for r, c in shown],
+                                        cell_size, origin_x, origin_y)
+                if viewport.partial:
+                    minimap.draw(surface, viewport)
+
+            with profiler.section("draw"):
+                renderer.rebuild(draw_static)
+            static_for = (current_ship_index, viewport.key(), overlay)
+            needs_redraw = True
+
+        # Ship preview, cut off at the board edge
+        valid = anchors.legal(ship_len, orientation, cursor_row, cursor_col)
+        if orientation == "H":
+            preview_cells = [(cursor_row, c) for c in range(cursor_col, min(cols, cursor_col + ship_len))]
+        else:
+            preview_cells = [(r, cursor_col) for r in range(cursor_row, min(rows, cursor_row + ship_len))]
+
+        # DRAWING, only when something changed
+        drew = needs_redraw
+        if needs_redraw:
+            with profiler.section("draw"):
+                renderer.begin_frame()
+                # only the part of the preview that is in view, in view coordinates
+                shown = [(r, c) for r, c in preview_cells if renderer.in_view(r, c)]
+                draw_ship_preview(screen, [(r - renderer.first_row, c - renderer.first_col) for r, c in shown],
+                                  cell_size, origin_x, origin_y, valid)
+                if renderer.in_view(cursor_row, cursor_col):
+                    draw_cursor(screen, cursor_row - renderer.first_row, cursor_col - renderer.first_col,
+                                cell_size, origin_x, origin_y)
+                renderer.mark_cells(shown)
+                overlay_rect = profiler.draw_overlay(screen)
+                if overlay_rect:
+                    renderer.mark(overlay_rect)
+            with profiler.section("flip"):
+                renderer.end_frame()
+            needs_redraw = False
+        profiler.end_frame(drew)
+
+        # EVENT HANDLING, sleeps until there is input
+        events = wait_events()
+        profiler.begin_frame()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
+            elif event.type in EXPOSE_EVENTS:
+                renderer.force_full_update()
+                needs_redraw = True
+
+            elif profiler.handle_event(event):
+                needs_redraw = True
+
+            elif viewport.handle_event(event, cursor_row, cursor_col):
+                needs_redraw = True
+
             elif event.type == pygame.KEYDOWN:
+                needs_redraw = True
                 if event.key == pygame.K_r:
                     orientation = "V" if orientation == "H" else "H"
                 elif event.key == pygame.K_UP:
                     cursor_row = max(0, cursor_row - 1)
+                    viewport.center_on(cursor_row, cursor_col)
                 elif event.key == pygame.K_DOWN:
                     cursor_row = min(rows - 1, cursor_row + 1)
+                    viewport.center_on(cursor_row, cursor_col)
                 elif event.key == pygame.K_LEFT:
                     cursor_col = max(0, cursor_col - 1)
+                    viewport.center_on(cursor_row, cursor_col)
                 elif event.key == pygame.K_RIGHT:
                     cursor_col = min(cols - 1, cursor_col + 1)
+                    viewport.center_on(cursor_row, cursor_col)
+                elif event.key == pygame.K_TAB:
+                    anchor = anchors.next_legal(ship_len, orientation, cursor_row, cursor_col)
+                    if anchor is None:
+                        # the ship may only fit the other way round
+                        turned = "V" if orientation == "H" else "H"
+                        anchor = anchors.next_legal(ship_len, turned, cursor_row, cursor_col)
+                        if anchor is not None:
+                            orientation = turned
+                    if anchor is not None:
+                        cursor_row, cursor_col = anchor
+                        viewport.center_on(cursor_row, cursor_col)
+                elif event.key == pygame.K_o:
+                    show_anchors = not show_anchors
                 elif event.key == pygame.K_SPACE and valid:
                     
                     # Commit ship placement
@@ -108,18 +227,26 @@ def placement_phase(screen, rows, cols, ships, player_label, boat_manager, playe
                     ship_char = boat_management.SHIP_TYPES[ship_name][1]
                     for r, c in preview_cells:
                         board[r][c] = ship_char
+                        minimap.set_cell(r, c, SHIP_COLORS[ship_char])
+                    anchors.place(ship_len, preview_cells)
 
+                    placements.append((ship_name, cursor_row, cursor_col, orientation))
                     current_ship_index += 1
 
                     if current_ship_index >= total_ships:
                         boat_manager.set_player_ships(player_num, board)
+                        profiler.end_frame()
                         
                         screen.fill((15, 30, 50))
-                        draw_grid(screen, rows, cols, cell_size, origin_x, origin_y)
-                        draw_placed_ships(screen, board, cell_size, origin_x, origin_y)
+                        draw_grid(screen, renderer.rows, renderer.cols, cell_size, origin_x, origin_y,
+                                  renderer.first_row, renderer.first_col)
+                        draw_placed_ships(screen, board, cell_size, origin_x, origin_y,
+                                          renderer.first_row, renderer.first_col, renderer.rows, renderer.cols)
+                        if viewport.partial:
+                            minimap.draw(screen, viewport)
                         pygame.display.flip()
                         pygame.time.wait(2000)
-                        return
+                        return placements
 
                     # Reset cursor for next ship
                     cursor_row, cursor_col = 0, 0
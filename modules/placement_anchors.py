@@ -0,0 +1,88 @@
+#################################################
+# placement_anchors.py - which cells a ship    #
+# can still be anchored on while placing       #
+#################################################
+
+
+class PlacementAnchors:
+    """
+    Legal anchor cells (the top or left end of a ship) for every ship
+    length still to be placed, in both orientations.
+
+    Like SparseGrid only the exceptions are stored: per length and
+    orientation, the in-bounds anchors that would cross a placed ship.
+    A legality check is a bounds check and a set lookup on any board
+    size, and placing a ship only adds the anchors whose ship crosses it.
+    """
+
+    def __init__(self, rows, cols, lengths):
+        self.rows = rows
+        self.cols = cols
+        # ships of each length still to be placed
+        self.remaining = {}
+        for length in lengths:
+            self.remaining[length] = self.remaining.get(length, 0) + 1
+        self.blocked = {(length, orientation): set() for length in self.remaining for orientation in "HV"}
+
+    def _span(self, length, orientation):
+        """Rows and columns anchors of this length and orientation can be on."""
+        if orientation == "H":
+            return self.rows, self.cols - length + 1
+        return self.rows - length + 1, self.cols
+
+    def legal(self, length, orientation, row, col):
+        last_row, last_col = self._span(length, orientation)
+        return (0 <= row < last_row and 0 <= col < last_col
+                and (row, col) not in self.blocked[length, orientation])
+
+    def place(self, length, cells):
+        """Record a ship of this length placed on cells."""
+        self.remaining[length] -= 1
+        if not self.remaining[length]:
+            # no more ships of this length, nothing will ask about it
+            del self.remaining[length]
+            del self.blocked[length, "H"], self.blocked[length, "V"]
+
+        for (other, orientation), blocked in self.blocked.items():
+            last_row, last_col = self._span(other, orientation)
+            for r, c in cells:
+                # every anchor whose ship would run over (r, c)
+                for back in range(other):
+                    ar, ac = (r, c - back) if orientation == "H" else (r - back, c)
+                    if 0 <= ar < last_row and 0 <= ac < last_col:
+                        blocked.add((ar, ac))
+
+    def count(self, length, orientation):
+        """Legal anchors left for this length and orientation."""
+        last_row, last_col = self._span(length, orientation)
+        return max(0, last_row) * max(0, last_col) - len(self.blocked[length, orientation])
+
+    def next_legal(self, length, orientation, row, col):
+        """
+        The first legal anchor after (row, col) in reading order, wrapping
+        around to the top, or None if there is none. Only blocked anchors
+        are stepped over one by one, so this stays quick on huge boards.
+        """
+        if not self.count(length, orientation):
+            return None
+        last_row, last_col = self._span(length, orientation)
+        blocked = self.blocked[length, orientation]
+        r, c = row, col + 1
+        while True:
+            if c >= last_col or r >= last_row:
+                r, c = r + 1, 0
+                if r >= last_row:
+                    r = 0
+                continue
+            if (r, c) not in blocked:
+                return r, c
+            c += 1
+
+    def legal_in(self, length, orientation, first_row, first_col, rows, cols):
+        """Every legal anchor in a window of the board, for the overlay."""
+        last_row, last_col = self._span(length, orientation)
+        blocked = self.blocked[length, orientation]
+        return [(r, c)
+                for r in range(max(0, first_row), min(last_row, first_row + rows))
+                for c in range(max(0, first_col), min(last_col, first_col + cols))
+                if (r, c) not in blocked]
@@ -0,0 +1,165 @@
+#################################################
+# players.py - automated players for headless  #
+# games. No pygame imports allowed here.       #
+#################################################
+
+import importlib
+import importlib.util
+import os
+
+from modules.fleet_generator import fleet_generator
+
+
+def random_placement(rows, cols, ships, rng):
+    """
+    Place every ship from the settings ships dict at random.
+    Returns a 2D list with "~" for empty and ship letters for ship cells,
+    ready for BoatManager.set_player_ships.
+    """
+    return fleet_generator(rows, cols, ships).random_board(rng)
+
+
+class Player:
+    """
+    Base class for automated players.
+    new_game is called once per game, then the game loop alternates
+    choose_shot and observe for every shot the player fires.
+    """
+
+    def new_game(self, rows, cols, ships, rng):
+        self.rows = rows
+        self.cols = cols
+        self.ships = ships
+        self.rng = rng
+
+    def place_ships(self):
+        return random_placement(self.rows, self.cols, self.ships, self.rng)
+
+    def choose_shot(self):
+        raise NotImplementedError
+
+    def observe(self, row, col, result):
+        """result is the string returned by fire_at"""
+        pass
+
+    def close(self):
+        """Called once the player will not play again."""
+        pass
+
+
+class RandomPlayer(Player):
+    """Fires at every cell once, in random order."""
+
+    def new_game(self, rows, cols, ships, rng):
+        super().new_game(rows, cols, ships, rng)
+        self.targets = [(r, c) for r in range(rows) for c in range(cols)]
+        rng.shuffle(self.targets)
+
+    def choose_shot(self):
+        return self.targets.pop()
+
+
+class HuntTargetPlayer(Player):
+    """
+    Hunts on a checkerboard pattern, and after a hit targets the
+    neighbouring cells until the ship is sunk.
+    """
+
+    def new_game(self, rows, cols, ships, rng):
+        super().new_game(rows, cols, ships, rng)
+        self.shot = [[False] * cols for _ in range(rows)]
+        self.hunt = [(r, c) for r in range(rows) for c in range(cols) if (r + c) % 2 == 0]
+        self.rest = [(r, c) for r in range(rows) for c in range(cols) if (r + c) % 2 == 1]
+        rng.shuffle(self.hunt)
+        rng.shuffle(self.rest)
+        self.stack = []
+
+    def choose_shot(self):
+        for pool in (self.stack, self.hunt, self.rest):
+            while pool:
+                r, c = pool.pop()
+                if not self.shot[r][c]:
+                    return r, c
+        raise RuntimeError("No cells left to fire at.")
+
+    def observe(self, row, col, result):
+        self.shot[row][col] = True
+        if result == "hit":
+            for r, c in ((row-1, col), (row+1, col), (row, col-1), (row, col+1)):
+                if 0 <= r < self.rows and 0 <= c < self.cols and not self.shot[r][c]:
+                    self.stack.append((r, c))
+        elif result.startswith("sunk:"):
+            self.stack = []
+
+
+# name -> "module:Class" of the player, used by the command line runners.
+# Classes are imported on first use so optional dependencies (NumPy) are
+# only needed by the players that use them.
+PLAYERS = {
+    "random": "modules.players:RandomPlayer",
+    "hunt": "modules.players:HuntTargetPlayer",
+    "heatmap": "modules.targeting:HeatmapPlayer",
+    "montecarlo": "modules.targeting:MonteCarloPlayer",
+}
+
+# players that read the opening book unless given book=false
+BOOK_PLAYERS = {PLAYERS["heatmap"], PLAYERS["montecarlo"]}
+
+
+def _option_value(text):
+    """An option value as the bool, None, int or float it spells, else the string."""
+    words = {"true": True, "false": False, "none": None}
+    if text.lower() in words:
+        return words[text.lower()]
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def split_spec(name):
+    """
+    Splits "spec:key=value,key=value" into the spec and the keyword
+    arguments for the player's class, e.g. "montecarlo:samples=500".
+    """
+    spec, sep, options = name.rpartition(":")
+    if not sep or "=" not in options:
+        return name, {}
+    kwargs = {}
+    for option in options.split(","):
+        key, sep, value = option.partition("=")
+        if not sep or not key.strip().isidentifier():
+            raise ValueError(f"bad player option {option!r} in {name!r}, expected key=value")
+        kwargs[key.strip()] = _option_value(value.strip())
+    return spec, kwargs
+
+
+def uses_book(name):
+    """
+    True when the player a spec names reads the opening book, so a runner
+    only builds the book when one of its players needs it. Bots outside
+    the package are not imported to find out and count as not using it.
+    """
+    spec, kwargs = split_spec(name)
+    return PLAYERS.get(spec, spec) in BOOK_PLAYERS and bool(kwargs.get("book", True))
+
+
+def load_player(name):
+    """
+    Returns a new player for a registered name, a "module:Class" spec or
+    a "path/to/bot.py:Class" spec for a bot module outside the package.
+    Any spec may end in ":key=value,..." to pass keyword arguments to the
+    class, e.g. "montecarlo:samples=500,budget_ms=50".
+    """
+    name, kwargs = split_spec(name)
+    spec = PLAYERS.get(name, name)
+    module_name, _, class_name = spec.rpartition(":")
+    if module_name.endswith(".py"):
+        module_spec = importlib.util.spec_from_file_location(os.path.basename(module_name)[:-3], module_name)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, class_name)(**kwargs)
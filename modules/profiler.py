@@ -0,0 +1,294 @@
+#################################################
+# profiler.py - frame-time instrumentation,    #
+# F3 overlay and trace export                  #
+#################################################
+
+import functools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+# Frames kept for the overlay percentiles
+OVERLAY_WINDOW = 300
+
+# Frames and spans kept for the exported trace, oldest dropped first
+MAX_TRACE = 100000
+
+SECTIONS = ("events", "draw", "flip")
+
+OVERLAY_KEY = pygame.K_F3
+OVERLAY_FONT_SIZE = 20
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers, 0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def surfaces_allocated():
+    """Surfaces created so far by the asset and text caches."""
+    from modules.assets import asset_manager
+    from modules.text_cache import text_cache
+    return asset_manager.derived_created + text_cache.rendered
+
+
+class _Frame:
+    __slots__ = ("phase", "start", "sections", "excluded", "surfaces")
+
+    def __init__(self, phase, start):
+        self.phase = phase
+        self.start = start
+        self.sections = dict.fromkeys(SECTIONS, 0.0)
+        self.excluded = 0.0   # idle waits and nested frames
+        self.surfaces = surfaces_allocated()
+
+
+class FrameProfiler:
+    """
+    Records how long each frame spends handling events, drawing and
+    flipping, and how long each phase (menu, placement, firing, shot
+    animation) runs.
+
+    A frame runs from begin_frame, called once the frame's input has
+    arrived, to end_frame after the flip. Drawing and flipping are timed
+    with section(); whatever else the frame spent is event handling.
+    Time spent blocked in wait_events and time spent in frames nested
+    inside it (a screen opened from another screen's event handler)
+    is left out, so the numbers are the work done, not the time spent
+    waiting for input.
+
+    Nothing is recorded until enabled is set, either by --profile or by
+    the first F3 press.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.overlay = False
+        self.frames = deque(maxlen=MAX_TRACE)
+        self.spans = deque(maxlen=MAX_TRACE)
+        self._recent = deque(maxlen=OVERLAY_WINDOW)
+        self._frame_stack = []
+        self._span_stack = []
+        self._origin = time.perf_counter()
+
+    def _now(self):
+        return time.perf_counter() - self._origin
+
+    # ------------------------------
+    # Frames
+    # ------------------------------
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        phase = self._span_stack[-1] if self._span_stack else "main"
+        self._frame_stack.append(_Frame(phase, self._now()))
+
+    def end_frame(self, keep=True):
+        """
+        Record the current frame. keep=False drops it, for wakeups that
+        handled no input and drew nothing.
+        """
+        if not self._frame_stack:
+            return
+        frame = self._frame_stack.pop()
+        if not keep:
+            return
+        now = self._now()
+        total = now - frame.start - frame.excluded
+        frame.sections["events"] = max(0.0, total - frame.sections["draw"] - frame.sections["flip"])
+        record = {
+            "phase": frame.phase,
+            "start_ms": frame.start * 1000,
+            "total_ms": total * 1000,
+            "surfaces": surfaces_allocated() - frame.surfaces,
+        }
+        for name in SECTIONS:
+            record[name + "_ms"] = frame.sections[name] * 1000
+        self.frames.append(record)
+        self._recent.append((now, total))
+
+        # the nested frame is not part of the frame around it
+        if self._frame_stack:
+            self._frame_stack[-1].excluded += now - frame.start
+
+    @contextmanager
+    def section(self, name):
+        """Time a part of the current frame, "draw" or "flip"."""
+        if not self._frame_stack:
+            yield
+            return
+        frame = self._frame_stack[-1]
+        start = self._now()
+        excluded = frame.excluded
+        try:
+            yield
+        finally:
+            frame.sections[name] += self._now() - start - (frame.excluded - excluded)
+
+    def idle(self, seconds):
+        """Leave time spent blocked waiting for input out of the frame."""
+        if self._frame_stack:
+            self._frame_stack[-1].excluded += seconds
+
+    # ------------------------------
+    # Spans
+    # ------------------------------
+    @contextmanager
+    def span(self, name):
+        """
+        Time a phase or function call; frames inside it belong to it.
+        The name is tracked even while disabled, so an overlay turned on
+        mid-phase knows where it is.
+        """
+        start = self._now()
+        self._span_stack.append(name)
+        try:
+            yield
+        finally:
+            self._span_stack.pop()
+            if self.enabled:
+                self.spans.append({
+                    "name": name,
+                    "start_ms": start * 1000,
+                    "duration_ms": (self._now() - start) * 1000,
+                    "depth": len(self._span_stack),
+                })
+
+    def profiled(self, name=None):
+        """Decorator form of span, named after the function by default."""
+        def decorate(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # ------------------------------
+    # Overlay
+    # ------------------------------
+    def handle_event(self, event):
+        """
+        Toggle the overlay on F3, which also starts recording.
+        Returns True when the event was used, so the screen redraws.
+        """
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.overlay = not self.overlay
+            self.enabled = True
+            return True
+        return False
+
+    def stats(self):
+        """FPS over the last second and p50/p99 frame times in ms."""
+        recent = list(self._recent)
+        times = [total * 1000 for _, total in recent]
+        fps = 0
+        if recent:
+            latest = recent[-1][0]
+            fps = sum(1 for end, _ in recent if latest - end < 1.0)
+        return {
+            "fps": fps,
+            "p50_ms": percentile(times, 50),
+            "p99_ms": percentile(times, 99),
+            "surfaces": surfaces_allocated(),
+        }
+
+    def draw_overlay(self, screen):
+        """
+        Draw the stats box in the top-left corner when the overlay is on.
+        Returns the rect drawn, or None. The text is rendered directly so
+        it does not show up in the surface counts it reports.
+        """
+        if not self.overlay:
+            return None
+        from modules.text_cache import get_font
+
+        stats = self.stats()
+        phase = self._span_stack[-1] if self._span_stack else "main"
+        lines = [
+            f"{phase}",
+            f"FPS {stats['fps']}",
+            f"p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms",
+            f"surfaces {stats['surfaces']}",
+        ]
+        font = get_font(OVERLAY_FONT_SIZE)
+        surfs = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(s.get_width() for s in surfs) + 12
+        height = sum(s.get_height() for s in surfs) + 12
+
+        box = pygame.Surface((width, height), pygame.SRCALPHA)
+        box.fill((0, 0, 0, 170))
+        y = 6
+        for surf in surfs:
+            box.blit(surf, (6, y))
+            y += surf.get_height()
+        return screen.blit(box, (4, 4))
+
+    # ------------------------------
+    # Export
+    # ------------------------------
+    def summary(self):
+        """Per-phase frame statistics and per-name span totals."""
+        phases = {}
+        for frame in self.frames:
+            phases.setdefault(frame["phase"], []).append(frame["total_ms"])
+        spans = {}
+        for span in self.spans:
+            entry = spans.setdefault(span["name"], {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += span["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], span["duration_ms"])
+        return {
+            "phases": {
+                phase: {
+                    "frames": len(times),
+                    "p50_ms": percentile(times, 50),
+                    "p99_ms": percentile(times, 99),
+                    "max_ms": max(times),
+                }
+                for phase, times in phases.items()
+            },
+            "spans": spans,
+        }
+
+    def dump(self, path):
+        """
+        Write the trace to path: JSON with frames, spans and a summary, or
+        CSV with one row per frame or span when path ends in .csv.
+        """
+        if path.lower().endswith(".csv"):
+            import csv
+
+            columns = ["kind", "name", "start_ms", "duration_ms"] + [name + "_ms" for name in SECTIONS] + ["surfaces"]
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                for frame in self.frames:
+                    row = {name + "_ms": round(frame[name + "_ms"], 4) for name in SECTIONS}
+                    row.update(kind="frame", name=frame["phase"], start_ms=round(frame["start_ms"], 4),
+                               duration_ms=round(frame["total_ms"], 4), surfaces=frame["surfaces"])
+                    writer.writerow(row)
+                for span in self.spans:
+                    writer.writerow({"kind": "span", "name": span["name"],
+                                     "start_ms": round(span["start_ms"], 4),
+                                     "duration_ms": round(span["duration_ms"], 4)})
+        else:
+            with open(path, "w") as f:
+                json.dump({
+                    "summary": self.summary(),
+                    "frames": list(self.frames),
+                    "spans": list(self.spans),
+                }, f, indent=1)
+
+
+# shared by every screen
+profiler = FrameProfiler()
@@ -0,0 +1,121 @@
+#################################################
+# protocol.py - the line protocol between the  #
+# game server and its clients. No pygame.      #
+#################################################
+
+from modules.boat_management import SHIP_TYPES
+
+# Every message is one line of space separated words.
+#
+# client -> server
+#   JOIN [match]                        join a named match, or the next open one
+#   PLACE letter row col H|V ...        the whole fleet, four words per ship;
+#                                       can be sent before the opponent joins
+#   FIRE row col
+#   WATCH match                         spectate a match in progress
+#   MATCHES                             list the matches that can be watched
+#   STATS
+#   QUIT
+#
+# server -> client
+#   JOINED match player rows cols ships ships is carrier=1,battleship=1,...
+#   PLACED player                       a fleet was accepted
+#   TURN player                         sent after both fleets and after every shot
+#   SHOT player row col result          result is what fire_at returned
+#   WIN player
+#   LEFT player                         a player disconnected, WIN follows
+#   ERR message
+#
+# server -> spectator, see spectators.py
+#   SNAPSHOT match seq rows cols delta... every shot up to frame seq
+#   DELTA match seq delta...            the shots of one tick; a delta is
+#                                       player,row,col,result
+#   OVER match winner                   winner is 0 if both players left
+#   MATCHES match...
+#   STATS clients matches spectators frames bytes resyncs drops cpu
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5757
+
+# Longest line either side accepts, enough for the PLACE of a huge fleet
+MAX_LINE = 1 << 20
+
+CHAR_TO_NAME = {v[1]: k for k, v in SHIP_TYPES.items()}
+
+
+def encode(*words):
+    return (" ".join(str(word) for word in words) + "\n").encode()
+
+
+def decode(line):
+    """The words of a received line, [] for a blank one."""
+    return line.decode(errors="replace").split()
+
+
+def format_ships(ships):
+    return ",".join(f"{name}={count}" for name, count in ships.items())
+
+
+def parse_ships(text):
+    ships = {}
+    for item in text.split(","):
+        name, count = item.split("=")
+        ships[name] = int(count)
+    return ships
+
+
+def parse_address(text):
+    """Split "host:port" into (host, port); either part can be left out."""
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    return host or DEFAULT_HOST, int(port) if port else DEFAULT_PORT
+
+
+def parse_cell(row, col, rows, cols):
+    """
+    (row, col) for two words naming a cell on a rows x cols board, or
+    None. int() rather than str.isdigit(), which also passes digits
+    such as "²" that int() then refuses.
+    """
+    try:
+        row, col = int(row), int(col)
+    except ValueError:
+        return None
+    if 0 <= row < rows and 0 <= col < cols:
+        return row, col
+    return None
+
+
+def fleet_words(placements):
+    """PLACE arguments for [(ship_name, row, col, "H" or "V"), ...]."""
+    words = []
+    for name, row, col, orientation in placements:
+        words += [SHIP_TYPES[name][1], row, col, orientation]
+    return words
+
+
+def parse_fleet(words, rows, cols, ships, board):
+    """
+    Lay the ships of a PLACE message down on an empty board.
+    Returns None when the fleet is legal, otherwise why it is not.
+    """
+    if len(words) % 4:
+        return "PLACE takes four words per ship"
+    counts = {}
+    for i in range(0, len(words), 4):
+        letter, row, col, orientation = words[i:i + 4]
+        name = CHAR_TO_NAME.get(letter)
+        cell = parse_cell(row, col, rows, cols)
+        if name is None or orientation not in ("H", "V") or cell is None:
+            return f"bad ship {' '.join(words[i:i + 4])}"
+        row, col = cell
+        length = SHIP_TYPES[name][0]
+        for k in range(length):
+            r = row + (k if orientation == "V" else 0)
+            c = col + (k if orientation == "H" else 0)
+            if r >= rows or c >= cols or board[r][c] != "~":
+                return f"{name} at {row} {col} does not fit"
+            board[r][c] = letter
+        counts[name] = counts.get(name, 0) + 1
+    if counts != {name: count for name, count in ships.items() if count}:
+        return "fleet does not match the settings"
+    return None
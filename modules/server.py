@@ -0,0 +1,309 @@
+#################################################
+# server.py - asyncio TCP server hosting many  #
+# independent matches at once. No pygame.      #
+#################################################
+
+import asyncio
+import os
+import time
+
+from modules.game_record import GameWriter
+from modules.protocol import MAX_LINE, decode, encode, format_ships, parse_cell, parse_fleet
+from modules.sparse_board import new_board, new_boat_manager
+from modules.spectators import HIGH_WATER, TICK, SpectatorHub
+
+
+class Connection:
+    """One connected client and the seat it holds."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.player = None
+        # set while the connection is spectating
+        self.subscriber = None
+
+    def send(self, *words):
+        self.writer.write(encode(*words))
+
+
+class Match:
+    """
+    Two seats around one BoatManager. Turns follow firing_phase: a hit
+    or sunk keeps the turn, a miss passes it on, and player 1 opens.
+    """
+
+    def __init__(self, match_id, rows, cols, ships, record_path=None, feed=None):
+        self.match_id = match_id
+        self.rows = rows
+        self.cols = cols
+        self.ships = ships
+        self.boat_manager = new_boat_manager(rows, cols, ships)
+        self.seats = {1: None, 2: None}
+        self.boards = {}
+        self.turn = None
+        self.winner = None
+        self.record_path = record_path
+        self.recorder = None
+        # spectators get every shot through the match's feed
+        self.feed = feed
+
+    @property
+    def full(self):
+        return all(self.seats.values())
+
+    @property
+    def over(self):
+        return self.winner is not None
+
+    def broadcast(self, *words):
+        for conn in self.seats.values():
+            if conn:
+                conn.send(*words)
+
+    def seat(self, conn):
+        player = 1 if self.seats[1] is None else 2
+        self.seats[player] = conn
+        conn.match = self
+        conn.player = player
+        conn.send("JOINED", self.match_id, player, self.rows, self.cols, format_ships(self.ships))
+
+    def place(self, player, words):
+        """Returns None once the fleet is accepted, otherwise why not."""
+        if player in self.boards:
+            return "fleet already placed"
+        board = new_board(self.rows, self.cols)
+        error = parse_fleet(words, self.rows, self.cols, self.ships, board)
+        if error:
+            return error
+        self.boards[player] = board
+        self.boat_manager.set_player_ships(player, board)
+        self.broadcast("PLACED", player)
+
+        if len(self.boards) == 2:
+            if self.record_path:
+                self.recorder = GameWriter(self.record_path, self.rows, self.cols, self.ships,
+                                           self.boards[1], self.boards[2])
+            self.turn = 1
+            self.broadcast("TURN", self.turn)
+        return None
+
+    def fire(self, player, row, col):
+        """Returns None once the shot is taken, otherwise why not."""
+        if self.turn != player:
+            return "not your turn"
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return "off the board"
+        other = 3 - player
+        result = self.boat_manager.fire_at(player, other, row, col)
+        if self.recorder:
+            self.recorder.shot(player, row, col, result)
+        self.broadcast("SHOT", player, row, col, result)
+        if self.feed:
+            self.feed.add_shot(player, row, col, result)
+
+        if result == "miss":
+            self.turn = other
+        winner = self.boat_manager.check_win() if result != "miss" else None
+        if winner:
+            self.finish(winner)
+        else:
+            self.broadcast("TURN", self.turn)
+        return None
+
+    def finish(self, winner):
+        self.winner = winner
+        self.turn = None
+        self.broadcast("WIN", winner)
+        if self.feed:
+            self.feed.finish(winner)
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+    def leave(self, player):
+        """A player disconnected; their opponent wins a match in progress."""
+        self.seats[player] = None
+        if not self.over and any(self.seats.values()):
+            self.broadcast("LEFT", player)
+            self.finish(3 - player)
+
+
+class GameServer:
+    """
+    Accepts clients and pairs them into matches. Every match has its own
+    BoatManager and all of them share one event loop; a command is
+    handled start to finish before the next one is read, so no locking
+    is needed.
+    """
+
+    def __init__(self, rows, cols, ships, record_dir=None, spectator_buffer=HIGH_WATER):
+        self.rows = rows
+        self.cols = cols
+        self.ships = ships
+        self.record_dir = record_dir
+        self.matches = {}
+        self.spectators = SpectatorHub(spectator_buffer, spectator_buffer // 8)
+        # unnamed match waiting for its second player
+        self.open_match = None
+        self.next_id = 1
+
+        # totals for the status line
+        self.clients = 0
+        self.shots = 0
+        self.games = 0
+
+    def _new_match(self, name=None):
+        number = self.next_id
+        self.next_id += 1
+        match_id = name or str(number)
+        record_path = None
+        if self.record_dir:
+            # named matches can be played again, the number keeps records apart
+            record_path = os.path.join(self.record_dir, f"{number}-{name}.bsr" if name else f"{number}.bsr")
+        feed = self.spectators.open_feed(match_id, self.rows, self.cols)
+        match = Match(match_id, self.rows, self.cols, self.ships, record_path, feed)
+        self.matches[match_id] = match
+        return match
+
+    # ------------------------------
+    # Commands
+    # ------------------------------
+    def join(self, conn, words):
+        if conn.match and not conn.match.over:
+            return "already in a match"
+        if words:
+            name = words[0]
+            match = self.matches.get(name)
+            if match is None:
+                match = self._new_match(name)
+            elif match.full or match.over:
+                return f"match {name} is full"
+        else:
+            match = self.open_match
+            if match is None or match.full:
+                match = self.open_match = self._new_match()
+        match.seat(conn)
+        if match is self.open_match and match.full:
+            self.open_match = None
+        return None
+
+    def watch(self, conn, words):
+        if len(words) != 1:
+            return "WATCH takes a match"
+        if conn.match and not conn.match.over:
+            return "already in a match"
+        if conn.subscriber:
+            self.spectators.unwatch(conn.subscriber)
+        conn.subscriber = self.spectators.watch(conn.writer, words[0])
+        if conn.subscriber is None:
+            return f"no match {words[0]} to watch"
+        return None
+
+    def stats(self):
+        hub = self.spectators
+        return ("STATS", self.clients, len(self.matches), hub.spectators, hub.frames, hub.bytes,
+                hub.resyncs, hub.drops, f"{time.process_time():.3f}")
+
+    def command(self, conn, words):
+        """Handle one message, returning an error string or None."""
+        verb, args = words[0].upper(), words[1:]
+        if verb == "JOIN":
+            if conn.subscriber:
+                self.spectators.unwatch(conn.subscriber)
+                conn.subscriber = None
+            return self.join(conn, args)
+        if verb == "WATCH":
+            return self.watch(conn, args)
+        if verb == "MATCHES":
+            conn.send("MATCHES", *self.spectators.feeds)
+            return None
+        if verb == "STATS":
+            conn.send(*self.stats())
+            return None
+        match = conn.match
+        if match is None:
+            return "JOIN a match first"
+        if verb == "PLACE":
+            return match.place(conn.player, args)
+        if verb == "FIRE":
+            cell = parse_cell(args[0], args[1], match.rows, match.cols) if len(args) == 2 else None
+            if cell is None:
+                return "FIRE takes a row and a column on the board"
+            error = match.fire(conn.player, *cell)
+            if error is None:
+                self.shots += 1
+                if match.over:
+                    self.end_match(match)
+            return error
+        return f"unknown command {verb}"
+
+    def end_match(self, match):
+        """Forget a match that was won or that everyone left."""
+        if self.matches.get(match.match_id) is match:
+            del self.matches[match.match_id]
+            if match.over:
+                self.games += 1
+        if self.open_match is match:
+            self.open_match = None
+        if match.feed and match.feed.winner is None:
+            match.feed.finish(0)
+
+    # ------------------------------
+    # Connections
+    # ------------------------------
+    async def handle(self, reader, writer):
+        conn = Connection(writer)
+        self.clients += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                words = decode(line)
+                if not words:
+                    continue
+                if words[0].upper() == "QUIT":
+                    break
+                error = self.command(conn, words)
+                if error:
+                    conn.send("ERR", error)
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    break
+        finally:
+            self.clients -= 1
+            if conn.subscriber:
+                self.spectators.unwatch(conn.subscriber)
+            match = conn.match
+            if match:
+                match.leave(conn.player)
+                if match.over or not any(match.seats.values()):
+                    self.end_match(match)
+            writer.close()
+
+    async def serve(self, host, port, status_interval=None, tick=TICK):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=4096)
+        addresses = ", ".join(str(sock.getsockname()[:2]) for sock in server.sockets)
+        print(f"serving {self.rows}x{self.cols} matches on {addresses}")
+        async with server:
+            fan_out = asyncio.create_task(self.spectators.run(tick))
+            status = asyncio.create_task(self.report(status_interval)) if status_interval else None
+            try:
+                await server.serve_forever()
+            finally:
+                fan_out.cancel()
+                if status:
+                    status.cancel()
+
+    async def report(self, interval):
+        shots = self.shots
+        while True:
+            await asyncio.sleep(interval)
+            print(f"{self.clients} clients, {len(self.matches)} matches, {self.games} finished, "
+                  f"{(self.shots - shots) / interval:.0f} shots/s, {self.spectators.spectators} spectators")
+            shots = self.shots
@@ -0,0 +1,115 @@
+#################################################
+# settings_cache.py - remembers settings       #
+# validation results on disk between launches  #
+#################################################
+
+import hashlib
+import json
+import os
+import time
+
+# Bump when the feasibility solver changes so old answers are discarded
+CACHE_VERSION = 1
+
+# Entries kept before the least recently used ones are evicted
+MAX_ENTRIES = 256
+
+# Hits only refresh their timestamp on disk when it is older than this
+TOUCH_INTERVAL = 3600
+
+# Answers worth keeping: file_handling's FEASIBLE and INFEASIBLE, never UNKNOWN
+RESULTS = ("feasible", "infeasible")
+
+
+def default_cache_path():
+    """
+    $BATTLESHIP_CACHE_DIR/validation_cache.json, or the same file under
+    ~/.cache/battleship.
+    """
+    cache_dir = os.environ.get("BATTLESHIP_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "battleship")
+    return os.path.join(cache_dir, "validation_cache.json")
+
+
+def cache_key(rows, cols, ship_lengths):
+    """
+    Canonical hash of a configuration. Transposed boards and reordered
+    fleets have the same answer, so they share a key.
+    """
+    canonical = {
+        "board": sorted([rows, cols]),
+        "ships": sorted(ship_lengths),
+    }
+    text = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _well_formed(entry):
+    """True for an entry this version would have written."""
+    return (isinstance(entry, dict) and entry.get("result") in RESULTS
+            and isinstance(entry.get("used"), (int, float)) and not isinstance(entry["used"], bool))
+
+
+class ValidationCache:
+    """
+    JSON file mapping cache_key -> {"result": ..., "used": timestamp}.
+    A missing, unreadable or outdated file is treated as empty, malformed
+    entries as missing, and write failures are ignored so a read-only home
+    never breaks startup.
+    """
+
+    def __init__(self, path=None, max_entries=MAX_ENTRIES):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self._entries = None
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION and isinstance(data.get("entries"), dict):
+                self._entries = {key: entry for key, entry in data["entries"].items() if _well_formed(entry)}
+        except (OSError, ValueError, AttributeError):
+            pass
+        return self._entries
+
+    def _save(self):
+        entries = self._entries
+        if len(entries) > self.max_entries:
+            # evict the least recently used entries
+            newest = sorted(entries.items(), key=lambda item: item[1]["used"], reverse=True)
+            self._entries = entries = dict(newest[:self.max_entries])
+
+        # tempfile is only needed on writes, keep it off the startup path
+        import tempfile
+
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def get(self, rows, cols, ship_lengths):
+        """Cached result for a configuration, or None."""
+        entries = self._load()
+        entry = entries.get(cache_key(rows, cols, ship_lengths))
+        if entry is None:
+            return None
+        now = time.time()
+        if now - entry["used"] > TOUCH_INTERVAL:
+            entry["used"] = now
+            self._save()
+        return entry["result"]
+
+    def put(self, rows, cols, ship_lengths, result):
+        entries = self._load()
+        entries[cache_key(rows, cols, ship_lengths)] = {"result": result, "used": time.time()}
+        self._save()
@@ -0,0 +1,207 @@
+#################################################
+# simulation.py - plays complete games between #
+# automated players without pygame, fanned out  #
+# across a process pool                         #
+#################################################
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from modules.boat_management import BoatManager
+from modules.bitboard import BitboardBoatManager
+from modules.game_record import GameWriter
+from modules.opening_book import ensure_book
+from modules.players import uses_book
+from modules.sparse_board import SparseBoatManager
+from modules.bot_process import load_bot
+
+ENGINES = {
+    "classic": BoatManager,
+    "bitboard": BitboardBoatManager,
+    "sparse": SparseBoatManager,
+}
+
+
+def play_game(player1, player2, rows, cols, ships, rng, engine=BitboardBoatManager, record_path=None):
+    """
+    Play one complete game between two automated players.
+    Turn order follows firing_phase: a hit or sunk keeps the turn, a miss
+    passes it to the other player.
+    When record_path is given the game is written there as a game record.
+    Returns (winner, shots) where winner is 1, 2 or None if both players
+    ran out of moves.
+    """
+    boat_manager = engine(rows, cols, ships)
+    players = {1: player1, 2: player2}
+
+    boards = {}
+    for player_num, player in players.items():
+        player.new_game(rows, cols, ships, rng)
+        boards[player_num] = player.place_ships()
+        boat_manager.set_player_ships(player_num, boards[player_num])
+
+    if record_path:
+        with GameWriter(record_path, rows, cols, ships, boards[1], boards[2]) as recorder:
+            return _play_shots(boat_manager, players, rows, cols, recorder)
+    return _play_shots(boat_manager, players, rows, cols)
+
+
+def _play_shots(boat_manager, players, rows, cols, recorder=None):
+    """The firing half of play_game, once both fleets are placed."""
+    current_player, other_player = 1, 2
+    shots = 0
+    # every cell of both boards, plus slack for repeated shots
+    max_shots = 4 * rows * cols
+
+    while shots < max_shots:
+        player = players[current_player]
+        row, col = player.choose_shot()
+        result = boat_manager.fire_at(current_player, other_player, row, col)
+        if recorder:
+            recorder.shot(current_player, row, col, result)
+        player.observe(row, col, result)
+        shots += 1
+
+        if result == "miss":
+            current_player, other_player = other_player, current_player
+        elif result != "repeat":
+            winner = boat_manager.check_win()
+            if winner:
+                return winner, shots
+
+    return None, shots
+
+
+def _run_chunk(task):
+    """
+    Worker entry point: plays a chunk of games with its own seeded RNG stream.
+    """
+    seed, chunk_index, n_games, rows, cols, ships, p1_name, p2_name, engine_name, record_dir, budget = task
+
+    # string seeds are hashed deterministically, so every chunk gets an
+    # independent, reproducible stream
+    rng = random.Random(f"{seed}:{chunk_index}")
+    player1 = load_bot(p1_name, budget)
+    player2 = load_bot(p2_name, budget)
+    engine = ENGINES[engine_name]
+
+    wins = {1: 0, 2: 0, None: 0}
+    total_shots = 0
+    try:
+        for game in range(n_games):
+            record_path = None
+            if record_dir:
+                record_path = os.path.join(record_dir, f"{seed}-{chunk_index}-{game}.bsr")
+            winner, shots = play_game(player1, player2, rows, cols, ships, rng, engine, record_path)
+            wins[winner] += 1
+            total_shots += shots
+    finally:
+        player1.close()
+        player2.close()
+    return wins, total_shots
+
+
+def run_simulations(n_games, rows, cols, ships, p1_name="hunt", p2_name="hunt",
+                    workers=None, seed=0, engine_name="bitboard", chunk_size=None, record_dir=None,
+                    budget=None):
+    """
+    Play n_games across a process pool.
+    When record_dir is given every game is written there as a game record.
+    With a budget every player runs in its own worker process and gets
+    budget milliseconds per shot (see bot_process.py).
+    When either player reads the opening book it is built first if it is
+    not cached yet, so every worker maps the same file instead of playing
+    without it.
+    Returns a summary dict with win counts, shots and games per second.
+    """
+    workers = workers or os.cpu_count() or 1
+    if uses_book(p1_name) or uses_book(p2_name):
+        ensure_book(rows, cols, ships)
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    if chunk_size is None:
+        # a few chunks per worker keeps the pool balanced
+        chunk_size = max(1, min(1000, n_games // (workers * 4) or 1))
+
+    tasks = []
+    remaining = n_games
+    chunk_index = 0
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        tasks.append((seed, chunk_index, size, rows, cols, ships, p1_name, p2_name, engine_name, record_dir,
+                      budget))
+        remaining -= size
+        chunk_index += 1
+
+    wins = {1: 0, 2: 0, None: 0}
+    total_shots = 0
+    start = time.perf_counter()
+
+    if workers == 1:
+        results = map(_run_chunk, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_run_chunk, tasks)
+
+    try:
+        for chunk_wins, chunk_shots in results:
+            for key, count in chunk_wins.items():
+                wins[key] += count
+            total_shots += chunk_shots
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "games": n_games,
+        "player1_wins": wins[1],
+        "player2_wins": wins[2],
+        "unfinished": wins[None],
+        "shots": total_shots,
+        "seconds": elapsed,
+        "games_per_second": n_games / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def run_batched(n_games, rows, cols, ships, seed=0):
+    """
+    Play n_games of random vs random play in a single process, advancing
+    every game with one vectorized BatchGameState.step per shot.
+    Returns the same summary dict as run_simulations.
+    """
+    import numpy as np
+    from modules.batch_state import BatchGameState
+    from modules.players import random_placement
+
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    boards = [
+        (random_placement(rows, cols, ships, rng), random_placement(rows, cols, ships, rng))
+        for _ in range(n_games)
+    ]
+
+    start = time.perf_counter()
+    state = BatchGameState.from_boards(rows, cols, boards)
+    shots = 0
+    # every cell of both boards is enough to finish any game
+    for _ in range(2 * rows * cols):
+        if state.winner.all():
+            break
+        shots += int((state.winner == 0).sum())
+        target_rows, target_cols = state.random_targets(np_rng)
+        state.step(target_rows, target_cols)
+    elapsed = time.perf_counter() - start
+
+    winners = state.check_win()
+    return {
+        "games": n_games,
+        "player1_wins": int((winners == 1).sum()),
+        "player2_wins": int((winners == 2).sum()),
+        "unfinished": int((winners == 0).sum()),
+        "shots": shots,
+        "seconds": elapsed,
+        "games_per_second": n_games / elapsed if elapsed > 0 else float("inf"),
+    }
@@ -0,0 +1,274 @@
+#################################################
+# sparse_board.py - boards that only store the #
+# ship and fired cells, for huge boards        #
+#################################################
+
+import os
+import warnings
+
+from modules.boat_management import SHIP_TYPES, BoatManager, mask_cells
+
+# Boards with at least this many cells get the sparse engine. Can be
+# overridden with $BATTLESHIP_SPARSE_CELLS (0 makes every board sparse).
+SPARSE_MIN_CELLS = 40000
+
+# reverse lookup: letter -> ship_name
+CHAR_TO_NAME = {v[1]: k for k, v in SHIP_TYPES.items()}
+
+
+# $BATTLESHIP_SPARSE_CELLS values already warned about
+_BAD_SETTINGS = set()
+
+
+def sparse_min_cells():
+    """
+    The sparse threshold from $BATTLESHIP_SPARSE_CELLS, or SPARSE_MIN_CELLS
+    when it is unset or not a whole number (with a warning, once per value).
+    """
+    value = os.environ.get("BATTLESHIP_SPARSE_CELLS")
+    if not value:
+        return SPARSE_MIN_CELLS
+    try:
+        return int(value)
+    except ValueError:
+        if value not in _BAD_SETTINGS:
+            _BAD_SETTINGS.add(value)
+            warnings.warn(f"BATTLESHIP_SPARSE_CELLS={value!r} is not a whole number, "
+                          f"using {SPARSE_MIN_CELLS}")
+        return SPARSE_MIN_CELLS
+
+
+def use_sparse(rows, cols):
+    """True when a rows x cols board is big enough to store sparsely."""
+    return rows * cols >= sparse_min_cells()
+
+
+class SparseRow:
+    """One row of a SparseGrid, read and written like a list."""
+
+    __slots__ = ("grid", "row")
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, col):
+        return self.grid.cells.get((self.row, col), self.grid.fill)
+
+    def __setitem__(self, col, value):
+        self.grid.set(self.row, col, value)
+
+    def __iter__(self):
+        cells = self.grid.cells
+        fill = self.grid.fill
+        row = self.row
+        for col in range(self.grid.cols):
+            yield cells.get((row, col), fill)
+
+
+class SparseGrid:
+    """
+    A rows x cols grid that keeps a dict of the cells that are not `fill`.
+    grid[r][c] reads and writes like the nested lists BoatManager uses, so
+    the draw code works unchanged, but memory only grows with the ships
+    placed and shots fired.
+    """
+
+    __slots__ = ("rows", "cols", "fill", "cells")
+
+    def __init__(self, rows, cols, fill="~"):
+        self.rows = rows
+        self.cols = cols
+        self.fill = fill
+        self.cells = {}
+
+    @classmethod
+    def from_rows(cls, board, fill="~"):
+        """A SparseGrid holding the same cells as a nested-list board."""
+        grid = cls(len(board), len(board[0]) if board else 0, fill)
+        for r, row in enumerate(board):
+            for c, cell in enumerate(row):
+                if cell != fill:
+                    grid.cells[(r, c)] = cell
+        return grid
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return SparseRow(self, row)
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield SparseRow(self, row)
+
+    def set(self, row, col, value):
+        if value == self.fill:
+            self.cells.pop((row, col), None)
+        else:
+            self.cells[(row, col)] = value
+
+    def items(self):
+        """The ((row, col), value) pairs of every cell that is not fill."""
+        return self.cells.items()
+
+
+class SparseBoatManager(BoatManager):
+    """
+    BoatManager for huge boards. Boards and hit grids are SparseGrids, and
+    like BitboardBoatManager every ship keeps a remaining-cell counter with
+    a cell -> ship lookup, so nothing ever walks the whole board.
+    """
+
+    def __init__(self, rows, cols, ships):
+        super().__init__(rows, cols, ships)
+
+        # Per-ship data, indexed by ship id
+        self.ship_names = {1: [], 2: []}
+        self.ships_remaining_cells = {1: [], 2: []}
+
+        # (row, col) -> ship id
+        self.cell_to_ship = {1: {}, 2: {}}
+
+        # Ships still afloat per player
+        self.ships_afloat = {1: 0, 2: 0}
+
+    def _empty_board(self):
+        return SparseGrid(self.rows, self.cols)
+
+    # ------------------------------
+    # Place ships for a player
+    # ------------------------------
+    def set_player_ships(self, player, board):
+        """
+        board: SparseGrid, or 2D list with "~" for empty and ship letters
+        for ship cells
+        """
+        if not isinstance(board, SparseGrid):
+            board = SparseGrid.from_rows(board)
+        self.player_boards[player] = board
+        self.player_ship_coords[player] = {}
+        self.sunk_ships[player] = []
+
+        # same grouping as BoatManager._flood_fill_ship, over the ship cells only
+        cells = board.cells
+        names = []
+        remaining = []
+        cell_to_ship = {}
+        for start in sorted(cells):
+            if start in cell_to_ship:
+                continue
+            ship_id = len(names)
+            ship_char = cells[start]
+            stack = [start]
+            ship_cells = []
+            cell_to_ship[start] = ship_id
+            while stack:
+                row, col = stack.pop()
+                ship_cells.append((row, col))
+                for cell in ((row+1, col), (row-1, col), (row, col+1), (row, col-1)):
+                    if cell not in cell_to_ship and cells.get(cell) == ship_char:
+                        cell_to_ship[cell] = ship_id
+                        stack.append(cell)
+            names.append(CHAR_TO_NAME[ship_char])
+            remaining.append(len(ship_cells))
+            self.player_ship_coords[player][names[-1]] = ship_cells
+
+        self.ship_names[player] = names
+        self.ships_remaining_cells[player] = remaining
+        self.cell_to_ship[player] = cell_to_ship
+        self.ships_afloat[player] = len(names)
+
+    # ------------------------------
+    # Fire at a cell
+    # ------------------------------
+    def fire_at(self, attacker, defender, row, col):
+        """
+        Returns:
+            "hit" if hit a ship
+            "miss" if missed
+            "repeat" if already shot
+            "sunk:ship_name" if ship sunk
+        """
+        board = self.player_boards[defender]
+        hits = self.player_hits[attacker]
+
+        # Already shot here
+        if (row, col) in hits.cells:
+            return "repeat"
+
+        ship_id = self.cell_to_ship[defender].get((row, col))
+        if ship_id is None:
+            board.set(row, col, "O")
+            hits.set(row, col, "O")
+            return "miss"
+
+        board.set(row, col, "X")
+        hits.set(row, col, "X")
+        remaining = self.ships_remaining_cells[defender]
+        remaining[ship_id] -= 1
+        if remaining[ship_id] == 0:
+            ship_name = self.ship_names[defender][ship_id]
+            self.sunk_ships[defender].append(ship_name)
+            self.ships_afloat[defender] -= 1
+            return f"sunk:{ship_name}"
+        return "hit"
+
+    def restore_shots(self, attacker, fired, sunk):
+        """Same as BoatManager.restore_shots."""
+        defender = 3 - attacker
+        board = self.player_boards[defender]
+        hits = self.player_hits[attacker]
+        cell_to_ship = self.cell_to_ship[defender]
+        remaining = self.ships_remaining_cells[defender]
+        for cell in mask_cells(fired, self.cols):
+            ship_id = cell_to_ship.get(cell)
+            mark = "O" if ship_id is None else "X"
+            board.cells[cell] = mark
+            hits.cells[cell] = mark
+            if ship_id is not None:
+                remaining[ship_id] -= 1
+        self.sunk_ships[defender] = list(sunk)
+        self.ships_afloat[defender] = sum(1 for cells in remaining if cells)
+
+    def _is_ship_sunk(self, player, row, col):
+        """
+        Checks if the ship containing (row, col) is fully hit.
+        Returns the ship name if sunk, else None.
+        """
+        ship_id = self.cell_to_ship[player].get((row, col))
+        if ship_id is not None and self.ships_remaining_cells[player][ship_id] == 0:
+            return self.ship_names[player][ship_id]
+        return None
+
+    # ------------------------------
+    # Check if a player has won
+    # ------------------------------
+    def check_win(self):
+        """
+        Returns the winning player (1 or 2) if all ships of a player are sunk.
+        Else returns None.
+        """
+        for player in [1, 2]:
+            if self.ships_afloat[player] == 0:
+                return 2 if player == 1 else 1
+        return None
+
+
+def new_board(rows, cols):
+    """An empty placement board, sparse when the board is huge."""
+    if use_sparse(rows, cols):
+        return SparseGrid(rows, cols)
+    return [["~"] * cols for _ in range(rows)]
+
+
+def new_boat_manager(rows, cols, ships):
+    """BoatManager, or SparseBoatManager above the sparse threshold."""
+    if use_sparse(rows, cols):
+        return SparseBoatManager(rows, cols, ships)
+    return BoatManager(rows, cols, ships)
@@ -0,0 +1,200 @@
+#################################################
+# spectators.py - streams live matches to any  #
+# number of watchers as coalesced deltas       #
+#################################################
+
+import asyncio
+import socket
+import time
+
+from modules.protocol import encode
+
+# Milliseconds between fan-out ticks. Every shot a match takes within one
+# tick reaches its spectators as a single DELTA line.
+TICK = 50
+
+# A spectator with more than HIGH_WATER bytes still unsent stops getting
+# deltas. Once it has drained below LOW_WATER it is resynced with a fresh
+# SNAPSHOT; one still backed up after DROP_AFTER seconds is disconnected.
+HIGH_WATER = 64 * 1024
+LOW_WATER = 8 * 1024
+DROP_AFTER = 10
+
+
+class Subscriber:
+    """One spectator connection and the feed it watches."""
+
+    __slots__ = ("writer", "feed", "lagging_since", "slack")
+
+    def __init__(self, writer, feed):
+        self.writer = writer
+        self.feed = feed
+        # time the spectator fell behind, None while it keeps up
+        self.lagging_since = None
+        # size of the last snapshot, which may take a while to go out
+        self.slack = 0
+
+    def backlog(self):
+        return self.writer.transport.get_write_buffer_size()
+
+
+class MatchFeed:
+    """
+    The shots of one match as deltas. A delta is "player,row,col,result"
+    with result as fire_at returned it, so its size does not depend on
+    the board. The whole history is kept in the same form for snapshots.
+    """
+
+    def __init__(self, hub, match_id, rows, cols):
+        self.hub = hub
+        self.match_id = match_id
+        self.rows = rows
+        self.cols = cols
+        self.shots = []
+        # shots already sent in a frame, and the sequence number of that frame
+        self.sent = 0
+        self.seq = 0
+        self.winner = None
+        self.subscribers = set()
+        self._snapshot = None
+
+    def add_shot(self, player, row, col, result):
+        self.shots.append(f"{player},{row},{col},{result}")
+        self.hub.dirty.add(self)
+
+    def finish(self, winner):
+        """winner is 0 when everyone left before the match was decided."""
+        self.winner = winner
+        self.hub.dirty.add(self)
+
+    def snapshot(self):
+        """
+        SNAPSHOT match seq rows cols delta... with every shot up to frame
+        seq, encoded once and shared by every spectator that needs it.
+        """
+        if self._snapshot is None or self._snapshot[0] != self.seq:
+            line = encode("SNAPSHOT", self.match_id, self.seq, self.rows, self.cols,
+                          *self.shots[:self.sent])
+            self._snapshot = (self.seq, line)
+        return self._snapshot[1]
+
+    def frame(self):
+        """DELTA match seq delta... for the shots since the last frame, or b""."""
+        if self.sent == len(self.shots):
+            return b""
+        self.seq += 1
+        data = encode("DELTA", self.match_id, self.seq, *self.shots[self.sent:])
+        self.sent = len(self.shots)
+        return data
+
+
+class SpectatorHub:
+    """
+    Every match feed and the spectators watching them. Shots only mark
+    their feed dirty; each tick encodes one frame per dirty feed and
+    writes the same bytes to all of its spectators, so the cost per
+    spectator is a buffered write whatever the board size.
+    """
+
+    def __init__(self, high_water=HIGH_WATER, low_water=LOW_WATER, drop_after=DROP_AFTER):
+        self.high_water = high_water
+        self.low_water = low_water
+        self.drop_after = drop_after
+        self.feeds = {}
+        self.dirty = set()
+        self.lagging = set()
+
+        # totals for STATS
+        self.frames = 0
+        self.bytes = 0
+        self.resyncs = 0
+        self.drops = 0
+
+    @property
+    def spectators(self):
+        return sum(len(feed.subscribers) for feed in self.feeds.values())
+
+    def open_feed(self, match_id, rows, cols):
+        feed = MatchFeed(self, match_id, rows, cols)
+        self.feeds[match_id] = feed
+        return feed
+
+    # ------------------------------
+    # Spectators
+    # ------------------------------
+    def watch(self, writer, match_id):
+        """Subscribe writer to a match, starting with a SNAPSHOT."""
+        feed = self.feeds.get(match_id)
+        if feed is None or feed.winner is not None:
+            return None
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # otherwise the kernel buffers megabytes for a stalled spectator
+            # before its backlog shows up here
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.high_water)
+        subscriber = Subscriber(writer, feed)
+        feed.subscribers.add(subscriber)
+        self._resync(subscriber)
+        return subscriber
+
+    def unwatch(self, subscriber):
+        subscriber.feed.subscribers.discard(subscriber)
+        self.lagging.discard(subscriber)
+
+    def _resync(self, subscriber):
+        snapshot = subscriber.feed.snapshot()
+        subscriber.slack = len(snapshot)
+        self._send(subscriber, snapshot)
+
+    def _send(self, subscriber, data):
+        subscriber.writer.write(data)
+        self.frames += 1
+        self.bytes += len(data)
+
+    # ------------------------------
+    # Fan-out
+    # ------------------------------
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+
+        # spectators that fell behind: resync the ones that drained, drop
+        # the ones that stayed stuck
+        for subscriber in list(self.lagging):
+            backlog = subscriber.backlog()
+            if backlog <= self.low_water:
+                self.lagging.discard(subscriber)
+                subscriber.lagging_since = None
+                self._resync(subscriber)
+                self.resyncs += 1
+            elif now - subscriber.lagging_since > self.drop_after:
+                self.unwatch(subscriber)
+                subscriber.writer.transport.abort()
+                self.drops += 1
+
+        dirty, self.dirty = self.dirty, set()
+        for feed in dirty:
+            data = feed.frame()
+            for subscriber in list(feed.subscribers):
+                if not data or subscriber.lagging_since is not None:
+                    continue
+                if subscriber.backlog() > self.high_water + subscriber.slack:
+                    # skip deltas until it drains, then resync
+                    subscriber.lagging_since = now
+                    self.lagging.add(subscriber)
+                    continue
+                self._send(subscriber, data)
+            if feed.winner is not None:
+                # everyone hears the end, even spectators that fell behind
+                over = encode("OVER", feed.match_id, feed.winner)
+                for subscriber in feed.subscribers:
+                    self.lagging.discard(subscriber)
+                    subscriber.lagging_since = None
+                    self._send(subscriber, over)
+                feed.subscribers.clear()
+                if self.feeds.get(feed.match_id) is feed:
+                    del self.feeds[feed.match_id]
+
+    async def run(self, tick=TICK):
+        while True:
+            await asyncio.sleep(tick / 1000)
+            self.tick()
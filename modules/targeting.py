@@ -0,0 +1,384 @@
+#################################################
+# targeting.py - probability-density AI that   #
+# fires at the cell most ship placements cover #
+#################################################
+
+import time
+
+import numpy as np
+
+from modules.boat_management import SHIP_TYPES
+from modules.opening_book import opening_book
+from modules.players import Player
+
+# Cell states as seen by the attacker
+UNKNOWN = 0
+MISS = 1
+HIT = 2
+SUNK = 3
+
+# Extra weight per unresolved hit a target-mode placement covers
+HIT_BOOST = 50.0
+
+
+class PlacementTable:
+    """
+    Every legal placement of one ship length on an empty board.
+        cells[p]  flat cell indices covered by placement p, shape (P, length)
+        cover[i]  ids of the placements covering flat cell i
+    """
+
+    def __init__(self, rows, cols, length):
+        starts = []
+        if length <= cols:
+            # horizontal
+            r, c = np.mgrid[0:rows, 0:cols - length + 1]
+            starts.append((r.ravel() * cols + c.ravel(), 1))
+        if length <= rows and length > 1:
+            # vertical
+            r, c = np.mgrid[0:rows - length + 1, 0:cols]
+            starts.append((r.ravel() * cols + c.ravel(), cols))
+
+        offsets = np.arange(length)
+        blocks = [first[:, None] + offsets[None, :] * step for first, step in starts]
+        self.length = length
+        self.cells = np.concatenate(blocks) if blocks else np.zeros((0, length), dtype=np.intp)
+
+        # invert cells into per-cell placement lists
+        flat = self.cells.ravel()
+        ids = np.repeat(np.arange(len(self.cells)), length)
+        order = np.argsort(flat, kind="stable")
+        bounds = np.searchsorted(flat[order], np.arange(rows * cols + 1))
+        self.cover = [ids[order[bounds[i]:bounds[i + 1]]] for i in range(rows * cols)]
+
+
+_TABLES = {}
+
+
+def placement_table(rows, cols, length):
+    """Shared, lazily built PlacementTable for a board size and ship length."""
+    key = (rows, cols, length)
+    if key not in _TABLES:
+        _TABLES[key] = PlacementTable(rows, cols, length)
+    return _TABLES[key]
+
+
+class ShotTracker:
+    """
+    What an attacker knows about the defender board: the state of every
+    cell and how many ships of each length are still afloat.
+    """
+
+    def __init__(self, rows, cols, ships):
+        self.rows = rows
+        self.cols = cols
+        self.state = np.zeros(rows * cols, dtype=np.int8)
+        self.remaining = {}
+        for name, count in ships.items():
+            length = SHIP_TYPES[name][0]
+            self.remaining[length] = self.remaining.get(length, 0) + count
+
+    def record(self, row, col, result):
+        """
+        Update the board with a fire_at result.
+        Returns (blocked, sunk_length): the flat cells no ship placement may
+        cover any more, and the length of the ship sunk by this shot or None.
+        """
+        index = row * self.cols + col
+        if result == "miss":
+            self.state[index] = MISS
+            return [index], None
+        if result == "hit":
+            self.state[index] = HIT
+            return [], None
+        if result.startswith("sunk:"):
+            self.state[index] = HIT
+            length = SHIP_TYPES[result.split(":")[1]][0]
+            self.remaining[length] -= 1
+            cells = self._sunk_cells(row, col, length)
+            self.state[cells] = SUNK
+            return cells, length
+        return [], None
+
+    def _sunk_cells(self, row, col, length):
+        """
+        The cells of the ship just sunk at (row, col): the only line of
+        `length` unresolved hits through it. If several lines fit, only the
+        shot cell is resolved and the other hits stay open.
+        """
+        candidates = []
+        for dr, dc in ((0, 1), (1, 0)):
+            for back in range(length):
+                r0, c0 = row - dr * back, col - dc * back
+                r1, c1 = r0 + dr * (length - 1), c0 + dc * (length - 1)
+                if r0 < 0 or c0 < 0 or r1 >= self.rows or c1 >= self.cols:
+                    continue
+                cells = [(r0 + dr * i) * self.cols + c0 + dc * i for i in range(length)]
+                if all(self.state[i] == HIT for i in cells):
+                    candidates.append(cells)
+        if len(candidates) == 1:
+            return candidates[0]
+        return [row * self.cols + col]
+
+
+class HeatmapPlayer(Player):
+    """
+    Fires at the cell covered by the most legal placements of the ships
+    still afloat.
+
+    Hunt mode keeps a placement-count heatmap that is updated incrementally:
+    a miss or a sunk ship only touches the placements covering those cells,
+    and a sunk ship removes its length's remaining placements once.
+    While there are unresolved hits, target mode scores only the placements
+    through those hits, weighted by how many hits each one explains.
+
+    With book=True and a precomputed opening book for the configuration
+    (see opening_book.py) the first shots follow the book for as long as
+    every one of them misses, the heatmap starts as a copy of the book's
+    instead of being counted again, and ties between equally good cells
+    go to the one the book's prior says most often holds a ship.
+    """
+
+    def __init__(self, book=True):
+        self.book = book
+
+    def new_game(self, rows, cols, ships, rng):
+        super().new_game(rows, cols, ships, rng)
+        self.opening = None
+        self.prior = None
+        book = opening_book(rows, cols, ships) if self.book else None
+        if book is not None:
+            self.prior = book.prior
+            if len(book.opening):
+                self.opening = book.opening
+                self.opening_step = 0
+
+        self.tracker = ShotTracker(rows, cols, ships)
+        self.tables = {length: placement_table(rows, cols, length) for length in self.tracker.remaining}
+        self.valid = {length: np.ones(len(table.cells), dtype=bool) for length, table in self.tables.items()}
+
+        if book is not None:
+            self.heat = np.array(book.heat, dtype=np.int64)
+        else:
+            self.heat = np.zeros(rows * cols, dtype=np.int64)
+            for length, count in self.tracker.remaining.items():
+                np.add.at(self.heat, self.tables[length].cells.ravel(), count)
+
+    def choose_shot(self):
+        shot = self._opening_shot()
+        if shot is not None:
+            return shot
+
+        scores = self._target_scores()
+        if scores is None:
+            scores = self.heat.astype(np.float64)
+        scores[self.tracker.state != UNKNOWN] = -1.0
+        return self._best_cell(scores)
+
+    def _best_cell(self, scores):
+        """A highest scoring cell, ties broken by the book's prior and then at random."""
+        best = np.flatnonzero(scores == scores.max())
+        if self.prior is not None and len(best) > 1:
+            prior = self.prior[best]
+            best = best[prior == prior.max()]
+        index = int(best[self.rng.randrange(len(best))])
+        return divmod(index, self.cols)
+
+    def observe(self, row, col, result):
+        if self.opening is not None:
+            step = self.opening_step
+            if result == "miss" and step < len(self.opening) and row * self.cols + col == self.opening[step]:
+                self.opening_step += 1
+            else:
+                # off the book for the rest of the game
+                self.opening = None
+
+        blocked, sunk_length = self.tracker.record(row, col, result)
+
+        if sunk_length is not None:
+            # one fewer ship of this length counts towards every placement left
+            table = self.tables[sunk_length]
+            np.subtract.at(self.heat, table.cells[self.valid[sunk_length]].ravel(), 1)
+
+        for length, table in self.tables.items():
+            valid = self.valid[length]
+            for cell in blocked:
+                ids = table.cover[cell]
+                newly = ids[valid[ids]]
+                if len(newly):
+                    valid[newly] = False
+                    np.subtract.at(self.heat, table.cells[newly].ravel(), self.tracker.remaining[length])
+
+    def _opening_shot(self):
+        """The next book shot, or None once the game has left the book."""
+        if self.opening is None or self.opening_step >= len(self.opening):
+            return None
+        return divmod(int(self.opening[self.opening_step]), self.cols)
+
+    def _target_scores(self):
+        """
+        Scores from placements that pass through unresolved hits, or None
+        when there are no unresolved hits to follow up.
+        """
+        state = self.tracker.state
+        hit_cells = np.flatnonzero(state == HIT)
+        if not len(hit_cells):
+            return None
+
+        is_hit = state == HIT
+        scores = np.zeros(self.rows * self.cols, dtype=np.float64)
+        for length, table in self.tables.items():
+            count = self.tracker.remaining[length]
+            if not count:
+                continue
+            ids = np.unique(np.concatenate([table.cover[i] for i in hit_cells]))
+            ids = ids[self.valid[length][ids]]
+            if not len(ids):
+                continue
+            cells = table.cells[ids]
+            n_hits = is_hit[cells].sum(axis=1)
+            # a ship lying entirely on hits would already be sunk
+            keep = n_hits < length
+            weights = count * HIT_BOOST ** n_hits[keep]
+            np.add.at(scores, cells[keep].ravel(), np.repeat(weights, length))
+
+        if scores.max() <= 0:
+            return None
+        return scores
+
+
+class MonteCarloPlayer(HeatmapPlayer):
+    """
+    Samples whole fleets consistent with everything seen so far and fires at
+    the unknown cell most samples put a ship on.
+
+    A sample is a list of placements, one per ship still afloat, that covers
+    every unresolved hit and avoids misses and sunk ships. Samples that stay
+    consistent after a shot are kept in the pool; only the invalidated ones
+    are regenerated, up to `samples` or until `budget_ms` runs out.
+    Falls back to the heatmap when no sample can be drawn.
+    """
+
+    def __init__(self, samples=200, budget_ms=None, attempts=20, book=True):
+        super().__init__(book)
+        self.samples = samples
+        self.budget_ms = budget_ms
+        self.attempts = attempts
+
+    def new_game(self, rows, cols, ships, rng):
+        super().new_game(rows, cols, ships, rng)
+        self.pool = []
+
+    def observe(self, row, col, result):
+        super().observe(row, col, result)
+        self.pool = [sample for sample in self.pool if self._consistent(sample)]
+
+    def _consistent(self, sample):
+        """
+        A sample still fits when it holds exactly the ships afloat, none of
+        its placements were ruled out, it covers every unresolved hit and
+        no ship in it lies entirely on hits.
+        """
+        is_hit = self.tracker.state == HIT
+        lengths = {}
+        covered = 0
+        for length, placement in sample:
+            if not self.valid[length][placement]:
+                return False
+            hits = is_hit[self.tables[length].cells[placement]]
+            if hits.all():
+                return False
+            covered += int(hits.sum())
+            lengths[length] = lengths.get(length, 0) + 1
+        if any(lengths.get(length, 0) != count for length, count in self.tracker.remaining.items()):
+            return False
+        # placements never overlap, so the counts add up exactly
+        return covered == int(is_hit.sum())
+
+    def choose_shot(self):
+        shot = self._opening_shot()
+        if shot is not None:
+            # no samples are needed while the book has the answer
+            return shot
+
+        self._refill_pool()
+        if not self.pool:
+            return super().choose_shot()
+
+        counts = np.zeros(self.rows * self.cols, dtype=np.float64)
+        for sample in self.pool:
+            for length, placement in sample:
+                counts[self.tables[length].cells[placement]] += 1
+        counts[self.tracker.state != UNKNOWN] = -1.0
+        if counts.max() <= 0:
+            return super().choose_shot()
+        return self._best_cell(counts)
+
+    def _refill_pool(self):
+        deadline = None
+        if self.budget_ms is not None:
+            deadline = time.perf_counter() + self.budget_ms / 1000
+        failures = 0
+        while len(self.pool) < self.samples and failures < self.attempts * self.samples:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            sample = self._draw_sample()
+            if sample is None:
+                failures += 1
+            else:
+                self.pool.append(sample)
+
+    def _draw_sample(self):
+        """
+        One fleet consistent with the tracker, or None if the random
+        construction ran into a dead end. Unresolved hits are covered first,
+        then the remaining ships are dropped on any free legal placement.
+        """
+        state = self.tracker.state
+        rng = self.rng
+        ships = [length for length, count in self.tracker.remaining.items() for _ in range(count)]
+        rng.shuffle(ships)
+
+        occupied = set()
+        sample = []
+        open_hits = set(np.flatnonzero(state == HIT).tolist())
+
+        while open_hits:
+            if not ships:
+                return None
+            target = rng.choice(sorted(open_hits))
+            options = []
+            for slot, length in enumerate(ships):
+                table = self.tables[length]
+                for placement in table.cover[target][self.valid[length][table.cover[target]]].tolist():
+                    cells = table.cells[placement].tolist()
+                    if occupied.isdisjoint(cells):
+                        options.append((slot, placement, cells))
+            if not options:
+                return None
+            slot, placement, cells = options[rng.randrange(len(options))]
+            length = ships.pop(slot)
+            if all(state[i] == HIT for i in cells):
+                # every cell already hit, the ship would be sunk
+                return None
+            sample.append((length, placement))
+            occupied.update(cells)
+            open_hits.difference_update(cells)
+
+        for length in ships:
+            table = self.tables[length]
+            ids = np.flatnonzero(self.valid[length])
+            for _ in range(self.attempts):
+                if not len(ids):
+                    return None
+                placement = int(ids[rng.randrange(len(ids))])
+                cells = table.cells[placement].tolist()
+                # free ships may not touch unresolved hits, those are explained
+                if occupied.isdisjoint(cells) and not any(state[i] == HIT for i in cells):
+                    break
+            else:
+                return None
+            sample.append((length, placement))
+            occupied.update(cells)
+
+        return sample
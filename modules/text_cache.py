@@ -0,0 +1,89 @@
+#################################################
+# text_cache.py - shared fonts, rendered text  #
+# and pre-rendered grid label strips           #
+#################################################
+
+from collections import OrderedDict
+
+import pygame
+
+_FONTS = {}
+
+
+def get_font(size):
+    """The default system font at a size, constructed once."""
+    font = _FONTS.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(None, size)
+        _FONTS[size] = font
+    return font
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed on (text, size, color, antialias), with
+    least recently used entries evicted past max_entries.
+    Label strips for the grid axes are cached the same way.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+        # counter for profiling
+        self.rendered = 0
+
+    def _lookup(self, key):
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+        return surf
+
+    def _store(self, key, surf):
+        self._surfaces[key] = surf
+        self.rendered += 1
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def render(self, text, size, color, antialias=True):
+        key = ("text", text, size, tuple(color), antialias)
+        surf = self._lookup(key)
+        if surf is None:
+            surf = self._store(key, get_font(size).render(text, antialias, color))
+        return surf
+
+    def label_strip(self, labels, cell_size, size, color, vertical=False):
+        """
+        All axis labels on one transparent surface.
+        Horizontal strips center each label over its column, vertical strips
+        left-align each label and center it on its row.
+        """
+        key = ("strip", tuple(labels), cell_size, size, tuple(color), vertical)
+        strip = self._lookup(key)
+        if strip is not None:
+            return strip
+
+        surfs = [self.render(label, size, color) for label in labels]
+        if vertical:
+            width = max((s.get_width() for s in surfs), default=0)
+            strip = pygame.Surface((width, cell_size * len(labels)), pygame.SRCALPHA)
+            for i, surf in enumerate(surfs):
+                strip.blit(surf, (0, i * cell_size + cell_size // 2 - surf.get_height() // 2))
+        else:
+            height = max((s.get_height() for s in surfs), default=0)
+            strip = pygame.Surface((cell_size * len(labels), height), pygame.SRCALPHA)
+            for i, surf in enumerate(surfs):
+                strip.blit(surf, (i * cell_size + cell_size // 2 - surf.get_width() // 2, 0))
+        return self._store(key, strip)
+
+
+# shared by draw.py and menu.py
+text_cache = TextCache()
+
+
+def render_text(text, size, color, antialias=True):
+    """Cached font.render for the default system font."""
+    return text_cache.render(text, size, color, antialias)
@@ -0,0 +1,197 @@
+#################################################
+# tournament.py - round-robin between bots on  #
+# a process pool, results streamed to disk     #
+#################################################
+
+import csv
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from modules.elo import Ratings
+from modules.bot_process import load_bot
+from modules.opening_book import ensure_book
+from modules.players import uses_book
+from modules.simulation import ENGINES, play_game
+
+# Games of one pairing per task: enough to make loading the two players
+# negligible, few enough that results reach the file every few seconds
+CHUNK_SIZE = 250
+
+# Columns of the results file. bot1 and bot2 name the pairing in
+# schedule order, game numbers its games from 0, and player1 is the
+# bot that fired first. winner is empty when neither fleet was sunk.
+FIELDS = ("bot1", "bot2", "game", "player1", "winner", "shots")
+
+
+def pairings(bots):
+    return [(a, b) for i, a in enumerate(bots) for b in bots[i + 1:]]
+
+
+def schedule(bots, games, chunk_size=CHUNK_SIZE):
+    """
+    (bot1, bot2, chunk, first_game, n_games) for every chunk of every
+    pairing. Chunk by chunk across all pairings, so partial results
+    already rank every bot.
+    """
+    tasks = []
+    for chunk, first in enumerate(range(0, games, chunk_size)):
+        for bot1, bot2 in pairings(bots):
+            tasks.append((bot1, bot2, chunk, first, min(chunk_size, games - first)))
+    return tasks
+
+
+def _play_chunk(task):
+    """
+    Worker entry point: plays one chunk of a pairing with its own seeded
+    RNG stream, swapping who fires first every game.
+    """
+    seed, bot1, bot2, chunk, first, n_games, rows, cols, ships, engine_name, budget = task
+    rng = random.Random(f"{seed}:{bot1}:{bot2}:{chunk}")
+    players = {bot1: load_bot(bot1, budget), bot2: load_bot(bot2, budget)}
+    engine = ENGINES[engine_name]
+
+    results = []
+    try:
+        for game in range(first, first + n_games):
+            seats = (bot1, bot2) if game % 2 == 0 else (bot2, bot1)
+            winner, shots = play_game(players[seats[0]], players[seats[1]], rows, cols, ships, rng, engine)
+            results.append({
+                "bot1": bot1, "bot2": bot2, "game": game, "player1": seats[0],
+                "winner": seats[winner - 1] if winner else "", "shots": shots,
+            })
+    finally:
+        for player in players.values():
+            player.close()
+    return results
+
+
+class ResultLog:
+    """
+    Per-game results in a .csv or .jsonl file. Every finished chunk is
+    appended and synced straight away, so a crash loses at most the
+    chunks still being played; load() reads back what survived.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.csv = path.lower().endswith(".csv")
+        self.file = None
+        self.writer = None
+
+    def load(self):
+        """Every complete row in the file. A torn last line is cut off."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+        lines = data[:end].decode().splitlines()
+
+        if self.csv:
+            rows = list(csv.DictReader(lines))
+        else:
+            rows = [json.loads(line) for line in lines if line.strip()]
+        for row in rows:
+            row["game"] = int(row["game"])
+            row["shots"] = int(row["shots"])
+        return rows
+
+    def open(self):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, "a", newline="")
+        if self.csv:
+            self.writer = csv.DictWriter(self.file, FIELDS)
+            if new:
+                self.writer.writeheader()
+
+    def write(self, rows):
+        if self.csv:
+            self.writer.writerows(rows)
+        else:
+            self.file.writelines(json.dumps(row) + "\n" for row in rows)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def run_tournament(bots, games, rows, cols, ships, path, workers=None, seed=0,
+                   engine_name="bitboard", chunk_size=CHUNK_SIZE, budget=None, report=None, report_interval=30):
+    """
+    Play games games between every pair of bots across a process pool,
+    appending each game to the results file at path. Games already in
+    the file are not played again, so an interrupted tournament resumes
+    where it stopped when run again with the same arguments.
+    With a budget every bot runs in its own worker process and gets
+    budget milliseconds per shot (see bot_process.py). When a bot reads
+    the opening book it is built before any worker starts, as in
+    run_simulations.
+    report(ratings, played, total, games_per_second) is called every
+    report_interval seconds. Returns the Ratings over every game.
+    """
+    if len(set(bots)) != len(bots) or len(bots) < 2:
+        raise ValueError("a tournament needs at least two different bots")
+    workers = workers or os.cpu_count() or 1
+    if any(uses_book(bot) for bot in bots):
+        ensure_book(rows, cols, ships)
+
+    ratings = Ratings(bots)
+    log = ResultLog(path)
+    # one byte per scheduled game of each pairing, set once it is in the file
+    done = {pair: bytearray(games) for pair in pairings(bots)}
+    for row in log.load():
+        seen = done.get((row["bot1"], row["bot2"]))
+        if seen is not None and row["game"] < games and not seen[row["game"]]:
+            seen[row["game"]] = 1
+            ratings.add(row["bot1"], row["bot2"], row["winner"] or None)
+
+    tasks = []
+    total = 0
+    for bot1, bot2, chunk, first, n_games in schedule(bots, games, chunk_size):
+        total += n_games
+        if all(done[bot1, bot2][first:first + n_games]):
+            continue
+        tasks.append((seed, bot1, bot2, chunk, first, n_games, rows, cols, ships, engine_name, budget))
+    played = resumed = total - sum(task[5] for task in tasks)
+
+    start = time.perf_counter()
+    last_report = start
+    executor = None
+    log.open()
+    try:
+        if workers == 1:
+            results = map(_play_chunk, tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = (future.result() for future in
+                       as_completed([executor.submit(_play_chunk, task) for task in tasks]))
+
+        for chunk_results in results:
+            # a chunk cut short by a crash is played again in full, keep
+            # only the games that did not make it to the file
+            seen = done[chunk_results[0]["bot1"], chunk_results[0]["bot2"]]
+            new = [row for row in chunk_results if not seen[row["game"]]]
+            log.write(new)
+            for row in new:
+                seen[row["game"]] = 1
+                ratings.add(row["bot1"], row["bot2"], row["winner"] or None)
+            played += len(chunk_results)
+
+            now = time.perf_counter()
+            if report and now - last_report >= report_interval:
+                report(ratings, played, total, (played - resumed) / (now - start))
+                last_report = now
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        log.close()
+    return ratings
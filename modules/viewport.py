@@ -0,0 +1,198 @@
+#################################################
+# viewport.py - the part of a large board on   #
+# screen, with zoom, pan and a minimap         #
+#################################################
+
+import pygame
+
+from modules.draw import LABEL_GAP, MARGIN, compute_cell_size, compute_grid_origin
+
+# Cells are never shrunk below this to fit a big board on screen; the view
+# scrolls instead. Zooming out can still go down to the whole board.
+MIN_CELL_SIZE = 24
+MAX_CELL_SIZE = 96
+ZOOM_STEP = 1.25
+
+# Longest side of the minimap in pixels, and the gap kept around it
+MINIMAP_SIZE = 140
+MINIMAP_GAP = 15
+
+MINIMAP_WATER = (40, 70, 100)
+MINIMAP_FRAME = (255, 255, 0)
+
+ZOOM_IN_KEYS = (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS)
+ZOOM_OUT_KEYS = (pygame.K_MINUS, pygame.K_KP_MINUS)
+PAN_KEYS = {pygame.K_w: (-1, 0), pygame.K_s: (1, 0), pygame.K_a: (0, -1), pygame.K_d: (0, 1)}
+
+
+class Viewport:
+    """
+    Which cells of a rows x cols board are on screen and where.
+
+    Boards that fit at a readable cell size are shown whole, exactly as
+    before. Bigger boards show a window of the board that follows the
+    crosshair, can be zoomed and panned, and leave room on the right for
+    a minimap. Everything drawn per frame or per rebuild is sized by the
+    visible window, not by the board.
+    """
+
+    def __init__(self, rows, cols, width, height, instructions_height=60):
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.instructions_height = instructions_height
+
+        self.fit_size = compute_cell_size(rows, cols, width, height, instructions_height)
+        self.cell_size = max(self.fit_size, MIN_CELL_SIZE)
+        self.first_row = 0
+        self.first_col = 0
+        self._layout()
+
+    def _layout(self):
+        available_width = self.width - 2 * MARGIN
+        available_height = self.height - (self.instructions_height + LABEL_GAP + MARGIN)
+        self.visible_rows = min(self.rows, max(1, available_height // self.cell_size))
+        self.visible_cols = min(self.cols, max(1, available_width // self.cell_size))
+        if self.partial:
+            # leave the right-hand side to the minimap
+            available_width -= MINIMAP_SIZE + MINIMAP_GAP
+            self.visible_cols = min(self.cols, max(1, available_width // self.cell_size))
+        self.origin_x, self.origin_y = compute_grid_origin(
+            self.visible_rows, self.visible_cols, self.cell_size,
+            self.width - (MINIMAP_SIZE + MINIMAP_GAP if self.partial else 0),
+            self.height, self.instructions_height)
+        self._clamp()
+
+    def _clamp(self):
+        self.first_row = max(0, min(self.first_row, self.rows - self.visible_rows))
+        self.first_col = max(0, min(self.first_col, self.cols - self.visible_cols))
+
+    @property
+    def partial(self):
+        """True when some of the board is off screen."""
+        return self.visible_rows < self.rows or self.visible_cols < self.cols
+
+    def key(self):
+        """Changes whenever the static layer has to be redrawn."""
+        return (self.cell_size, self.first_row, self.first_col, self.visible_rows, self.visible_cols)
+
+    # ------------------------------
+    # Moving the view
+    # ------------------------------
+    def center_on(self, row, col):
+        self.first_row = row - self.visible_rows // 2
+        self.first_col = col - self.visible_cols // 2
+        self._clamp()
+
+    def pan(self, rows, cols):
+        self.first_row += rows
+        self.first_col += cols
+        self._clamp()
+
+    def zoom(self, steps, row, col):
+        """
+        Zoom in (steps > 0) or out around the cell at (row, col), between
+        the whole board and MAX_CELL_SIZE.
+        """
+        size = int(round(self.cell_size * ZOOM_STEP ** steps))
+        if size == self.cell_size:
+            # tiny cells would round back to the same size
+            size += 1 if steps > 0 else -1
+        lowest = min(self.fit_size, self.cell_size)
+        highest = max(MAX_CELL_SIZE, self.fit_size)
+        self.cell_size = max(lowest, min(highest, size))
+        self._layout()
+        self.center_on(row, col)
+
+    def handle_event(self, event, row, col):
+        """
+        Zoom on +/- or the mouse wheel around the crosshair at (row, col),
+        and pan half a screen on W/A/S/D. Returns True if the event was used.
+        """
+        if event.type == pygame.MOUSEWHEEL and event.y:
+            self.zoom(1 if event.y > 0 else -1, row, col)
+            return True
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key in ZOOM_IN_KEYS:
+            self.zoom(1, row, col)
+        elif event.key in ZOOM_OUT_KEYS:
+            self.zoom(-1, row, col)
+        elif event.key in PAN_KEYS:
+            drow, dcol = PAN_KEYS[event.key]
+            self.pan(drow * max(1, self.visible_rows // 2), dcol * max(1, self.visible_cols // 2))
+        else:
+            return False
+        return True
+
+    # ------------------------------
+    # Geometry
+    # ------------------------------
+    def in_view(self, row, col):
+        return (self.first_row <= row < self.first_row + self.visible_rows
+                and self.first_col <= col < self.first_col + self.visible_cols)
+
+    def cell_rect(self, row, col):
+        return pygame.Rect(self.origin_x + (col - self.first_col) * self.cell_size,
+                           self.origin_y + (row - self.first_row) * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def renderer(self, screen):
+        """A BoardRenderer for the cells currently in view."""
+        from modules.board_renderer import BoardRenderer
+        return BoardRenderer(screen, self.visible_rows, self.visible_cols, self.cell_size,
+                             self.origin_x, self.origin_y, self.first_row, self.first_col)
+
+
+class Minimap:
+    """
+    The whole board scaled into a corner, with the visible window
+    outlined. The surface is the minimap's on-screen size whatever the
+    board size, so on huge boards many cells share a pixel. Cells are
+    colored one at a time as ships are placed or shots land, so keeping
+    it current costs nothing per frame.
+    """
+
+    def __init__(self, rows, cols, size=MINIMAP_SIZE):
+        self.rows = rows
+        self.cols = cols
+        scale = size / max(rows, cols)
+        self.size = (max(1, int(cols * scale)), max(1, int(rows * scale)))
+        self.cells = pygame.Surface(self.size)
+        self.cells.fill(MINIMAP_WATER)
+        # pixels showing a ship or a hit, which a miss may not cover
+        self._strong = set()
+
+    def set_cell(self, row, col, color, weak=False):
+        """
+        Color the pixels of a cell. A weak color (a miss) does not paint
+        over a pixel a strong one (a ship or a hit) shares with it.
+        """
+        width, height = self.size
+        x, y = col * width // self.cols, row * height // self.rows
+        if weak and (x, y) in self._strong:
+            return
+        if not weak and (width < self.cols or height < self.rows):
+            self._strong.add((x, y))
+        self.cells.fill(color, (x, y, max(1, (col + 1) * width // self.cols - x),
+                                max(1, (row + 1) * height // self.rows - y)))
+
+    def rect(self, screen):
+        """Where the minimap goes: the bottom-right corner of the screen."""
+        return pygame.Rect(screen.get_width() - MARGIN // 2 - self.size[0],
+                           screen.get_height() - MARGIN // 2 - self.size[1],
+                           *self.size)
+
+    def draw(self, screen, viewport):
+        """Draw the minimap and the view outline, returning the rect drawn."""
+        rect = self.rect(screen)
+        screen.blit(self.cells, rect)
+
+        sx = self.size[0] / self.cols
+        sy = self.size[1] / self.rows
+        view = pygame.Rect(rect.x + int(viewport.first_col * sx), rect.y + int(viewport.first_row * sy),
+                           max(2, int(viewport.visible_cols * sx)), max(2, int(viewport.visible_rows * sy)))
+        pygame.draw.rect(screen, MINIMAP_FRAME, view, 1)
+        pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+        return rect
@@ -0,0 +1,56 @@
+#################################################
+# opening_book.py - precomputes the opening    #
+# book for a settings file. No pygame.         #
+#################################################
+
+import argparse
+import time
+
+from modules.file_handling import load_settings
+from modules.opening_book import MAX_OPENING, SAMPLES, book_path, ensure_book
+
+# Heatmap shades from least to most likely to hold a ship
+SHADES = " .:-=+*#%@"
+
+
+def print_book(book):
+    top = float(book.prior.max()) or 1.0
+    order = {int(cell): k for k, cell in enumerate(book.opening)}
+    for r in range(book.rows):
+        line = []
+        for c in range(book.cols):
+            cell = r * book.cols + c
+            if cell in order:
+                # opening shots by their position in the book
+                line.append(f"{order[cell] + 1:>3}")
+            else:
+                shade = SHADES[int(book.prior[cell] / top * (len(SHADES) - 1))]
+                line.append(f"{shade * 2:>3}")
+        print("".join(line))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the opening shots and prior heatmap bots use for a board and fleet.")
+    parser.add_argument("--settings", default="settings.json", help="settings file to load")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="random fleets the prior is estimated from")
+    parser.add_argument("--shots", type=int, default=MAX_OPENING, help="longest opening to store")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rebuild", action="store_true", help="replace a book that is already cached")
+    parser.add_argument("--show", action="store_true", help="print the heatmap with the opening shots numbered")
+    args = parser.parse_args()
+
+    rows, cols, ships = load_settings(args.settings)
+    start = time.perf_counter()
+    book = ensure_book(rows, cols, ships, rebuild=args.rebuild,
+                       samples=args.samples, max_opening=args.shots, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{rows}x{cols} book from {book.samples} fleets, {len(book.opening)} opening shots "
+          f"in {elapsed:.2f}s: {book_path(rows, cols, ships)}")
+    if args.show:
+        print_book(book)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#################################################
+# replay.py - inspect recorded games. Prints   #
+# a game's summary and both boards at a turn.  #
+#################################################
+
+import argparse
+
+from modules.game_record import GameRecord
+
+
+def board_text(hits, ships):
+    """Text view of a hit grid over the defender's fleet."""
+    lines = []
+    for hit_row, ship_row in zip(hits, ships):
+        lines.append(" ".join(hit if hit != "~" else ship.lower() if ship != "~" else "." for hit, ship in
+                              zip(hit_row, ship_row)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show a recorded Battleship game.")
+    parser.add_argument("record", help="a .bsr game record")
+    parser.add_argument("--turn", type=int, default=None, help="show the boards after this many shots (default: the end)")
+    parser.add_argument("--moves", action="store_true", help="list every shot")
+    args = parser.parse_args()
+
+    with GameRecord(args.record) as record:
+        print(f"{record.rows}x{record.cols} board, {len(record)} shots, "
+              f"snapshot every {record.snapshot_interval} shots")
+        print("ships: " + ", ".join(f"{count} {name}" for name, count in record.ships.items()))
+
+        if args.moves:
+            for shot in record.moves():
+                print(f"{shot.turn:6d}  player {shot.attacker}  {shot.row:4d} {shot.col:4d}  {shot.result}")
+
+        turn = len(record) if args.turn is None else args.turn
+        manager, next_player = record.state_at(turn)
+        winner = manager.check_win()
+        print(f"\nafter {min(turn, len(record))} shots: "
+              + (f"Player {winner} has won" if winner else f"Player {next_player} to fire"))
+        for attacker, defender in ((1, 2), (2, 1)):
+            print(f"\nPlayer {attacker}'s shots at Player {defender} "
+                  f"(sunk: {', '.join(manager.sunk_ships[defender]) or 'none'})")
+            print(board_text(manager.player_hits[attacker], record.fleet(defender)))
+
+
+if __name__ == "__main__":
+    main()
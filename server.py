@@ -0,0 +1,42 @@
+#################################################
+# server.py - hosts networked matches. Clients #
+# connect with 'python main.py --connect'.     #
+#################################################
+
+import argparse
+import asyncio
+import os
+
+from modules.file_handling import load_settings
+from modules.protocol import DEFAULT_HOST, DEFAULT_PORT
+from modules.server import GameServer
+from modules.spectators import HIGH_WATER, TICK
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Battleship matches over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (0.0.0.0 for the whole LAN)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--settings", default="settings.json", help="board and fleet every match is played with")
+    parser.add_argument("--record", metavar="DIR", help="write every match to DIR as a game record")
+    parser.add_argument("--status", type=float, default=10, metavar="SECONDS",
+                        help="print a status line this often (0 to disable)")
+    parser.add_argument("--tick", type=int, default=TICK, metavar="MS",
+                        help="how often shots are sent to spectators")
+    parser.add_argument("--spectator-buffer", type=int, default=HIGH_WATER, metavar="BYTES",
+                        help="unsent bytes after which a spectator is resynced instead of sent deltas")
+    args = parser.parse_args()
+
+    rows, cols, ships = load_settings(args.settings)
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+
+    server = GameServer(rows, cols, ships, record_dir=args.record, spectator_buffer=args.spectator_buffer)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.status, args.tick))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
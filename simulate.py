@@ -0,0 +1,58 @@
+#################################################
+# simulate.py - headless batch runner. Plays   #
+# games between automated players, no pygame.  #
+#################################################
+
+import argparse
+
+from modules.file_handling import load_settings
+from modules.players import PLAYERS, split_spec
+from modules.simulation import ENGINES, run_batched, run_simulations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Battleship simulations.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the per-worker RNG streams")
+    parser.add_argument("--settings", default="settings.json", help="settings file to load")
+    strategies = f"{', '.join(sorted(PLAYERS))}, module:Class or bot.py:Class, optionally with :key=value,... options"
+    parser.add_argument("--p1", default="hunt", help=f"player 1 strategy: {strategies}")
+    parser.add_argument("--p2", default="hunt", help=f"player 2 strategy: {strategies}")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="bitboard", help="rules engine")
+    parser.add_argument("--record", metavar="DIR", help="write every game to DIR as a game record")
+    parser.add_argument("--budget", type=int, metavar="MS",
+                        help="run each player in its own process with MS milliseconds per shot")
+    parser.add_argument("--batch", action="store_true",
+                        help="play random vs random games as one vectorized NumPy batch")
+    args = parser.parse_args()
+    for spec in (args.p1, args.p2):
+        try:
+            split_spec(spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    rows, cols, ships = load_settings(args.settings)
+
+    if args.batch:
+        args.p1 = args.p2 = "random"
+        summary = run_batched(args.games, rows, cols, ships, seed=args.seed)
+    else:
+        summary = run_simulations(
+            args.games, rows, cols, ships,
+            p1_name=args.p1, p2_name=args.p2,
+            workers=args.workers, seed=args.seed, engine_name=args.engine,
+            record_dir=args.record, budget=args.budget
+        )
+
+    print(f"Played {summary['games']} games in {summary['seconds']:.2f}s "
+          f"({summary['games_per_second']:.1f} games/second)")
+    print(f"Player 1 ({args.p1}) wins: {summary['player1_wins']}")
+    print(f"Player 2 ({args.p2}) wins: {summary['player2_wins']}")
+    if summary["unfinished"]:
+        print(f"Unfinished games: {summary['unfinished']}")
+    print(f"Average shots per game: {summary['shots'] / summary['games']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pytest.importorskip("pygame")
+
+from modules.assets import AssetManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def assets(monkeypatch):
+    # asset paths are relative to the repository root, like the game's
+    monkeypatch.chdir(ROOT)
+    return AssetManager()
+
+
+def test_derived_surfaces_are_cached(assets):
+    first = assets.get("smoke", (30, 30), cell=True)
+    assert assets.get("smoke", (30, 30), cell=True) is first
+    assert first.get_size() == (30, 30)
+    assert assets.decoded == 1 and assets.derived_created == 1
+
+
+def test_cell_size_change_keeps_the_other_surfaces(assets):
+    assets.set_cell_size(30)
+    logo = assets.get("logo", (600, 99), smooth=True)
+    smoke = assets.get("smoke", (30, 30), cell=True)
+    plane = assets.get("plane", (21, 21), angle=45, cell=True)
+
+    assets.set_cell_size(30)
+    assert assets.get("smoke", (30, 30), cell=True) is smoke
+
+    assets.set_cell_size(40)
+    assert assets.get("logo", (600, 99), smooth=True) is logo
+    assert assets.get("smoke", (30, 30), cell=True) is not smoke
+    assert assets.get("plane", (21, 21), angle=45, cell=True) is not plane
+
+
+def test_eviction_forgets_cell_keys(assets):
+    assets.max_derived = 2
+    for size in (10, 11, 12):
+        assets.get("smoke", (size, size), cell=True)
+    assert len(assets._derived) == 2 and len(assets._cell_keys) == 2
@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+import pytest
+
+from modules.batch_state import FINISHED, HIT, MISS, REPEAT, SHIP_NAMES, SUNK, BatchGameState
+from modules.boat_management import SHIP_TYPES, BoatManager
+from modules.players import random_placement
+
+GAMES = 30
+
+
+def random_fleet(rng, repeats=False):
+    """Some of the ship types, one each unless repeats is set."""
+    names = [name for name in SHIP_TYPES if rng.random() < 0.7] or ["destroyer"]
+    return {name: rng.randint(1, 3) if repeats else 1 for name in names}
+
+
+def code_for(result):
+    """The step code for a fire_at result."""
+    if result.startswith("sunk:"):
+        return SUNK
+    return {"hit": HIT, "miss": MISS, "repeat": REPEAT}[result]
+
+
+def outcome(code, sunk):
+    """A step code, with sinking counted as a plain hit unless sunk is set."""
+    return HIT if code == SUNK and not sunk else code
+
+
+def play_batch(rows, cols, ships, seed, sunk=True):
+    """
+    Play GAMES random games at once in a BatchGameState and one BoatManager
+    per game, checking every result, hit grid, sunk ship and winner. Shots
+    are mostly fresh cells from random_targets, with repeats mixed in.
+    """
+    rng = random.Random(seed)
+    boards = [[random_placement(rows, cols, ships, rng) for _ in range(2)] for _ in range(GAMES)]
+    batch = BatchGameState.from_boards(rows, cols, boards)
+    managers = []
+    for pair in boards:
+        manager = BoatManager(rows, cols, ships)
+        for player, board in enumerate(pair, 1):
+            manager.set_player_ships(player, [row[:] for row in board])
+        managers.append(manager)
+
+    turns = [1] * GAMES
+    targets = np.random.default_rng(seed)
+    while not batch.check_win().all():
+        target_rows, target_cols = batch.random_targets(targets)
+        for game in range(GAMES):
+            if rng.random() < 0.2:
+                target_rows[game], target_cols[game] = rng.randrange(rows), rng.randrange(cols)
+        codes = batch.step(target_rows, target_cols)
+
+        for game, manager in enumerate(managers):
+            if manager.check_win():
+                assert codes[game] == FINISHED
+                continue
+            turn = turns[game]
+            row, col = int(target_rows[game]), int(target_cols[game])
+            result = manager.fire_at(turn, 3 - turn, row, col)
+            assert outcome(codes[game], sunk) == outcome(code_for(result), sunk), (game, turn, row, col)
+            if sunk and codes[game] == SUNK:
+                assert SHIP_NAMES[batch.last_sunk[game]] == result[len("sunk:"):]
+            assert batch.player_hits(game, turn) == manager.player_hits[turn]
+            assert batch.check_win()[game] == (manager.check_win() or 0)
+            if result == "miss":
+                turns[game] = 3 - turn
+
+    assert all(manager.check_win() for manager in managers)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_boat_manager(seed):
+    rng = random.Random(seed)
+    play_batch(rng.randint(6, 12), rng.randint(6, 12), random_fleet(rng), seed)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_repeated_ship_types_match_boat_manager(seed):
+    # BoatManager tracks one ship per type, so sinking is compared as a plain hit
+    rng = random.Random(seed)
+    play_batch(rng.randint(8, 12), rng.randint(8, 12), random_fleet(rng, repeats=True), seed, sunk=False)
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from modules.bitboard import BitboardBoatManager
+from modules.boat_management import SHIP_TYPES, BoatManager
+from modules.players import random_placement
+
+
+def random_fleet(rng, repeats=False):
+    """Some of the ship types, one each unless repeats is set."""
+    names = [name for name in SHIP_TYPES if rng.random() < 0.7] or ["destroyer"]
+    return {name: rng.randint(1, 3) if repeats else 1 for name in names}
+
+
+def setup(engine, rows, cols, ships, boards):
+    manager = engine(rows, cols, ships)
+    for player, board in enumerate(boards, 1):
+        manager.set_player_ships(player, [row[:] for row in board])
+    return manager
+
+
+def grid(hits):
+    return [list(row) for row in hits]
+
+
+def outcome(result, sunk):
+    """The fire_at result, with sinking counted as a plain hit unless sunk is set."""
+    return result if sunk or not result.startswith("sunk:") else "hit"
+
+
+def play_both(reference, other, rows, cols, rng, sunk=True):
+    """
+    Fire the same random shots, repeats included, at both engines until
+    the reference has a winner, checking every result, hit grid, sunk list
+    and winner on the way. A miss passes the turn, like firing_phase.
+    sunk=False leaves the sunk ships out, for fleets with repeated types
+    that BoatManager cannot tell apart.
+    """
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+    turn = 1
+    while reference.check_win() is None:
+        row, col = rng.choice(cells)
+        expected = reference.fire_at(turn, 3 - turn, row, col)
+        result = other.fire_at(turn, 3 - turn, row, col)
+        assert outcome(result, sunk) == outcome(expected, sunk), (turn, row, col)
+        if sunk:
+            assert other.sunk_ships == reference.sunk_ships
+        assert grid(other.player_hits[turn]) == grid(reference.player_hits[turn])
+        assert other.check_win() == reference.check_win()
+        if expected == "miss":
+            turn = 3 - turn
+    return reference.check_win()
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_boat_manager(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(6, 14), rng.randint(6, 14)
+    ships = random_fleet(rng)
+    boards = [random_placement(rows, cols, ships, rng) for _ in range(2)]
+    winner = play_both(setup(BoatManager, rows, cols, ships, boards),
+                       setup(BitboardBoatManager, rows, cols, ships, boards), rows, cols, rng)
+    assert winner in (1, 2)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_repeated_ship_types_match_boat_manager(seed):
+    # BoatManager tracks one ship per type, so only hits and the winner are compared
+    rng = random.Random(seed)
+    rows, cols = rng.randint(8, 14), rng.randint(8, 14)
+    ships = random_fleet(rng, repeats=True)
+    boards = [random_placement(rows, cols, ships, rng) for _ in range(2)]
+    winner = play_both(setup(BoatManager, rows, cols, ships, boards),
+                       setup(BitboardBoatManager, rows, cols, ships, boards), rows, cols, rng, sunk=False)
+    assert winner in (1, 2)
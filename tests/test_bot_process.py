@@ -0,0 +1,130 @@
+import random
+import textwrap
+import time
+
+import pytest
+
+from modules.bot_process import ProcessPlayer, valid_board
+from modules.players import random_placement
+from modules.simulation import play_game
+from modules.players import HuntTargetPlayer
+
+SHIPS = {"carrier": 1, "battleship": 1, "cruiser": 1, "submarine": 1, "destroyer": 1}
+
+BOTS = '''
+import gc
+import os
+import pickle
+from multiprocessing.connection import Connection
+
+from modules.players import HuntTargetPlayer
+
+
+def worker_conn():
+    return [o for o in gc.get_objects() if isinstance(o, Connection)][0]
+
+
+class Exploit:
+    def __reduce__(self):
+        return (os.system, ("touch " + {marker!r},))
+
+
+class Pickler(HuntTargetPlayer):
+    """Answers with a pickle that runs a command when it is loaded."""
+
+    def choose_shot(self):
+        worker_conn().send_bytes(pickle.dumps([1, "choose_shot", Exploit()]))
+        return super().choose_shot()
+
+
+class Garbage(HuntTargetPlayer):
+    """Sends malformed answers before the real one."""
+
+    def choose_shot(self):
+        worker_conn().send_bytes(b"not json")
+        worker_conn().send_bytes(b'{{"id": 1}}')
+        return super().choose_shot()
+
+
+class Shapes(HuntTargetPlayer):
+    """A fleet that is not a grid, and NumPy-free but odd shots."""
+
+    def place_ships(self):
+        return {{"0": "C"}}
+
+    def choose_shot(self):
+        return [True, "1"]
+'''
+
+
+@pytest.fixture
+def bots(tmp_path):
+    marker = tmp_path / "pwned"
+    path = tmp_path / "hostile.py"
+    path.write_text(textwrap.dedent(BOTS.format(marker=str(marker))))
+    return path, marker
+
+
+def play(spec):
+    bot = ProcessPlayer(spec, move_budget=500)
+    try:
+        play_game(bot, HuntTargetPlayer(), 10, 10, SHIPS, random.Random(0))
+        return bot
+    finally:
+        bot.close()
+
+
+def test_a_pickled_answer_is_never_loaded(bots):
+    path, marker = bots
+    bot = play(f"{path}:Pickler")
+    assert not marker.exists()
+    assert bot.defaults > 0
+
+
+def test_malformed_answers_become_default_moves(bots):
+    path, _ = bots
+    bot = play(f"{path}:Garbage")
+    assert bot.defaults > 0 and bot.moves > bot.defaults
+
+
+def test_answers_of_the_wrong_type_become_default_moves(bots):
+    path, _ = bots
+    bot = play(f"{path}:Shapes")
+    assert bot.defaults == bot.moves
+
+
+def test_an_honest_bot_plays_every_move():
+    bot = play("hunt")
+    assert bot.defaults == 0 and bot.moves > 17
+
+
+def test_starting_does_not_block():
+    start = time.perf_counter()
+    bot = ProcessPlayer("hunt")
+    try:
+        assert time.perf_counter() - start < 0.5
+        assert bot.starting
+        bot.new_game(10, 10, SHIPS, random.Random(0))
+        bot.ask_placement()
+        assert valid_board(bot.poll_placement(block=True), 10, 10, SHIPS)
+        assert not bot.starting
+    finally:
+        bot.close()
+
+
+def test_a_bot_that_cannot_load_gets_default_moves():
+    bot = ProcessPlayer("modules.players:NoSuchPlayer")
+    try:
+        bot.new_game(10, 10, SHIPS, random.Random(0))
+        assert valid_board(bot.place_ships(), 10, 10, SHIPS)
+        assert not bot.alive
+    finally:
+        bot.close()
+
+
+def test_valid_board_rejects_non_grids():
+    board = random_placement(10, 10, SHIPS, random.Random(0))
+    assert valid_board(board, 10, 10, SHIPS)
+    assert not valid_board({0: board[0]}, 10, 10, SHIPS)
+    assert not valid_board([row[:] for row in board[:9]] + [[1] * 10], 10, 10, SHIPS)
+    assert not valid_board("~" * 100, 10, 10, SHIPS)
@@ -0,0 +1,71 @@
+from itertools import combinations_with_replacement
+
+import pytest
+
+from modules.file_handling import FEASIBLE, INFEASIBLE, can_place_all_ships, check_feasibility
+
+
+def brute_force(rows, cols, ship_lengths):
+    """Try every placement of every ship, longest first, on a cell bitmask."""
+    placements = {}
+    for length in set(ship_lengths):
+        masks = set()
+        for r in range(rows):
+            for c in range(cols):
+                if c + length <= cols:
+                    masks.add(sum(1 << (r * cols + c + i) for i in range(length)))
+                if r + length <= rows:
+                    masks.add(sum(1 << ((r + i) * cols + c) for i in range(length)))
+        placements[length] = sorted(masks)
+
+    lengths = sorted(ship_lengths, reverse=True)
+
+    def place(index, used, previous):
+        if index == len(lengths):
+            return True
+        length = lengths[index]
+        # identical ships go in increasing mask order so each set is tried once
+        start = previous if index and lengths[index - 1] == length else -1
+        return any(place(index + 1, used | mask, mask)
+                   for mask in placements[length] if mask > start and not used & mask)
+
+    return place(0, 0, -1)
+
+
+def fleets(rows, cols, slack):
+    """Every fleet of ships 2 or more long covering at least area - slack cells."""
+    area = rows * cols
+    for count in range(1, area // 2 + 1):
+        for lengths in combinations_with_replacement(range(2, max(rows, cols) + 1), count):
+            if area - slack <= sum(lengths) <= area:
+                yield list(lengths)
+
+
+# small boards get every fleet, bigger ones the nearly full fleets where
+# the shapes decide whether it fits
+BOARDS = [(rows, cols, rows * cols) for rows in range(1, 5) for cols in range(rows, 6)]
+BOARDS += [(3, 7, 3), (4, 6, 3), (5, 5, 3), (5, 6, 3)]
+
+
+@pytest.mark.parametrize("rows, cols, slack", BOARDS)
+def test_matches_brute_force(rows, cols, slack):
+    for ship_lengths in fleets(rows, cols, slack):
+        expected = FEASIBLE if brute_force(rows, cols, ship_lengths) else INFEASIBLE
+        assert check_feasibility(rows, cols, ship_lengths, time_budget=10) == expected, ship_lengths
+        # the board may be given either way round
+        assert check_feasibility(cols, rows, ship_lengths[::-1], time_budget=10) == expected, ship_lengths
+
+
+@pytest.mark.parametrize("rows, cols, ship_lengths, expected", [
+    (10, 10, [5, 4, 3, 3, 2], True),
+    (5, 5, [5, 5, 5, 5, 5], True),
+    (5, 5, [5, 5, 5, 5, 4, 2], False),
+    (3, 3, [2, 2, 2, 2], True),
+    (3, 3, [3, 3, 2, 1], True),
+    (3, 3, [2, 2, 2, 2, 1], True),
+    (2, 2, [3], False),
+    (1, 1, [], True),
+])
+def test_tight_fleets(rows, cols, ship_lengths, expected):
+    assert brute_force(rows, cols, ship_lengths) == expected
+    assert can_place_all_ships(rows, cols, ship_lengths, time_budget=10) == expected
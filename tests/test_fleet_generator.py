@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from modules.fleet_generator import FleetGenerator
+
+CLASSIC = {"carrier": 1, "battleship": 1, "cruiser": 1, "submarine": 1, "destroyer": 1}
+
+
+@pytest.mark.parametrize("uniform", [False, True])
+def test_draws_a_fleet_without_overlaps(uniform):
+    board = FleetGenerator(10, 10, CLASSIC).random_board(random.Random(0), uniform)
+    assert sum(cell != "~" for row in board for cell in row) == 17
+
+
+@pytest.mark.parametrize("uniform", [False, True])
+@pytest.mark.parametrize("rows, cols, ships", [
+    (3, 3, {"carrier": 1}),                                 # longer than the board
+    (5, 5, {"carrier": 3, "battleship": 3}),                # more ship cells than cells
+    (6, 6, {"carrier": 1, "battleship": 7, "cruiser": 1}),  # fits by area, not by shape
+])
+def test_infeasible_fleet_raises(rows, cols, ships, uniform):
+    with pytest.raises(ValueError, match=f"cannot place .* on a {rows}x{cols} board"):
+        FleetGenerator(rows, cols, ships).random_placements(random.Random(0), uniform)
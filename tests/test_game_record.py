@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from modules.bitboard import BitboardBoatManager
+from modules.boat_management import BoatManager
+from modules.game_record import GameRecord, GameWriter, open_recorder
+from modules.players import HuntTargetPlayer, RandomPlayer, random_placement
+from modules.simulation import play_game
+from modules.sparse_board import SparseBoatManager
+
+SHIPS = {"carrier": 1, "battleship": 1, "cruiser": 2, "submarine": 1, "destroyer": 2}
+# BoatManager tracks one ship per type, so it replays a fleet without repeats
+CLASSIC = {"carrier": 1, "battleship": 1, "cruiser": 1, "submarine": 1, "destroyer": 1}
+ENGINES = [(BoatManager, CLASSIC), (BitboardBoatManager, SHIPS), (SparseBoatManager, SHIPS)]
+
+
+def play_recorded(path, ships):
+    return play_game(RandomPlayer(), HuntTargetPlayer(), 20, 20, ships, random.Random(3), record_path=path)
+
+
+@pytest.fixture(scope="module")
+def record(tmp_path_factory):
+    path = tmp_path_factory.mktemp("records") / "game.bsr"
+    winner, shots = play_recorded(path, SHIPS)
+    with GameRecord(path) as game:
+        yield game, winner, shots
+
+
+def replay(game, turn, engine):
+    """The state after turn shots, fired one by one from the start."""
+    manager = engine(game.rows, game.cols, game.ships)
+    for player in (1, 2):
+        manager.set_player_ships(player, game.fleet(player))
+    next_player = 1
+    for shot in game.moves(0, turn):
+        manager.fire_at(shot.attacker, 3 - shot.attacker, shot.row, shot.col)
+        next_player = 3 - shot.attacker if shot.result == "miss" else shot.attacker
+    return manager, next_player
+
+
+def fired_cells(manager, player):
+    hits = manager.player_hits[player]
+    return {(r, c): hits[r][c] for r in range(manager.rows) for c in range(manager.cols) if hits[r][c] != "~"}
+
+
+def test_header_and_shots(record):
+    game, winner, shots = record
+    assert (game.rows, game.cols, game.ships) == (20, 20, SHIPS)
+    assert len(game) == shots > game.snapshot_interval
+    assert [shot.turn for shot in game] == list(range(shots))
+    assert game.shot(shots - 1).result.startswith("sunk:")
+    assert game.winner() == winner
+    with pytest.raises(IndexError):
+        game.shot(shots)
+
+
+def test_fleets_round_trip(tmp_path):
+    rng = random.Random(8)
+    boards = [random_placement(15, 12, SHIPS, rng) for _ in range(2)]
+    path = tmp_path / "fleets.bsr"
+    with GameWriter(path, 15, 12, SHIPS, *boards):
+        pass
+    with GameRecord(path) as game:
+        assert len(game) == 0
+        assert [game.fleet(1), game.fleet(2)] == boards
+
+
+@pytest.mark.parametrize("engine, ships", ENGINES)
+def test_state_at_matches_a_full_replay(tmp_path, engine, ships):
+    path = tmp_path / "game.bsr"
+    winner, shots = play_recorded(path, ships)
+    game = GameRecord(path)
+    interval = game.snapshot_interval
+    assert shots > 2 * interval
+    for turn in (0, 1, interval - 1, interval, interval + 1, 2 * interval, shots // 2, shots - 1, shots):
+        restored, next_player = game.state_at(turn, engine)
+        expected, expected_next = replay(game, turn, engine)
+        assert next_player == expected_next
+        assert restored.sunk_ships == expected.sunk_ships
+        assert restored.check_win() == expected.check_win()
+        for player in (1, 2):
+            assert fired_cells(restored, player) == fired_cells(expected, player)
+        # the game carries on from the restored state as from the replayed one
+        for shot in game.moves(turn, turn + interval):
+            args = shot.attacker, 3 - shot.attacker, shot.row, shot.col
+            assert restored.fire_at(*args) == expected.fire_at(*args)
+    game.close()
+
+
+def test_truncated_record_keeps_complete_shots(record, tmp_path):
+    game, winner, shots = record
+    data = open(game.path, "rb").read()
+    path = tmp_path / "cut.bsr"
+    path.write_bytes(data[:-2])
+    with GameRecord(path) as cut:
+        assert len(cut) == shots - 1
+        assert cut.winner() is None
+
+
+def test_open_recorder_gives_up_on_an_unusable_directory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    board = random_placement(10, 10, SHIPS, random.Random(1))
+    assert open_recorder(10, 10, SHIPS, board, board, record_dir=blocker / "records") is None
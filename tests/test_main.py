@@ -0,0 +1,34 @@
+import pytest
+
+from main import parse_args
+
+
+def test_defaults_play_locally_and_record():
+    args = parse_args([])
+    assert args.connect is None and args.p1 is None and args.p2 is None
+    assert args.budget is None and not args.no_record and args.profile is None
+
+
+def test_options():
+    args = parse_args(["--p2", "montecarlo:samples=50", "--budget", "200", "--no-record", "--profile"])
+    assert args.p2 == "montecarlo:samples=50"
+    assert args.budget == 200
+    assert args.no_record
+    assert args.profile == "profile.json"
+    assert parse_args(["--profile", "trace.csv"]).profile == "trace.csv"
+    args = parse_args(["--connect", "localhost:5000", "--match", "friday"])
+    assert (args.connect, args.match) == ("localhost:5000", "friday")
+
+
+@pytest.mark.parametrize("argv", [
+    ["--connect", "localhost:port"],
+    ["--match", "friday"],
+    ["--budget", "0"],
+    ["--budget", "soon"],
+    ["--p1", "montecarlo:samples=5,=3"],
+    ["--p3", "hunt"],
+])
+def test_bad_options_exit(argv, capsys):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+    assert "error" in capsys.readouterr().err
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from modules.opening_book import OpeningBook, build_book, ensure_book, placement_heat, ship_lengths
+from modules.targeting import HeatmapPlayer, placement_table
+
+SHIPS = {"carrier": 1, "battleship": 1, "cruiser": 2, "destroyer": 1}
+
+
+@pytest.mark.parametrize("rows, cols", [(10, 10), (4, 9), (7, 3), (1, 6), (5, 1)])
+def test_placement_heat_counts_every_placement(rows, cols):
+    lengths = [length for length in ship_lengths(SHIPS) if length <= max(rows, cols)]
+    heat = np.zeros(rows * cols, dtype=np.int64)
+    for length in lengths:
+        np.add.at(heat, placement_table(rows, cols, length).cells.ravel(), 1)
+    assert (placement_heat(rows, cols, lengths) == heat).all()
+
+
+def test_book_round_trip(tmp_path):
+    book = build_book(8, 9, SHIPS, samples=2000, seed=1)
+    path = tmp_path / "book"
+    book.write(path)
+    loaded = OpeningBook.load(path, 8, 9)
+    assert loaded.samples == book.samples
+    for name in ("prior", "heat", "opening"):
+        assert (getattr(loaded, name) == getattr(book, name)).all()
+    assert OpeningBook.load(path, 9, 8) is None
+
+
+def test_heatmap_player_starts_from_the_book(tmp_path, monkeypatch):
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    book = ensure_book(10, 10, SHIPS, samples=2000)
+    with_book, without = HeatmapPlayer(), HeatmapPlayer(book=False)
+    with_book.new_game(10, 10, SHIPS, random.Random(0))
+    without.new_game(10, 10, SHIPS, random.Random(0))
+    assert (with_book.heat == without.heat).all()
+    assert with_book.prior is not None and without.prior is None
+    # the first shot is the book's
+    assert with_book.choose_shot() == divmod(int(book.opening[0]), 10)
+
+
+@pytest.mark.parametrize("p1, p2, built", [
+    ("hunt", "random", False),
+    ("hunt", "heatmap:book=false", False),
+    ("hunt", "heatmap", True),
+])
+def test_simulations_build_the_book_only_for_players_that_read_it(tmp_path, monkeypatch, p1, p2, built):
+    from modules.simulation import run_simulations
+
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    run_simulations(2, 6, 6, SHIPS, p1, p2, workers=1)
+    assert any(tmp_path.iterdir()) == built
@@ -0,0 +1,33 @@
+import pytest
+
+from modules.players import HuntTargetPlayer, load_player, split_spec, uses_book
+
+
+def test_split_spec():
+    assert split_spec("hunt") == ("hunt", {})
+    assert split_spec("bots/mine.py:Bot") == ("bots/mine.py:Bot", {})
+    assert split_spec("montecarlo:samples=500,budget_ms=2.5,book=false,label=x") == \
+        ("montecarlo", {"samples": 500, "budget_ms": 2.5, "book": False, "label": "x"})
+    assert split_spec("modules.players:RandomPlayer:seed=none") == ("modules.players:RandomPlayer", {"seed": None})
+
+
+def test_split_spec_rejects_bad_options():
+    with pytest.raises(ValueError):
+        split_spec("montecarlo:samples=500,fast")
+    with pytest.raises(ValueError):
+        split_spec("montecarlo:=5")
+
+
+def test_load_player_passes_options():
+    assert isinstance(load_player("hunt"), HuntTargetPlayer)
+    pytest.importorskip("numpy")
+    player = load_player("montecarlo:samples=500,budget_ms=50")
+    assert (player.samples, player.budget_ms) == (500, 50)
+
+
+def test_uses_book():
+    assert uses_book("heatmap") and uses_book("montecarlo:samples=50")
+    assert uses_book("modules.targeting:MonteCarloPlayer:book=true")
+    assert not uses_book("montecarlo:book=false")
+    assert not uses_book("hunt") and not uses_book("random")
+    assert not uses_book("bots/mine.py:Bot")
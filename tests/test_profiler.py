@@ -0,0 +1,68 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from modules import menu
+from modules.profiler import FrameProfiler, profiler
+
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((850, 700))
+    pygame.quit()
+
+
+def click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)
+
+
+def test_nested_frames_are_left_out_of_the_outer_frame():
+    frames = FrameProfiler()
+    frames.enabled = True
+    frames.begin_frame()
+    frames.begin_frame()
+    time.sleep(0.05)
+    frames.end_frame()
+    frames.end_frame()
+    inner, outer = frames.frames
+    assert inner["total_ms"] >= 50
+    assert outer["total_ms"] < 25
+    assert not frames._frame_stack
+
+
+def test_profiled_keeps_the_function_identity():
+    frames = FrameProfiler()
+
+    @frames.profiled("work")
+    def step(value):
+        """Doubles value."""
+        return value * 2
+
+    assert (step.__name__, step.__doc__, step.__wrapped__(2)) == ("step", "Doubles value.", 4)
+    assert step(3) == 6
+
+
+def test_how_to_play_inside_the_main_menu_records_every_frame(screen, monkeypatch):
+    play_rect, how_to_play_rect = menu.main_menu_buttons(screen)
+    back = (screen.get_rect().centerx, screen.get_rect().bottom - 80)
+    # menu: open How to Play; instructions: Back; menu: idle, then Play
+    script = [[click(how_to_play_rect.center)], [click(back)], [], [click(play_rect.center)]]
+    monkeypatch.setattr(menu, "menu_events", lambda glow_fps: script.pop(0))
+    monkeypatch.setattr(profiler, "enabled", True)
+    monkeypatch.setattr(profiler, "frames", type(profiler.frames)())
+    monkeypatch.setattr(profiler, "_frame_stack", [])
+
+    menu.show_main_menu(screen, glow_fps=0)
+
+    assert not script and not profiler._frame_stack
+    phases = [frame["phase"] for frame in profiler.frames]
+    # the click that opened the instructions, the instructions' own frame,
+    # and the menu frames around them all get recorded under their screen
+    assert phases.count("show_how_to_play") == 1
+    assert phases.count("show_main_menu") == 3
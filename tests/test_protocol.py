@@ -0,0 +1,58 @@
+from modules.protocol import decode, encode, fleet_words, parse_cell, parse_fleet, parse_ships, format_ships
+from modules.sparse_board import new_board
+
+SHIPS = {"carrier": 1, "battleship": 1, "cruiser": 1, "submarine": 1, "destroyer": 1}
+PLACEMENTS = [
+    ("carrier", 0, 0, "H"),
+    ("battleship", 1, 0, "H"),
+    ("cruiser", 2, 0, "V"),
+    ("submarine", 2, 5, "H"),
+    ("destroyer", 9, 8, "H"),
+]
+
+
+def words(placements):
+    return [str(word) for word in fleet_words(placements)]
+
+
+def test_encode_decode_round_trip():
+    assert decode(encode("FIRE", 3, 4)) == ["FIRE", "3", "4"]
+    assert decode(b"  \n") == []
+
+
+def test_ships_round_trip():
+    assert parse_ships(format_ships(SHIPS)) == SHIPS
+
+
+def test_fleet_words_lays_the_same_fleet_down():
+    board = new_board(10, 10)
+    assert parse_fleet(words(PLACEMENTS), 10, 10, SHIPS, board) is None
+    assert board[0][:5] == ["C"] * 5
+    assert [board[r][0] for r in (2, 3, 4)] == ["R"] * 3
+    assert board[9][8:] == ["D", "D"]
+    assert sum(cell != "~" for row in board for cell in row) == 17
+
+
+def test_parse_fleet_rejects_overlap_and_edges():
+    overlap = PLACEMENTS[:-1] + [("destroyer", 0, 3, "V")]
+    assert "does not fit" in parse_fleet(words(overlap), 10, 10, SHIPS, new_board(10, 10))
+    off_edge = PLACEMENTS[:-1] + [("destroyer", 9, 9, "H")]
+    assert "does not fit" in parse_fleet(words(off_edge), 10, 10, SHIPS, new_board(10, 10))
+
+
+def test_parse_fleet_rejects_wrong_fleet():
+    assert parse_fleet(words(PLACEMENTS[:-1]), 10, 10, SHIPS, new_board(10, 10)) == \
+        "fleet does not match the settings"
+    assert parse_fleet(["C", "0", "0"], 10, 10, SHIPS, new_board(10, 10)) == "PLACE takes four words per ship"
+
+
+def test_parse_fleet_rejects_bad_words():
+    for bad in (["X", "0", "0", "H"], ["C", "0", "0", "D"], ["C", "-1", "0", "H"], ["C", "²", "0", "H"],
+                ["C", "a", "0", "H"]):
+        assert parse_fleet(bad, 10, 10, {"carrier": 1}, new_board(10, 10)).startswith("bad ship")
+
+
+def test_parse_cell():
+    assert parse_cell("3", "9", 10, 10) == (3, 9)
+    for row, col in (("²", "1"), ("1", "x"), ("-1", "0"), ("10", "0"), ("0", "10"), ("", "0")):
+        assert parse_cell(row, col, 10, 10) is None
@@ -0,0 +1,119 @@
+import asyncio
+
+from modules.protocol import decode, fleet_words
+from modules.server import GameServer, Match
+
+SHIPS = {"destroyer": 1, "cruiser": 1}
+# destroyer on (0, 0)-(0, 1), cruiser on (2, 0)-(2, 2)
+FLEET = [str(word) for word in fleet_words([("destroyer", 0, 0, "H"), ("cruiser", 2, 0, "H")])]
+
+
+class FakeWriter:
+    """Collects what the server writes to a client."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.extend(decode(line) for line in data.splitlines())
+
+    def get_extra_info(self, name):
+        return None
+
+
+class FakeConn:
+    def __init__(self):
+        self.writer = FakeWriter()
+        self.match = None
+        self.player = None
+        self.subscriber = None
+
+    def send(self, *words):
+        self.writer.lines.append([str(word) for word in words])
+
+    @property
+    def lines(self):
+        return self.writer.lines
+
+
+def started_match():
+    match = Match("m", 5, 5, SHIPS)
+    one, two = FakeConn(), FakeConn()
+    match.seat(one)
+    match.seat(two)
+    assert match.place(1, FLEET) is None
+    assert match.place(2, FLEET) is None
+    return match, one, two
+
+
+def test_seats_and_placement():
+    match, one, two = started_match()
+    assert one.lines[0][:3] == ["JOINED", "m", "1"]
+    assert two.lines[0][:3] == ["JOINED", "m", "2"]
+    assert ["TURN", "1"] in one.lines and match.turn == 1
+    assert match.place(1, FLEET) == "fleet already placed"
+
+
+def test_only_the_player_to_move_fires():
+    match, one, two = started_match()
+    assert match.fire(2, 0, 0) == "not your turn"
+    assert match.fire(1, 5, 0) == "off the board"
+
+
+def test_hit_keeps_the_turn_and_miss_passes_it():
+    match, one, two = started_match()
+    assert match.fire(1, 0, 0) is None
+    assert one.lines[-2] == ["SHOT", "1", "0", "0", "hit"]
+    assert match.turn == 1
+    assert match.fire(1, 4, 4) is None
+    assert match.turn == 2
+    assert two.lines[-1] == ["TURN", "2"]
+
+
+def test_sinking_the_last_ship_wins():
+    match, one, two = started_match()
+    for row, col in ((0, 0), (0, 1), (2, 0), (2, 1), (2, 2)):
+        assert match.fire(1, row, col) is None
+    assert match.winner == 1 and match.over and match.turn is None
+    assert two.lines[-1] == ["WIN", "1"]
+    assert ["SHOT", "1", "0", "1", "sunk:destroyer"] in two.lines
+
+
+def test_leaving_forfeits_a_match_in_progress():
+    match, one, two = started_match()
+    match.leave(2)
+    assert one.lines[-2:] == [["LEFT", "2"], ["WIN", "1"]]
+    assert match.winner == 1
+
+
+def test_leaving_a_finished_match_changes_nothing():
+    match, one, two = started_match()
+    match.leave(2)
+    match.leave(1)
+    assert match.winner == 1
+    assert one.lines.count(["WIN", "1"]) == 1
+
+
+def test_server_commands_answer_bad_cells_with_an_error():
+    server = GameServer(5, 5, SHIPS)
+    one, two = FakeConn(), FakeConn()
+    assert server.command(one, ["JOIN", "m"]) is None
+    assert server.command(two, ["JOIN", "m"]) is None
+    assert server.command(one, ["PLACE"] + FLEET) is None
+    assert server.command(two, ["PLACE"] + FLEET) is None
+    for args in (["²", "1"], ["1"], ["1", "5"], ["-1", "0"]):
+        assert server.command(one, ["FIRE"] + args) == "FIRE takes a row and a column on the board"
+    assert server.command(one, ["FIRE", "4", "4"]) is None
+    assert server.command(one, ["FIRE", "4", "3"]) == "not your turn"
+
+
+def test_server_counts_a_won_match():
+    server = GameServer(5, 5, SHIPS)
+    one, two = FakeConn(), FakeConn()
+    server.command(one, ["JOIN"])
+    server.command(two, ["JOIN"])
+    server.command(one, ["PLACE"] + FLEET)
+    server.command(two, ["PLACE"] + FLEET)
+    for row, col in ((0, 0), (0, 1), (2, 0), (2, 1), (2, 2)):
+        assert server.command(one, ["FIRE", str(row), str(col)]) is None
+    assert server.games == 1 and not server.matches
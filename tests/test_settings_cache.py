@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from modules.file_handling import FEASIBLE, INFEASIBLE, validate_settings
+from modules.settings_cache import CACHE_VERSION, ValidationCache, cache_key
+
+CLASSIC = {"carrier": 1, "battleship": 1, "cruiser": 1, "submarine": 1, "destroyer": 1}
+LENGTHS = [5, 4, 3, 3, 2]
+
+
+def write_cache(path, entries):
+    path.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}))
+
+
+def test_put_then_get(tmp_path):
+    path = tmp_path / "cache.json"
+    ValidationCache(path).put(10, 10, LENGTHS, FEASIBLE)
+    cache = ValidationCache(path)
+    assert cache.get(10, 10, LENGTHS) == FEASIBLE
+    # transposed boards and reordered fleets share the entry
+    assert cache.get(10, 10, LENGTHS[::-1]) == FEASIBLE
+    assert cache.get(9, 10, LENGTHS) is None
+
+
+@pytest.mark.parametrize("entries", [
+    [],
+    "entries",
+    {"key": "feasible"},
+    {"key": {"used": 1.0}},
+    {"key": {"result": "feasible"}},
+    {"key": {"result": "feasible", "used": "yesterday"}},
+    {"key": {"result": "maybe", "used": 1.0}},
+    {"key": {"result": ["feasible"], "used": 1.0}},
+])
+def test_malformed_entries_are_misses(tmp_path, entries):
+    path = tmp_path / "cache.json"
+    if isinstance(entries, dict):
+        entries = {cache_key(10, 10, LENGTHS): entry for entry in entries.values()}
+    write_cache(path, entries)
+    assert ValidationCache(path).get(10, 10, LENGTHS) is None
+
+
+def test_bad_entry_does_not_hide_the_answer(tmp_path, monkeypatch):
+    path = tmp_path / "validation_cache.json"
+    write_cache(path, {cache_key(10, 10, LENGTHS): {"result": "garbage", "used": 0},
+                       "other": {"result": INFEASIBLE}})
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    validate_settings(10, 10, CLASSIC)
+    # the search ran and its answer replaced the bad entry
+    assert ValidationCache(path).get(10, 10, LENGTHS) == FEASIBLE
+
+
+def test_cached_infeasible_answer_is_trusted(tmp_path, monkeypatch):
+    write_cache(tmp_path / "validation_cache.json",
+                {cache_key(10, 10, LENGTHS): {"result": INFEASIBLE, "used": 0}})
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    with pytest.raises(ValueError):
+        validate_settings(10, 10, CLASSIC)
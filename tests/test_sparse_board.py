@@ -0,0 +1,83 @@
+import random
+import warnings
+
+import pytest
+
+from modules import sparse_board
+from modules.bitboard import BitboardBoatManager
+from modules.boat_management import SHIP_TYPES, BoatManager
+from modules.players import random_placement
+from modules.sparse_board import SPARSE_MIN_CELLS, SparseBoatManager, new_boat_manager, sparse_min_cells
+
+SHIPS = {"cruiser": 1, "destroyer": 1}
+
+
+def test_threshold_from_the_environment(monkeypatch):
+    monkeypatch.delenv("BATTLESHIP_SPARSE_CELLS", raising=False)
+    assert sparse_min_cells() == SPARSE_MIN_CELLS
+    monkeypatch.setenv("BATTLESHIP_SPARSE_CELLS", "0")
+    assert isinstance(new_boat_manager(5, 5, SHIPS), SparseBoatManager)
+
+
+def test_bad_threshold_falls_back_and_warns_once(monkeypatch):
+    monkeypatch.setattr(sparse_board, "_BAD_SETTINGS", set())
+    monkeypatch.setenv("BATTLESHIP_SPARSE_CELLS", "lots")
+    with pytest.warns(UserWarning, match="BATTLESHIP_SPARSE_CELLS"):
+        assert sparse_min_cells() == SPARSE_MIN_CELLS
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert sparse_min_cells() == SPARSE_MIN_CELLS
+        assert not isinstance(new_boat_manager(5, 5, SHIPS), SparseBoatManager)
+
+
+def random_fleet(rng, repeats=False):
+    """Some of the ship types, one each unless repeats is set."""
+    names = [name for name in SHIP_TYPES if rng.random() < 0.7] or ["destroyer"]
+    return {name: rng.randint(1, 3) if repeats else 1 for name in names}
+
+
+def play_both(reference, sparse, rows, cols, rng):
+    """
+    Fire the same random shots, repeats included, at both engines until
+    the reference has a winner, checking every result, hit grid, sunk list
+    and winner on the way. A miss passes the turn, like firing_phase.
+    """
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+    turn = 1
+    while reference.check_win() is None:
+        row, col = rng.choice(cells)
+        expected = reference.fire_at(turn, 3 - turn, row, col)
+        assert sparse.fire_at(turn, 3 - turn, row, col) == expected, (turn, row, col)
+        assert [list(r) for r in sparse.player_hits[turn]] == [list(r) for r in reference.player_hits[turn]]
+        assert sparse.sunk_ships == reference.sunk_ships
+        assert sparse.check_win() == reference.check_win()
+        if expected == "miss":
+            turn = 3 - turn
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_boat_manager(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(6, 14), rng.randint(6, 14)
+    ships = random_fleet(rng)
+    boards = [random_placement(rows, cols, ships, rng) for _ in range(2)]
+    managers = [BoatManager(rows, cols, ships), SparseBoatManager(rows, cols, ships)]
+    for manager in managers:
+        for player, board in enumerate(boards, 1):
+            manager.set_player_ships(player, [row[:] for row in board])
+    play_both(*managers, rows, cols, rng)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_repeated_ship_types_match_bitboard(seed):
+    # BoatManager tracks one ship per type, so fleets with repeats are
+    # checked against the bitboard engine, which tracks every ship
+    rng = random.Random(seed)
+    rows, cols = rng.randint(8, 14), rng.randint(8, 14)
+    ships = random_fleet(rng, repeats=True)
+    boards = [random_placement(rows, cols, ships, rng) for _ in range(2)]
+    managers = [BitboardBoatManager(rows, cols, ships), SparseBoatManager(rows, cols, ships)]
+    for manager in managers:
+        for player, board in enumerate(boards, 1):
+            manager.set_player_ships(player, [row[:] for row in board])
+    play_both(*managers, rows, cols, rng)
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from modules.viewport import MINIMAP_SIZE, MINIMAP_WATER, Minimap
+
+HIT = (230, 70, 40)
+MISS = (170, 170, 170)
+
+
+def test_minimap_size_does_not_grow_with_the_board():
+    minimap = Minimap(20000, 5000)
+    assert minimap.cells.get_size() == minimap.size
+    assert max(minimap.size) <= MINIMAP_SIZE
+
+
+def test_small_boards_get_a_block_per_cell():
+    minimap = Minimap(10, 10)
+    minimap.set_cell(2, 3, HIT)
+    block = minimap.size[0] // 10
+    assert minimap.cells.get_at((3 * block, 2 * block))[:3] == HIT
+    assert minimap.cells.get_at((3 * block + block - 1, 2 * block + block - 1))[:3] == HIT
+    assert minimap.cells.get_at((4 * block, 2 * block))[:3] == MINIMAP_WATER
+
+
+def test_misses_do_not_hide_hits_sharing_a_pixel():
+    minimap = Minimap(1400, 1400)
+    minimap.set_cell(700, 700, HIT)
+    minimap.set_cell(701, 701, MISS, weak=True)
+    assert minimap.cells.get_at((70, 70))[:3] == HIT
+    minimap.set_cell(0, 0, MISS, weak=True)
+    assert minimap.cells.get_at((0, 0))[:3] == MISS
@@ -0,0 +1,66 @@
+#################################################
+# tournament.py - round-robin between bots,    #
+# ranked by Elo rating. No pygame.             #
+#################################################
+
+import argparse
+
+from modules.file_handling import load_settings
+from modules.players import PLAYERS, split_spec
+from modules.simulation import ENGINES
+from modules.tournament import CHUNK_SIZE, run_tournament
+
+
+def print_table(ratings):
+    print(f"{'':>3} {'bot':<24} {'elo':>6} {'95% CI':>8} {'games':>8} {'score':>7}")
+    for rank, (bot, rating, margin, games, score) in enumerate(ratings.table(), 1):
+        print(f"{rank:>3} {bot:<24} {rating:>6.0f} {'+-':>3}{margin:>5.0f} {games:>8} {score:>7.1%}")
+
+
+def report(ratings, played, total, games_per_second):
+    remaining = (total - played) / games_per_second if games_per_second else 0
+    hours, rest = divmod(int(remaining), 3600)
+    print(f"\n{played}/{total} games, {games_per_second:.0f} games/second, "
+          f"{hours}h{rest // 60:02d}m left")
+    print_table(ratings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play every pair of bots against each other and rate them.")
+    parser.add_argument("bots", nargs="+",
+                        help=f"players to enter: {', '.join(sorted(PLAYERS))} module:Class or bot.py:Class, optionally with :key=value,... options")
+    parser.add_argument("--games", type=int, default=1000, help="games per pairing")
+    parser.add_argument("--settings", default="settings.json", help="settings file to load")
+    parser.add_argument("--out", default="tournament.jsonl",
+                        help="per-game results, .jsonl or .csv; an existing file is resumed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the per-chunk RNG streams")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="bitboard", help="rules engine")
+    parser.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="games per task sent to a worker")
+    parser.add_argument("--budget", type=int, metavar="MS",
+                        help="run each bot in its own process with MS milliseconds per shot")
+    parser.add_argument("--report", type=float, default=30, metavar="SECONDS",
+                        help="print the standings this often")
+    args = parser.parse_args()
+    for spec in args.bots:
+        try:
+            split_spec(spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    rows, cols, ships = load_settings(args.settings)
+    try:
+        ratings = run_tournament(
+            args.bots, args.games, rows, cols, ships, args.out,
+            workers=args.workers, seed=args.seed, engine_name=args.engine,
+            chunk_size=args.chunk, budget=args.budget, report=report, report_interval=args.report
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"\nFinal standings, results in {args.out}")
+    print_table(ratings)
+
+
+if __name__ == "__main__":
+    main()